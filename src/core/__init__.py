@@ -10,6 +10,7 @@ from src.core.models import (
     Paper,
     DownloadResult,
     DownloadSummary,
+    ConcurrencyChange,
     ErrorLog
 )
 from src.core.config import ConfigManager, ConfigWrapper
@@ -22,6 +23,7 @@ __all__ = [
     "Paper",
     "DownloadResult",
     "DownloadSummary",
+    "ConcurrencyChange",
     "ErrorLog",
     "ConfigManager",
     "ConfigWrapper",
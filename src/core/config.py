@@ -3,6 +3,7 @@ CNKI论文下载器 - 配置管理
 使用 Pydantic v2 管理配置，支持从环境变量加载
 """
 
+import hashlib
 import json
 from pathlib import Path
 from typing import Dict, Any, Optional, List
@@ -13,6 +14,9 @@ from dotenv import load_dotenv
 # 加载 .env 文件
 load_dotenv()
 
+# 配置目录（配置文件、会话状态、缓存等）
+CONFIG_DIR = Path.home() / ".cnki_downloader"
+
 
 class DownloadSettings(BaseModel):
     """下载设置"""
@@ -20,7 +24,25 @@ class DownloadSettings(BaseModel):
     max_concurrent: int = Field(default=1, description="最大并发数，降低并发数避免CNKI限流")
     timeout: int = Field(default=30000, description="超时时间（毫秒）")
     retry_times: int = Field(default=2, description="重试次数")
-    chunk_size: int = Field(default=1024, description="分块大小")
+    retry_base_delay: float = Field(default=2.0, description="首次重试前的基准等待时间（秒），之后按指数退避")
+    retry_max_delay: float = Field(default=60.0, description="重试等待时间上限（秒）")
+    chunk_size: int = Field(default=65536, description="流式下载分块大小（字节）")
+    request_interval: float = Field(default=1.0, description="相邻下载任务的最小启动间隔（秒）")
+    adaptive_concurrency: bool = Field(default=False, description="是否根据CNKI响应情况自动调整并发数（AIMD），开启后并发数可能超过 max_concurrent")
+    max_concurrent_limit: int = Field(default=4, description="自适应并发的上限（max_concurrent 为初始值）")
+    latency_threshold: float = Field(default=15.0, description="自适应并发判定为低延迟的单篇耗时上限（秒）")
+    rate_limit_rps: float = Field(default=1.0, description="对CNKI的最大请求速率（次/秒，<=0 表示不限速）")
+    rate_limit_burst: int = Field(default=3, description="允许的突发请求数")
+    circuit_breaker_cooldown: float = Field(default=30.0, description="遇到限流/验证页面时暂停下载的初始冷却时间（秒）")
+    circuit_breaker_max_cooldown: float = Field(default=300.0, description="连续熔断时冷却时间的上限（秒）")
+    circuit_breaker_max_trips: int = Field(default=5, description="单次任务最大熔断次数，超过后被拦截的论文记为失败")
+    shard_processes: int = Field(default=1, description="大批量任务拆分到的浏览器进程数（1表示不拆分）")
+    shard_min_papers: int = Field(default=20, description="下载数量达到该值时才拆分到多个进程")
+    skip_downloaded: bool = Field(default=True, description="是否跳过下载索引中已下载过的论文")
+    paper_store: bool = Field(default=True, description="是否把下载的论文按内容保存到本地仓库，各下载目录通过硬链接共享")
+    unavailable_paywall_ttl: float = Field(default=21600.0, description="付费论文的不可下载缓存有效期（秒，0为不缓存）")
+    unavailable_no_button_ttl: float = Field(default=86400.0, description="无下载按钮论文的不可下载缓存有效期（秒，0为不缓存）")
+    recheck_unavailable: bool = Field(default=False, description="忽略不可下载缓存，重新检查所有论文")
 
     @field_validator('default_dir', mode='before')
     @classmethod
@@ -33,7 +55,7 @@ class DownloadSettings(BaseModel):
 class BrowserSettings(BaseModel):
     """浏览器设置"""
     headless: bool = Field(default=False, description="是否无头模式")
-    slow_mo: int = Field(default=500, description="操作延迟（毫秒）")
+    slow_mo: int = Field(default=0, description="操作延迟（毫秒），请求频率由令牌桶限速器控制")
     user_agent: Optional[str] = Field(default=None, description="用户代理字符串")
     viewport_width: int = Field(default=1366, description="视口宽度")
     viewport_height: int = Field(default=768, description="视口高度")
@@ -56,9 +78,51 @@ class BrowserSettings(BaseModel):
     selector_retry_timeout: int = Field(default=10000, description="选择器重试超时时间（毫秒）")
     download_button_timeout: int = Field(default=3000, description="下载按钮查找超时时间（毫秒）")
     element_find_timeout: int = Field(default=5000, description="元素查找超时时间（毫秒）")
-    page_switch_wait_time: int = Field(default=2, description="页面切换等待时间（秒）")
+    page_switch_wait_time: int = Field(default=2, description="页面切换最长等待时间（秒），检测到新标签页或跳转即提前结束")
     scroll_wait_time: int = Field(default=1, description="滚动后等待时间（秒）")
     content_load_wait_time: int = Field(default=2, description="内容加载等待时间（秒）")
+    # 检索方式
+    direct_search_url: bool = Field(default=True, description="是否通过直达URL打开检索结果页（失败时回退到首页点击流程）")
+    # 下载方式
+    direct_download: bool = Field(default=True, description="是否优先通过HTTP请求直接下载（失败时回退到渲染详情页点击下载）")
+    # 网络资源拦截（减少页面体积，加快 networkidle）
+    block_resources: bool = Field(default=True, description="是否拦截不需要的网络资源")
+    blocked_resource_types: List[str] = Field(
+        default_factory=lambda: ["media", "font"],
+        description="拦截的资源类型（Playwright resource_type；默认不拦截图片，滑块验证需要读取图片）"
+    )
+    blocked_url_patterns: List[str] = Field(
+        default_factory=lambda: [
+            "*google-analytics.com*",
+            "*googletagmanager.com*",
+            "*doubleclick.net*",
+            "*hm.baidu.com*",
+            "*cnzz.com*",
+            "*growingio.com*",
+        ],
+        description="拦截的URL模式（通配符）"
+    )
+    allowed_url_patterns: List[str] = Field(
+        default_factory=lambda: [
+            "*verify*",
+            "*captcha*",
+            "*download*",
+            "*.pdf*",
+            "*.caj*",
+        ],
+        description="始终放行的URL模式（优先于拦截规则，保证验证码和下载流程可用）"
+    )
+    # 选择器优先级学习（统计保存在配置目录）
+    learn_selector_order: bool = Field(default=True, description="是否记录选择器命中情况并优先尝试最近命中的选择器")
+    # 会话复用（storage_state 保存在配置目录）
+    persist_session: bool = Field(default=True, description="是否保存并复用CNKI会话（Cookie与localStorage）")
+    session_max_age: int = Field(default=86400, description="保存的会话最长复用时间（秒）")
+    remote_endpoint: str = Field(default="", description="共享浏览器的连接地址（ws:// 为Playwright服务，http:// 为CDP端口），为空时不连接指定地址")
+    remote_server_port: int = Field(default=0, description="本机共享浏览器的CDP调试端口（0表示自动选择空闲端口）")
+    remote_connect_timeout: int = Field(default=10000, description="连接共享浏览器的超时时间（毫秒）")
+    results_cache_ttl: int = Field(default=3600, description="检索结果页缓存有效期（秒，0表示不缓存）")
+    results_cache_max_mb: int = Field(default=50, description="检索结果页缓存的最大总大小（MB）")
+    use_shared_server: bool = Field(default=False, description="是否连接本机共享浏览器（browser_server 启动的），默认每次启动自己的浏览器")
 
 
 class FileSettings(BaseModel):
@@ -92,6 +156,23 @@ class LoggingSettings(BaseModel):
         return v
 
 
+class DaemonSettings(BaseModel):
+    """常驻进程设置"""
+    enabled: bool = Field(default=False, description="是否通过常驻进程执行下载（复用浏览器，不可用或配置不一致时回退到进程内执行）")
+    socket_path: Path = Field(default_factory=lambda: CONFIG_DIR / "daemon.sock", description="Unix套接字路径")
+    pool_size: int = Field(default=1, description="常驻进程中的浏览器数量（同时执行的下载任务数）")
+    browser_idle_ttl: int = Field(default=300, description="浏览器空闲多久后关闭（秒）")
+    idle_exit: int = Field(default=1800, description="常驻进程空闲多久后退出（秒，0表示不退出）")
+    start_timeout: float = Field(default=15.0, description="等待常驻进程启动的最长时间（秒）")
+
+    @field_validator('socket_path', mode='before')
+    @classmethod
+    def expand_path(cls, v):
+        if isinstance(v, str):
+            return Path(v).expanduser()
+        return v
+
+
 class Config(BaseSettings):
     """总配置 - 使用 Pydantic Settings 从环境变量加载"""
     
@@ -110,7 +191,25 @@ class Config(BaseSettings):
     download_max_concurrent: Optional[int] = Field(default=None, alias="DOWNLOAD_MAX_CONCURRENT")
     download_timeout: Optional[int] = Field(default=None, alias="DOWNLOAD_TIMEOUT")
     download_retry_times: Optional[int] = Field(default=None, alias="DOWNLOAD_RETRY_TIMES")
+    download_retry_base_delay: Optional[float] = Field(default=None, alias="DOWNLOAD_RETRY_BASE_DELAY")
+    download_retry_max_delay: Optional[float] = Field(default=None, alias="DOWNLOAD_RETRY_MAX_DELAY")
     download_chunk_size: Optional[int] = Field(default=None, alias="DOWNLOAD_CHUNK_SIZE")
+    download_request_interval: Optional[float] = Field(default=None, alias="DOWNLOAD_REQUEST_INTERVAL")
+    download_adaptive_concurrency: Optional[bool] = Field(default=None, alias="DOWNLOAD_ADAPTIVE_CONCURRENCY")
+    download_max_concurrent_limit: Optional[int] = Field(default=None, alias="DOWNLOAD_MAX_CONCURRENT_LIMIT")
+    download_latency_threshold: Optional[float] = Field(default=None, alias="DOWNLOAD_LATENCY_THRESHOLD")
+    download_rate_limit_rps: Optional[float] = Field(default=None, alias="DOWNLOAD_RATE_LIMIT_RPS")
+    download_rate_limit_burst: Optional[int] = Field(default=None, alias="DOWNLOAD_RATE_LIMIT_BURST")
+    download_circuit_breaker_cooldown: Optional[float] = Field(default=None, alias="DOWNLOAD_CIRCUIT_BREAKER_COOLDOWN")
+    download_circuit_breaker_max_cooldown: Optional[float] = Field(default=None, alias="DOWNLOAD_CIRCUIT_BREAKER_MAX_COOLDOWN")
+    download_circuit_breaker_max_trips: Optional[int] = Field(default=None, alias="DOWNLOAD_CIRCUIT_BREAKER_MAX_TRIPS")
+    download_shard_processes: Optional[int] = Field(default=None, alias="DOWNLOAD_SHARD_PROCESSES")
+    download_shard_min_papers: Optional[int] = Field(default=None, alias="DOWNLOAD_SHARD_MIN_PAPERS")
+    download_skip_downloaded: Optional[bool] = Field(default=None, alias="DOWNLOAD_SKIP_DOWNLOADED")
+    download_paper_store: Optional[bool] = Field(default=None, alias="DOWNLOAD_PAPER_STORE")
+    download_unavailable_paywall_ttl: Optional[float] = Field(default=None, alias="DOWNLOAD_UNAVAILABLE_PAYWALL_TTL")
+    download_unavailable_no_button_ttl: Optional[float] = Field(default=None, alias="DOWNLOAD_UNAVAILABLE_NO_BUTTON_TTL")
+    download_recheck_unavailable: Optional[bool] = Field(default=None, alias="DOWNLOAD_RECHECK_UNAVAILABLE")
     
     # 浏览器设置
     browser_headless: Optional[bool] = Field(default=None, alias="BROWSER_HEADLESS")
@@ -120,6 +219,30 @@ class Config(BaseSettings):
     browser_viewport_height: Optional[int] = Field(default=None, alias="BROWSER_VIEWPORT_HEIGHT")
     browser_locale: Optional[str] = Field(default=None, alias="BROWSER_LOCALE")
     browser_timezone: Optional[str] = Field(default=None, alias="BROWSER_TIMEZONE")
+    browser_page_load_timeout: Optional[int] = Field(default=None, alias="BROWSER_PAGE_LOAD_TIMEOUT")
+    browser_network_idle_timeout: Optional[int] = Field(default=None, alias="BROWSER_NETWORK_IDLE_TIMEOUT")
+    browser_selector_timeout: Optional[int] = Field(default=None, alias="BROWSER_SELECTOR_TIMEOUT")
+    browser_selector_retry_timeout: Optional[int] = Field(default=None, alias="BROWSER_SELECTOR_RETRY_TIMEOUT")
+    browser_download_button_timeout: Optional[int] = Field(default=None, alias="BROWSER_DOWNLOAD_BUTTON_TIMEOUT")
+    browser_element_find_timeout: Optional[int] = Field(default=None, alias="BROWSER_ELEMENT_FIND_TIMEOUT")
+    browser_page_switch_wait_time: Optional[int] = Field(default=None, alias="BROWSER_PAGE_SWITCH_WAIT_TIME")
+    browser_scroll_wait_time: Optional[int] = Field(default=None, alias="BROWSER_SCROLL_WAIT_TIME")
+    browser_content_load_wait_time: Optional[int] = Field(default=None, alias="BROWSER_CONTENT_LOAD_WAIT_TIME")
+    browser_direct_search_url: Optional[bool] = Field(default=None, alias="BROWSER_DIRECT_SEARCH_URL")
+    browser_direct_download: Optional[bool] = Field(default=None, alias="BROWSER_DIRECT_DOWNLOAD")
+    browser_block_resources: Optional[bool] = Field(default=None, alias="BROWSER_BLOCK_RESOURCES")
+    browser_blocked_resource_types: Optional[List[str]] = Field(default=None, alias="BROWSER_BLOCKED_RESOURCE_TYPES")
+    browser_blocked_url_patterns: Optional[List[str]] = Field(default=None, alias="BROWSER_BLOCKED_URL_PATTERNS")
+    browser_allowed_url_patterns: Optional[List[str]] = Field(default=None, alias="BROWSER_ALLOWED_URL_PATTERNS")
+    browser_learn_selector_order: Optional[bool] = Field(default=None, alias="BROWSER_LEARN_SELECTOR_ORDER")
+    browser_persist_session: Optional[bool] = Field(default=None, alias="BROWSER_PERSIST_SESSION")
+    browser_session_max_age: Optional[int] = Field(default=None, alias="BROWSER_SESSION_MAX_AGE")
+    browser_remote_endpoint: Optional[str] = Field(default=None, alias="BROWSER_REMOTE_ENDPOINT")
+    browser_remote_server_port: Optional[int] = Field(default=None, alias="BROWSER_REMOTE_SERVER_PORT")
+    browser_remote_connect_timeout: Optional[int] = Field(default=None, alias="BROWSER_REMOTE_CONNECT_TIMEOUT")
+    browser_results_cache_ttl: Optional[int] = Field(default=None, alias="BROWSER_RESULTS_CACHE_TTL")
+    browser_results_cache_max_mb: Optional[int] = Field(default=None, alias="BROWSER_RESULTS_CACHE_MAX_MB")
+    browser_use_shared_server: Optional[bool] = Field(default=None, alias="BROWSER_USE_SHARED_SERVER")
     
     # 文件设置
     file_sanitize_filename: Optional[bool] = Field(default=None, alias="FILE_SANITIZE_FILENAME")
@@ -138,6 +261,14 @@ class Config(BaseSettings):
     logging_level: Optional[str] = Field(default=None, alias="LOGGING_LEVEL")
     logging_log_dir: Optional[Path] = Field(default=None, alias="LOGGING_LOG_DIR")
     logging_max_log_size: Optional[int] = Field(default=None, alias="LOGGING_MAX_LOG_SIZE")
+
+    # 常驻进程设置
+    daemon_enabled: Optional[bool] = Field(default=None, alias="DAEMON_ENABLED")
+    daemon_socket_path: Optional[Path] = Field(default=None, alias="DAEMON_SOCKET_PATH")
+    daemon_pool_size: Optional[int] = Field(default=None, alias="DAEMON_POOL_SIZE")
+    daemon_browser_idle_ttl: Optional[int] = Field(default=None, alias="DAEMON_BROWSER_IDLE_TTL")
+    daemon_idle_exit: Optional[int] = Field(default=None, alias="DAEMON_IDLE_EXIT")
+    daemon_start_timeout: Optional[float] = Field(default=None, alias="DAEMON_START_TIMEOUT")
     
     def get_download_settings(self) -> DownloadSettings:
         """获取下载设置"""
@@ -147,7 +278,25 @@ class Config(BaseSettings):
             max_concurrent=self.download_max_concurrent if self.download_max_concurrent is not None else defaults.max_concurrent,
             timeout=self.download_timeout if self.download_timeout is not None else defaults.timeout,
             retry_times=self.download_retry_times if self.download_retry_times is not None else defaults.retry_times,
+            retry_base_delay=self.download_retry_base_delay if self.download_retry_base_delay is not None else defaults.retry_base_delay,
+            retry_max_delay=self.download_retry_max_delay if self.download_retry_max_delay is not None else defaults.retry_max_delay,
             chunk_size=self.download_chunk_size if self.download_chunk_size is not None else defaults.chunk_size,
+            request_interval=self.download_request_interval if self.download_request_interval is not None else defaults.request_interval,
+            adaptive_concurrency=self.download_adaptive_concurrency if self.download_adaptive_concurrency is not None else defaults.adaptive_concurrency,
+            max_concurrent_limit=self.download_max_concurrent_limit if self.download_max_concurrent_limit is not None else defaults.max_concurrent_limit,
+            latency_threshold=self.download_latency_threshold if self.download_latency_threshold is not None else defaults.latency_threshold,
+            rate_limit_rps=self.download_rate_limit_rps if self.download_rate_limit_rps is not None else defaults.rate_limit_rps,
+            rate_limit_burst=self.download_rate_limit_burst if self.download_rate_limit_burst is not None else defaults.rate_limit_burst,
+            circuit_breaker_cooldown=self.download_circuit_breaker_cooldown if self.download_circuit_breaker_cooldown is not None else defaults.circuit_breaker_cooldown,
+            circuit_breaker_max_cooldown=self.download_circuit_breaker_max_cooldown if self.download_circuit_breaker_max_cooldown is not None else defaults.circuit_breaker_max_cooldown,
+            circuit_breaker_max_trips=self.download_circuit_breaker_max_trips if self.download_circuit_breaker_max_trips is not None else defaults.circuit_breaker_max_trips,
+            shard_processes=self.download_shard_processes if self.download_shard_processes is not None else defaults.shard_processes,
+            shard_min_papers=self.download_shard_min_papers if self.download_shard_min_papers is not None else defaults.shard_min_papers,
+            skip_downloaded=self.download_skip_downloaded if self.download_skip_downloaded is not None else defaults.skip_downloaded,
+            paper_store=self.download_paper_store if self.download_paper_store is not None else defaults.paper_store,
+            unavailable_paywall_ttl=self.download_unavailable_paywall_ttl if self.download_unavailable_paywall_ttl is not None else defaults.unavailable_paywall_ttl,
+            unavailable_no_button_ttl=self.download_unavailable_no_button_ttl if self.download_unavailable_no_button_ttl is not None else defaults.unavailable_no_button_ttl,
+            recheck_unavailable=self.download_recheck_unavailable if self.download_recheck_unavailable is not None else defaults.recheck_unavailable,
         )
     
     def get_browser_settings(self) -> BrowserSettings:
@@ -171,6 +320,21 @@ class Config(BaseSettings):
             page_switch_wait_time=self.browser_page_switch_wait_time if self.browser_page_switch_wait_time is not None else defaults.page_switch_wait_time,
             scroll_wait_time=self.browser_scroll_wait_time if self.browser_scroll_wait_time is not None else defaults.scroll_wait_time,
             content_load_wait_time=self.browser_content_load_wait_time if self.browser_content_load_wait_time is not None else defaults.content_load_wait_time,
+            direct_search_url=self.browser_direct_search_url if self.browser_direct_search_url is not None else defaults.direct_search_url,
+            direct_download=self.browser_direct_download if self.browser_direct_download is not None else defaults.direct_download,
+            block_resources=self.browser_block_resources if self.browser_block_resources is not None else defaults.block_resources,
+            blocked_resource_types=self.browser_blocked_resource_types if self.browser_blocked_resource_types is not None else defaults.blocked_resource_types,
+            blocked_url_patterns=self.browser_blocked_url_patterns if self.browser_blocked_url_patterns is not None else defaults.blocked_url_patterns,
+            allowed_url_patterns=self.browser_allowed_url_patterns if self.browser_allowed_url_patterns is not None else defaults.allowed_url_patterns,
+            learn_selector_order=self.browser_learn_selector_order if self.browser_learn_selector_order is not None else defaults.learn_selector_order,
+            persist_session=self.browser_persist_session if self.browser_persist_session is not None else defaults.persist_session,
+            session_max_age=self.browser_session_max_age if self.browser_session_max_age is not None else defaults.session_max_age,
+            remote_endpoint=self.browser_remote_endpoint if self.browser_remote_endpoint is not None else defaults.remote_endpoint,
+            remote_server_port=self.browser_remote_server_port if self.browser_remote_server_port is not None else defaults.remote_server_port,
+            remote_connect_timeout=self.browser_remote_connect_timeout if self.browser_remote_connect_timeout is not None else defaults.remote_connect_timeout,
+            results_cache_ttl=self.browser_results_cache_ttl if self.browser_results_cache_ttl is not None else defaults.results_cache_ttl,
+            results_cache_max_mb=self.browser_results_cache_max_mb if self.browser_results_cache_max_mb is not None else defaults.results_cache_max_mb,
+            use_shared_server=self.browser_use_shared_server if self.browser_use_shared_server is not None else defaults.use_shared_server,
         )
     
     def get_file_settings(self) -> FileSettings:
@@ -203,6 +367,18 @@ class Config(BaseSettings):
             max_log_size=self.logging_max_log_size or defaults.max_log_size,
         )
     
+    def get_daemon_settings(self) -> DaemonSettings:
+        """获取常驻进程设置"""
+        defaults = DaemonSettings()
+        return DaemonSettings(
+            enabled=self.daemon_enabled if self.daemon_enabled is not None else defaults.enabled,
+            socket_path=self.daemon_socket_path or defaults.socket_path,
+            pool_size=self.daemon_pool_size if self.daemon_pool_size is not None else defaults.pool_size,
+            browser_idle_ttl=self.daemon_browser_idle_ttl if self.daemon_browser_idle_ttl is not None else defaults.browser_idle_ttl,
+            idle_exit=self.daemon_idle_exit if self.daemon_idle_exit is not None else defaults.idle_exit,
+            start_timeout=self.daemon_start_timeout if self.daemon_start_timeout is not None else defaults.start_timeout,
+        )
+    
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
         return {
@@ -211,6 +387,7 @@ class Config(BaseSettings):
             "file_settings": self.get_file_settings().model_dump(),
             "default_values": self.get_default_values().model_dump(),
             "logging": self.get_logging_settings().model_dump(),
+            "daemon": self.get_daemon_settings().model_dump(),
         }
 
 
@@ -240,11 +417,22 @@ class ConfigWrapper:
     def logging(self) -> LoggingSettings:
         return self._config.get_logging_settings()
 
+    @property
+    def daemon(self) -> DaemonSettings:
+        return self._config.get_daemon_settings()
+
+    def fingerprint(self) -> str:
+        """生效配置的摘要（不含常驻进程设置），用于确认常驻进程与调用方使用相同的配置"""
+        settings = self._config.to_dict()
+        settings.pop("daemon", None)
+        encoded = json.dumps(settings, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
 
 class ConfigManager:
     """配置管理器 - 使用 Pydantic v2 和 .env 文件"""
 
-    DEFAULT_CONFIG_PATH = Path.home() / ".cnki_downloader" / "config.json"
+    DEFAULT_CONFIG_PATH = CONFIG_DIR / "config.json"
 
     def __init__(self, config_path: Optional[Path] = None, env_file: Optional[Path] = None):
         """
@@ -290,8 +478,44 @@ class ConfigManager:
                         self.config.download_timeout = ds["timeout"]
                     if "retry_times" in ds:
                         self.config.download_retry_times = ds["retry_times"]
+                    if "retry_base_delay" in ds:
+                        self.config.download_retry_base_delay = ds["retry_base_delay"]
+                    if "retry_max_delay" in ds:
+                        self.config.download_retry_max_delay = ds["retry_max_delay"]
                     if "chunk_size" in ds:
                         self.config.download_chunk_size = ds["chunk_size"]
+                    if "request_interval" in ds:
+                        self.config.download_request_interval = ds["request_interval"]
+                    if "adaptive_concurrency" in ds:
+                        self.config.download_adaptive_concurrency = ds["adaptive_concurrency"]
+                    if "max_concurrent_limit" in ds:
+                        self.config.download_max_concurrent_limit = ds["max_concurrent_limit"]
+                    if "latency_threshold" in ds:
+                        self.config.download_latency_threshold = ds["latency_threshold"]
+                    if "rate_limit_rps" in ds:
+                        self.config.download_rate_limit_rps = ds["rate_limit_rps"]
+                    if "rate_limit_burst" in ds:
+                        self.config.download_rate_limit_burst = ds["rate_limit_burst"]
+                    if "circuit_breaker_cooldown" in ds:
+                        self.config.download_circuit_breaker_cooldown = ds["circuit_breaker_cooldown"]
+                    if "circuit_breaker_max_cooldown" in ds:
+                        self.config.download_circuit_breaker_max_cooldown = ds["circuit_breaker_max_cooldown"]
+                    if "circuit_breaker_max_trips" in ds:
+                        self.config.download_circuit_breaker_max_trips = ds["circuit_breaker_max_trips"]
+                    if "shard_processes" in ds:
+                        self.config.download_shard_processes = ds["shard_processes"]
+                    if "shard_min_papers" in ds:
+                        self.config.download_shard_min_papers = ds["shard_min_papers"]
+                    if "skip_downloaded" in ds:
+                        self.config.download_skip_downloaded = ds["skip_downloaded"]
+                    if "paper_store" in ds:
+                        self.config.download_paper_store = ds["paper_store"]
+                    if "unavailable_paywall_ttl" in ds:
+                        self.config.download_unavailable_paywall_ttl = ds["unavailable_paywall_ttl"]
+                    if "unavailable_no_button_ttl" in ds:
+                        self.config.download_unavailable_no_button_ttl = ds["unavailable_no_button_ttl"]
+                    if "recheck_unavailable" in ds:
+                        self.config.download_recheck_unavailable = ds["recheck_unavailable"]
                 
                 if "browser_settings" in data:
                     bs = data["browser_settings"]
@@ -309,6 +533,36 @@ class ConfigManager:
                         self.config.browser_locale = bs["locale"]
                     if "timezone" in bs:
                         self.config.browser_timezone = bs["timezone"]
+                    if "direct_search_url" in bs:
+                        self.config.browser_direct_search_url = bs["direct_search_url"]
+                    if "direct_download" in bs:
+                        self.config.browser_direct_download = bs["direct_download"]
+                    if "block_resources" in bs:
+                        self.config.browser_block_resources = bs["block_resources"]
+                    if "blocked_resource_types" in bs:
+                        self.config.browser_blocked_resource_types = bs["blocked_resource_types"]
+                    if "blocked_url_patterns" in bs:
+                        self.config.browser_blocked_url_patterns = bs["blocked_url_patterns"]
+                    if "allowed_url_patterns" in bs:
+                        self.config.browser_allowed_url_patterns = bs["allowed_url_patterns"]
+                    if "learn_selector_order" in bs:
+                        self.config.browser_learn_selector_order = bs["learn_selector_order"]
+                    if "persist_session" in bs:
+                        self.config.browser_persist_session = bs["persist_session"]
+                    if "session_max_age" in bs:
+                        self.config.browser_session_max_age = bs["session_max_age"]
+                    if "remote_endpoint" in bs:
+                        self.config.browser_remote_endpoint = bs["remote_endpoint"]
+                    if "remote_server_port" in bs:
+                        self.config.browser_remote_server_port = bs["remote_server_port"]
+                    if "remote_connect_timeout" in bs:
+                        self.config.browser_remote_connect_timeout = bs["remote_connect_timeout"]
+                    if "results_cache_ttl" in bs:
+                        self.config.browser_results_cache_ttl = bs["results_cache_ttl"]
+                    if "results_cache_max_mb" in bs:
+                        self.config.browser_results_cache_max_mb = bs["results_cache_max_mb"]
+                    if "use_shared_server" in bs:
+                        self.config.browser_use_shared_server = bs["use_shared_server"]
                 
                 if "file_settings" in data:
                     fs = data["file_settings"]
@@ -342,6 +596,21 @@ class ConfigManager:
                         self.config.logging_log_dir = Path(ls["log_dir"]).expanduser()
                     if "max_log_size" in ls:
                         self.config.logging_max_log_size = ls["max_log_size"]
+
+                if "daemon" in data:
+                    dm = data["daemon"]
+                    if "enabled" in dm:
+                        self.config.daemon_enabled = dm["enabled"]
+                    if "socket_path" in dm:
+                        self.config.daemon_socket_path = Path(dm["socket_path"]).expanduser()
+                    if "pool_size" in dm:
+                        self.config.daemon_pool_size = dm["pool_size"]
+                    if "browser_idle_ttl" in dm:
+                        self.config.daemon_browser_idle_ttl = dm["browser_idle_ttl"]
+                    if "idle_exit" in dm:
+                        self.config.daemon_idle_exit = dm["idle_exit"]
+                    if "start_timeout" in dm:
+                        self.config.daemon_start_timeout = dm["start_timeout"]
         except Exception as e:
             print(f"⚠️ 加载JSON配置文件失败: {e}，使用环境变量配置")
 
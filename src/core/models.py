@@ -70,6 +70,8 @@ class Paper:
     year: Optional[str] = None      # 发表年份
     url: Optional[str] = None       # 详情页URL
     download_url: Optional[str] = None  # 下载链接
+    paper_id: Optional[str] = None  # CNKI文献编号（FileName，不随会话变化）
+    db_name: Optional[str] = None   # CNKI数据库代码（DbName）
 
     # 文献类型
     doc_type: Optional[str] = None  # 文献类型
@@ -124,12 +126,25 @@ class DownloadResult:
     file_path: Optional[Path] = None # 保存路径（成功时）
     error_message: Optional[str] = None  # 错误信息（失败时）
     download_time: Optional[float] = None  # 下载耗时（秒）
+    attempts: int = 1                # 尝试次数（含重试）
+    attempt_times: List[float] = field(default_factory=list)  # 每次尝试的耗时（秒）
+    sha256: Optional[str] = None     # 文件SHA-256（流式下载时边写边算）
+    paywalled: bool = False          # 详情页被识别为付费页（仅据此记入不可下载缓存）
 
     def is_success(self) -> bool:
         """是否下载成功"""
         return self.status == DownloadStatus.SUCCESS
 
 
+@dataclass
+class ConcurrencyChange:
+    """一次并发数调整记录"""
+    timestamp: datetime             # 调整时间
+    old_limit: int                  # 调整前并发数
+    new_limit: int                  # 调整后并发数
+    reason: str                     # 调整原因
+
+
 @dataclass
 class DownloadSummary:
     """批量下载汇总"""
@@ -145,6 +160,10 @@ class DownloadSummary:
     start_time: Optional[datetime] = None  # 开始时间
     end_time: Optional[datetime] = None    # 结束时间
 
+    # 自适应并发
+    final_concurrency: Optional[int] = None  # 结束时的并发数
+    concurrency_changes: List[ConcurrencyChange] = field(default_factory=list)  # 并发数调整记录
+
     def add_result(self, result: DownloadResult):
         """添加一个下载结果"""
         self.results.append(result)
@@ -0,0 +1,8 @@
+"""
+常驻进程模块
+常驻进程持有浏览器池，客户端通过Unix套接字提交下载任务
+"""
+
+from src.daemon.client import DaemonClient, DaemonUnavailable
+
+__all__ = ["DaemonClient", "DaemonUnavailable"]
@@ -0,0 +1,10 @@
+"""
+启动下载常驻进程: python -m src.daemon
+"""
+
+import asyncio
+
+from src.daemon.server import run_daemon
+
+if __name__ == "__main__":
+    asyncio.run(run_daemon())
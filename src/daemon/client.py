@@ -0,0 +1,165 @@
+"""
+CNKI论文下载器 - 常驻进程客户端
+连接常驻进程提交下载任务，常驻进程未运行时自动启动
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+from src.daemon.protocol import MESSAGE_LIMIT, encode_message, decode_message
+
+# 项目根目录（加入 PYTHONPATH，以 python -m src.daemon 启动常驻进程）
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+class DaemonUnavailable(Exception):
+    """常驻进程不可用（平台不支持、启动失败或连接中断）"""
+
+
+class DaemonClient:
+    """常驻进程客户端"""
+
+    # 等待常驻进程启动时的探测间隔（秒）
+    POLL_INTERVAL = 0.2
+
+    def __init__(self, socket_path: Path, start_timeout: float = 15.0, config_fingerprint: str = "", logger=None):
+        """
+        初始化客户端
+
+        Args:
+            socket_path: Unix套接字路径
+            start_timeout: 等待常驻进程启动的最长时间（秒）
+            config_fingerprint: 调用方生效配置的摘要，随每个下载请求发送
+            logger: 日志对象
+        """
+        self.socket_path = Path(socket_path)
+        self.start_timeout = start_timeout
+        self.config_fingerprint = config_fingerprint
+        self.logger = logger
+
+    @staticmethod
+    def supported() -> bool:
+        """当前平台是否支持Unix套接字"""
+        return hasattr(socket, "AF_UNIX")
+
+    async def request(self, message: dict) -> dict:
+        """
+        发送一个请求并等待响应
+
+        Raises:
+            DaemonUnavailable: 无法连接或连接中断
+        """
+        try:
+            reader, writer = await asyncio.open_unix_connection(str(self.socket_path), limit=MESSAGE_LIMIT)
+        except (OSError, AttributeError) as e:
+            raise DaemonUnavailable(f"无法连接常驻进程: {e}") from e
+
+        try:
+            writer.write(encode_message(message))
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                raise DaemonUnavailable("常驻进程关闭了连接")
+            return decode_message(line)
+        except (OSError, ValueError, asyncio.LimitOverrunError) as e:
+            raise DaemonUnavailable(f"与常驻进程通信失败: {e}") from e
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def ping(self) -> Optional[dict]:
+        """检查常驻进程是否在运行，返回其状态"""
+        if not self.socket_path.exists():
+            return None
+        try:
+            response = await self.request({"op": "ping"})
+        except DaemonUnavailable:
+            return None
+        return response if response.get("ok") else None
+
+    def spawn(self) -> None:
+        """
+        在后台启动常驻进程（脱离当前进程的会话）
+
+        常驻进程继承当前进程的环境变量和工作目录，与调用方加载相同的配置、按相同的目录解析相对路径。
+        """
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+        subprocess.Popen(
+            [sys.executable, "-m", "src.daemon"],
+            cwd=os.getcwd(),
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+
+    async def ensure_running(self) -> None:
+        """
+        确保常驻进程在运行，未运行时启动并等待就绪
+
+        Raises:
+            DaemonUnavailable: 平台不支持或在 start_timeout 内未就绪
+        """
+        if not self.supported():
+            raise DaemonUnavailable("当前平台不支持Unix套接字")
+        if await self.ping():
+            return
+
+        if self.logger:
+            self.logger.info("正在启动下载常驻进程...")
+        try:
+            self.spawn()
+        except OSError as e:
+            raise DaemonUnavailable(f"启动常驻进程失败: {e}") from e
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.start_timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            if await self.ping():
+                if self.logger:
+                    self.logger.info("✓ 下载常驻进程已就绪")
+                return
+        raise DaemonUnavailable(f"常驻进程在 {self.start_timeout:g} 秒内未就绪")
+
+    async def download(self, user_input: str) -> str:
+        """
+        通过常驻进程下载论文
+
+        Args:
+            user_input: 用户输入文本
+
+        Returns:
+            下载结果报告
+
+        Raises:
+            DaemonUnavailable: 常驻进程不可用，或其配置、工作目录与当前进程不同
+        """
+        await self.ensure_running()
+        response = await self.request({
+            "op": "download",
+            "input": user_input,
+            "config": self.config_fingerprint,
+            "cwd": os.getcwd(),
+        })
+        if not response.get("ok"):
+            raise DaemonUnavailable(response.get("error") or "常驻进程返回错误")
+        return response["report"]
+
+    async def shutdown(self) -> bool:
+        """请求常驻进程退出"""
+        try:
+            response = await self.request({"op": "shutdown"})
+        except DaemonUnavailable:
+            return False
+        return bool(response.get("ok"))
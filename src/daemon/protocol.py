@@ -0,0 +1,41 @@
+"""
+CNKI论文下载器 - 常驻进程通信协议
+每个连接发送一行JSON请求，收到一行JSON响应
+
+请求:
+    {"op": "ping"}
+    {"op": "download", "input": "帮我下载5篇跟'人工智能'相关的学位论文到 D:\\papers\\",
+     "config": "调用方生效配置的摘要", "cwd": "调用方的工作目录"}
+    {"op": "shutdown"}
+
+响应:
+    {"ok": true, ...}                   # ping 附带 pid、active、idle_browsers；download 附带 report
+    {"ok": false, "error": "错误信息"}
+    {"ok": false, "error": "错误信息", "code": "config_mismatch"}   # 调用方的配置或工作目录与常驻进程不同
+"""
+
+import json
+
+# 单行消息的最大长度（下载报告可能较长）
+MESSAGE_LIMIT = 16 * 1024 * 1024
+
+# 调用方与常驻进程配置不一致时的错误码
+CONFIG_MISMATCH = "config_mismatch"
+
+
+def encode_message(message: dict) -> bytes:
+    """编码为一行JSON"""
+    return json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def decode_message(line: bytes) -> dict:
+    """
+    解析一行JSON
+
+    Raises:
+        ValueError: 不是JSON对象
+    """
+    message = json.loads(line.decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("消息必须是JSON对象")
+    return message
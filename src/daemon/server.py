@@ -0,0 +1,175 @@
+"""
+CNKI论文下载器 - 常驻进程
+持有事件循环和浏览器池，通过Unix套接字接收下载任务，避免每次调用都启动浏览器
+"""
+
+import asyncio
+import fcntl
+import os
+from pathlib import Path
+
+from src.core.config import ConfigManager
+from src.daemon.protocol import MESSAGE_LIMIT, CONFIG_MISMATCH, encode_message, decode_message
+from src.downloader.browser_pool import BrowserPool
+from src.main import CNKIPaperDownloaderSkill
+from src.utils import setup_logging
+
+
+class SkillDaemon:
+    """
+    下载常驻进程
+
+    同一时刻只允许一个实例运行（通过套接字旁的锁文件保证）；
+    空闲（无进行中的任务）超过 idle_exit 秒后自动退出。
+    只接受生效配置和工作目录与自己相同的下载请求；不一致时拒绝，空闲时随即退出，
+    下次调用会按调用方的配置重新启动。
+    """
+
+    # 空闲检查间隔（秒）
+    IDLE_CHECK_INTERVAL = 30
+
+    def __init__(self, socket_path: Path, skill: CNKIPaperDownloaderSkill, pool: BrowserPool,
+                 idle_exit: float = 1800, config_fingerprint: str = "", logger=None):
+        """
+        初始化常驻进程
+
+        Args:
+            socket_path: Unix套接字路径
+            skill: 使用浏览器池的Skill实例
+            pool: 浏览器池
+            idle_exit: 空闲多久后退出（秒，0表示不退出）
+            config_fingerprint: 常驻进程生效配置的摘要（ConfigWrapper.fingerprint）
+            logger: 日志对象
+        """
+        self.socket_path = Path(socket_path)
+        self.lock_path = self.socket_path.with_name(self.socket_path.name + ".lock")
+        self.skill = skill
+        self.pool = pool
+        self.idle_exit = idle_exit
+        self.config_fingerprint = config_fingerprint
+        self.cwd = os.getcwd()
+        self.logger = logger
+
+        self._stop = asyncio.Event()
+        self._last_activity = 0.0
+
+    async def serve(self) -> None:
+        """运行常驻进程直到收到退出请求或空闲超时"""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.lock_path, "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            self.logger.info("已有常驻进程在运行，退出")
+            return
+
+        try:
+            # 持有锁说明旧的套接字文件已失效
+            self.socket_path.unlink(missing_ok=True)
+            server = await asyncio.start_unix_server(
+                self._handle_connection, path=str(self.socket_path), limit=MESSAGE_LIMIT
+            )
+            os.chmod(self.socket_path, 0o600)
+            self._last_activity = asyncio.get_running_loop().time()
+            self.logger.info(f"✓ 常驻进程已启动 (pid={os.getpid()}): {self.socket_path}")
+
+            watchdog = asyncio.create_task(self._watch_idle())
+            try:
+                async with server:
+                    await self._stop.wait()
+            finally:
+                watchdog.cancel()
+                await asyncio.gather(watchdog, return_exceptions=True)
+        finally:
+            await self.pool.close()
+            self.socket_path.unlink(missing_ok=True)
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+            self.logger.info("✓ 常驻进程已退出")
+
+    async def _watch_idle(self) -> None:
+        """没有进行中的任务且空闲超过 idle_exit 秒时退出"""
+        if self.idle_exit <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(min(self.IDLE_CHECK_INTERVAL, self.idle_exit))
+            if self.pool.active == 0 and loop.time() - self._last_activity >= self.idle_exit:
+                self.logger.info(f"常驻进程空闲超过 {self.idle_exit} 秒，正在退出")
+                self._stop.set()
+                return
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """处理一个连接：读取一行请求，返回一行响应"""
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                response = await self._dispatch(decode_message(line))
+            except ValueError as e:
+                response = {"ok": False, "error": f"无效的请求: {e}"}
+            writer.write(encode_message(response))
+            await writer.drain()
+        except Exception as e:
+            self.logger.error(f"❌ 处理常驻进程请求失败: {e}")
+        finally:
+            writer.close()
+
+    async def _dispatch(self, message: dict) -> dict:
+        """根据 op 字段分发请求"""
+        self._last_activity = asyncio.get_running_loop().time()
+        op = message.get("op")
+
+        if op == "ping":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "active": self.pool.active,
+                "idle_browsers": self.pool.idle_count,
+            }
+
+        if op == "download":
+            user_input = message.get("input")
+            if not isinstance(user_input, str) or not user_input.strip():
+                return {"ok": False, "error": "缺少 input"}
+            if message.get("config") != self.config_fingerprint or message.get("cwd") != self.cwd:
+                # 调用方的 .env、环境变量、config.json 或工作目录与启动常驻进程时不同
+                self.logger.info("调用方的配置或工作目录与常驻进程不同，拒绝该任务")
+                if self.pool.active == 0:
+                    self._stop.set()
+                return {"ok": False, "code": CONFIG_MISMATCH, "error": "调用方的配置或工作目录与常驻进程不同"}
+            try:
+                report = await self.skill.download_papers(user_input)
+            finally:
+                self._last_activity = asyncio.get_running_loop().time()
+            return {"ok": True, "report": report}
+
+        if op == "shutdown":
+            self._stop.set()
+            return {"ok": True}
+
+        return {"ok": False, "error": f"未知的操作: {op}"}
+
+
+async def run_daemon() -> None:
+    """按配置创建浏览器池和Skill，运行常驻进程"""
+    config = ConfigManager().get()
+    settings = config.daemon
+    logger = setup_logging(config.logging.log_dir, config.logging.level)
+
+    pool = BrowserPool(
+        config=config,
+        size=settings.pool_size,
+        idle_ttl=settings.browser_idle_ttl,
+        logger=logger
+    )
+    skill = CNKIPaperDownloaderSkill(browser_pool=pool)
+    daemon = SkillDaemon(
+        settings.socket_path, skill, pool,
+        idle_exit=settings.idle_exit,
+        config_fingerprint=config.fingerprint(),
+        logger=logger
+    )
+    await daemon.serve()
@@ -3,5 +3,6 @@
 """
 
 from src.downloader.downloader import CNKIDownloader
+from src.downloader.browser_pool import BrowserPool
 
-__all__ = ["CNKIDownloader"]
+__all__ = ["CNKIDownloader", "BrowserPool"]
@@ -0,0 +1,173 @@
+"""
+CNKI论文下载器 - 浏览器池
+在常驻进程中复用已启动的浏览器，空闲超时后自动关闭
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, List
+
+from src.platforms.cnki import CNKIBrowser
+from src.utils import TokenBucket
+
+
+class _PooledBrowser:
+    """池中的浏览器及其最近使用时间"""
+
+    def __init__(self, browser: CNKIBrowser, last_used: float):
+        self.browser = browser
+        self.last_used = last_used
+
+
+class BrowserPool:
+    """
+    浏览器池
+
+    每个下载任务租用一个完整的浏览器（检索页和下载标签页都归该任务独占），
+    任务结束后浏览器保持运行供下一个任务复用（再次租出前重建上下文，只保留会话），空闲超过 idle_ttl 秒后关闭。
+    池内所有浏览器共享同一个请求限速器。
+    """
+
+    def __init__(self, config=None, size: int = 1, idle_ttl: float = 300, logger=None):
+        """
+        初始化浏览器池
+
+        Args:
+            config: 配置对象
+            size: 最多同时运行的浏览器数量
+            idle_ttl: 浏览器空闲多久后关闭（秒）
+            logger: 日志对象
+        """
+        self.config = config
+        self.size = max(1, size)
+        self.idle_ttl = idle_ttl
+        self.logger = logger
+
+        self.rate_limiter = (
+            TokenBucket(config.download.rate_limit_rps, config.download.rate_limit_burst) if config else None
+        )
+
+        self._idle: List[_PooledBrowser] = []
+        self._slots = asyncio.Semaphore(self.size)
+        self._lock = asyncio.Lock()
+        self._reaper = None
+        self.active = 0
+
+    @property
+    def idle_count(self) -> int:
+        """空闲（已启动）的浏览器数量"""
+        return len(self._idle)
+
+    @asynccontextmanager
+    async def lease(self, download_dir: Path, max_pages: int = 1) -> AsyncIterator[CNKIBrowser]:
+        """
+        租用一个浏览器（池已满时等待）
+
+        Args:
+            download_dir: 本次任务的下载目录
+            max_pages: 本次任务需要的下载标签页数量
+
+        Yields:
+            已启动的 CNKIBrowser
+        """
+        await self._slots.acquire()
+        self.active += 1
+        browser = None
+        try:
+            browser = await self._take(download_dir, max_pages)
+            yield browser
+        except BaseException:
+            # 任务异常时浏览器状态不确定，不再放回池中
+            if browser:
+                await self._close_browser(browser)
+                browser = None
+            raise
+        finally:
+            if browser:
+                await self._put_back(browser)
+            self.active -= 1
+            self._slots.release()
+
+    async def _take(self, download_dir: Path, max_pages: int) -> CNKIBrowser:
+        """取出一个可用的空闲浏览器，没有时启动新浏览器"""
+        while True:
+            async with self._lock:
+                if not self._idle:
+                    break
+                pooled = self._idle.pop()
+
+            browser = pooled.browser
+            if browser.browser and browser.browser.is_connected():
+                try:
+                    # 清除上一个任务留下的标签页、路由和页面状态，只保留会话Cookie
+                    await browser.reset()
+                except Exception as e:
+                    if self.logger:
+                        self.logger.debug(f"重置浏览器失败，改为启动新浏览器: {e}")
+                else:
+                    browser.download_dir = download_dir
+                    browser.max_pages = max(browser.max_pages, max_pages)
+                    if self.logger:
+                        self.logger.info("♻️ 复用已启动的浏览器")
+                    return browser
+            await self._close_browser(browser)
+
+        browser = CNKIBrowser(
+            download_dir=download_dir,
+            config=self.config,
+            max_pages=max_pages,
+            rate_limiter=self.rate_limiter,
+            logger=self.logger
+        )
+        await browser.start()
+        return browser
+
+    async def _put_back(self, browser: CNKIBrowser) -> None:
+        """任务结束后保存浏览器状态并放回池中"""
+        await browser.save_session()
+        if browser.selector_stats:
+            browser.selector_stats.save()
+
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            self._idle.append(_PooledBrowser(browser, loop.time()))
+        self._ensure_reaper()
+
+    def _ensure_reaper(self) -> None:
+        """启动空闲浏览器回收任务"""
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_idle())
+
+    async def _reap_idle(self) -> None:
+        """定期关闭空闲超时的浏览器，池中没有浏览器后退出"""
+        loop = asyncio.get_running_loop()
+        while self._idle:
+            await asyncio.sleep(min(self.idle_ttl, 30))
+            async with self._lock:
+                now = loop.time()
+                expired = [pooled for pooled in self._idle if now - pooled.last_used >= self.idle_ttl]
+                self._idle = [pooled for pooled in self._idle if pooled not in expired]
+            for pooled in expired:
+                if self.logger:
+                    self.logger.info(f"浏览器空闲超过 {self.idle_ttl} 秒，正在关闭")
+                await self._close_browser(pooled.browser)
+
+    async def _close_browser(self, browser: CNKIBrowser) -> None:
+        """关闭浏览器（忽略错误）"""
+        try:
+            await browser.close()
+        except Exception as e:
+            if self.logger:
+                self.logger.debug(f"关闭浏览器失败: {e}")
+
+    async def close(self) -> None:
+        """关闭池中所有空闲浏览器"""
+        if self._reaper:
+            self._reaper.cancel()
+            await asyncio.gather(self._reaper, return_exceptions=True)
+            self._reaper = None
+        async with self._lock:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            await self._close_browser(pooled.browser)
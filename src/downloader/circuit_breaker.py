@@ -0,0 +1,211 @@
+"""
+CNKI论文下载器 - 全局熔断器
+CNKI返回限流或验证页面时暂停所有下载，冷却后先放行一个探测任务，成功后恢复
+"""
+
+import asyncio
+import multiprocessing
+import time
+from typing import Tuple, Type
+
+
+class SharedBreakerState:
+    """
+    跨进程共享的熔断状态
+
+    保存"暂停到何时"的时间戳（time.monotonic），供多个进程（如分片下载的各个浏览器进程）中的熔断器共用：
+    任一进程被CNKI拦截时，所有进程都暂停到同一时刻。需在创建子进程前构造，并作为参数传给子进程。
+    """
+
+    def __init__(self, context=None):
+        """
+        初始化共享熔断状态
+
+        Args:
+            context: multiprocessing 上下文（默认使用当前默认上下文）
+        """
+        ctx = context or multiprocessing.get_context()
+        # [暂停截止时间]，自带跨进程锁
+        self._state = ctx.Array("d", [0.0])
+
+    def remaining(self) -> float:
+        """距离暂停结束的秒数（未暂停时为0）"""
+        with self._state.get_lock():
+            return max(0.0, self._state[0] - time.monotonic())
+
+    def open_for(self, cooldown: float) -> None:
+        """
+        暂停所有进程 cooldown 秒（已有更晚的截止时间时保留）
+
+        Args:
+            cooldown: 冷却时间（秒）
+        """
+        with self._state.get_lock():
+            self._state[0] = max(self._state[0], time.monotonic() + cooldown)
+
+
+class CircuitBreaker:
+    """
+    全局熔断器（关闭 → 打开 → 半开）
+
+    - 关闭：任务正常启动
+    - 打开：任何任务遇到限流/验证页面时触发，所有工作协程在启动新任务前等待冷却结束
+    - 半开：冷却结束后只放行一个探测任务；探测成功则关闭并重置冷却时间，
+      再次被拦截则重新打开，冷却时间按 backoff_factor 递增（不超过 max_cooldown）
+
+    触发前已在进行中的任务结果不影响半开状态的判断。
+    提供 shared_state 时，熔断同时暂停共享该状态的其他进程；其他进程触发的暂停期间本进程的任务也会等待。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        trip_on: Tuple[Type[BaseException], ...],
+        cooldown: float = 30.0,
+        max_cooldown: float = 300.0,
+        backoff_factor: float = 2.0,
+        max_trips: int = 5,
+        logger=None,
+        shared_state: SharedBreakerState = None
+    ):
+        """
+        初始化熔断器
+
+        Args:
+            trip_on: 触发熔断的异常类型
+            cooldown: 首次熔断的冷却时间（秒）
+            max_cooldown: 冷却时间上限（秒）
+            backoff_factor: 连续熔断时冷却时间的增长倍数
+            max_trips: 最大熔断次数，超过后不再暂停重试，任务直接失败
+            logger: 日志对象
+            shared_state: 跨进程共享的熔断状态（分片下载时使用）
+        """
+        self.trip_on = trip_on
+        self.base_cooldown = max(0.0, cooldown)
+        self.max_cooldown = max(self.base_cooldown, max_cooldown)
+        self.backoff_factor = max(1.0, backoff_factor)
+        self.max_trips = max_trips
+        self.logger = logger
+        self.shared_state = shared_state
+
+        self.state = self.CLOSED
+        self.trips = 0
+
+        self._cooldown = self.base_cooldown
+        self._open_until = 0.0
+        self._epoch = 0
+        self._probe_in_flight = False
+        self._condition = asyncio.Condition()
+
+    def should_trip(self, error: BaseException) -> bool:
+        """异常是否表示被CNKI拦截"""
+        return isinstance(error, self.trip_on)
+
+    @property
+    def exhausted(self) -> bool:
+        """熔断次数是否已用尽"""
+        return self.trips >= self.max_trips
+
+    async def acquire(self) -> int:
+        """
+        启动任务前调用：熔断打开时等待冷却结束，半开时只放行一个探测任务
+
+        Returns:
+            当前熔断周期编号，任务结束后传给 record_success()
+        """
+        loop = asyncio.get_running_loop()
+        async with self._condition:
+            while True:
+                if self.state == self.CLOSED:
+                    # 其他进程触发的熔断：等待共享的冷却时间结束
+                    delay = self.shared_state.remaining() if self.shared_state else 0.0
+                    if delay <= 0:
+                        return self._epoch
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                if self.state == self.OPEN:
+                    delay = self._open_until - loop.time()
+                    if delay > 0:
+                        try:
+                            await asyncio.wait_for(self._condition.wait(), timeout=delay)
+                        except asyncio.TimeoutError:
+                            pass
+                        continue
+                    self.state = self.HALF_OPEN
+                    self._probe_in_flight = False
+                    if self.logger:
+                        self.logger.info("🔄 熔断冷却结束，放行一个探测任务")
+
+                if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                    self._probe_in_flight = True
+                    return self._epoch
+
+                await self._condition.wait()
+
+    async def record_success(self, epoch: int) -> None:
+        """
+        任务未被拦截时调用（成功、跳过或普通失败均算）
+
+        Args:
+            epoch: acquire() 返回的熔断周期编号
+        """
+        async with self._condition:
+            if epoch != self._epoch or self.state != self.HALF_OPEN:
+                return
+            self.state = self.CLOSED
+            self._cooldown = self.base_cooldown
+            self._probe_in_flight = False
+            if self.logger:
+                self.logger.info("✓ 探测任务成功，恢复下载")
+            self._condition.notify_all()
+
+    async def trip(self, reason: str, epoch: int = None) -> bool:
+        """
+        任务被拦截时调用，打开熔断器
+
+        Args:
+            reason: 熔断原因
+            epoch: acquire() 返回的熔断周期编号；早于当前周期启动的任务不再触发熔断
+
+        Returns:
+            任务是否应重新排队（熔断次数用尽时返回False）
+        """
+        async with self._condition:
+            if self.state == self.OPEN:
+                # 其他任务已触发熔断，本任务直接重新排队
+                return True
+            if epoch is not None and epoch != self._epoch:
+                # 上一次熔断前就已开始的任务，其结果已经计入上一次熔断，不再延长冷却
+                return True
+            if self.state == self.CLOSED and self.shared_state and self.shared_state.remaining() > 0:
+                # 其他进程已触发熔断，本进程的任务同样在冷却后重新排队
+                return True
+            if self.exhausted:
+                # 不再暂停，放开所有等待中的任务（它们会快速失败或成功）
+                self.state = self.CLOSED
+                self._probe_in_flight = False
+                self._condition.notify_all()
+                return False
+
+            loop = asyncio.get_running_loop()
+            self.trips += 1
+            self._epoch += 1
+            self.state = self.OPEN
+            self._probe_in_flight = False
+            self._open_until = loop.time() + self._cooldown
+            if self.shared_state:
+                self.shared_state.open_for(self._cooldown)
+            if self.logger:
+                self.logger.warning(
+                    f"⚠️ {reason}，暂停所有下载 {self._cooldown:g} 秒（第 {self.trips}/{self.max_trips} 次熔断）"
+                )
+            self._cooldown = min(self._cooldown * self.backoff_factor, self.max_cooldown)
+            self._condition.notify_all()
+            return True
@@ -0,0 +1,143 @@
+"""
+CNKI论文下载器 - 自适应并发控制
+加性增、乘性减（AIMD）：CNKI响应良好时逐步增加并发，出现超时或限流时快速减半
+"""
+
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import List
+
+from src.core.models import DownloadResult, DownloadStatus, ConcurrencyChange
+
+
+class AdaptiveConcurrencyController:
+    """
+    AIMD并发控制器（可在运行时调整上限的信号量）
+
+    - 连续 limit 个任务成功且耗时低于 latency_threshold 时，并发上限 +1
+    - 出现超时、限流页面，或最近窗口内跳过比例过高时，并发上限乘以 decrease_factor
+    - 每次调整后至少再完成 limit 个任务才会再次减小，避免一次拥塞被重复计算
+    """
+
+    # 错误信息中表示超时的关键词
+    TIMEOUT_KEYWORDS = ["Timeout", "timeout", "超时"]
+    # 错误信息中表示被限流的关键词
+    THROTTLE_KEYWORDS = ["频繁", "验证码", "安全验证", "限流", "429"]
+
+    def __init__(
+        self,
+        initial: int = 1,
+        min_limit: int = 1,
+        max_limit: int = 4,
+        latency_threshold: float = 15.0,
+        decrease_factor: float = 0.5,
+        skip_window: int = 10,
+        skip_ratio: float = 0.5,
+        logger=None
+    ):
+        """
+        初始化并发控制器
+
+        Args:
+            initial: 初始并发上限
+            min_limit: 并发上限的最小值
+            max_limit: 并发上限的最大值
+            latency_threshold: 判定为"低延迟"的单篇耗时上限（秒）
+            decrease_factor: 乘性减小系数
+            skip_window: 统计跳过比例的最近结果数
+            skip_ratio: 触发减小的跳过比例
+            logger: 日志对象
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.latency_threshold = latency_threshold
+        self.decrease_factor = decrease_factor
+        self.skip_ratio = skip_ratio
+        self.logger = logger
+
+        self.changes: List[ConcurrencyChange] = []
+
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self._success_streak = 0
+        self._completed_since_decrease = self.limit
+        self._recent_skips = deque(maxlen=max(1, skip_window))
+
+    async def acquire(self) -> None:
+        """占用一个并发槽位（达到当前上限时等待）"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def release(self) -> None:
+        """释放并发槽位"""
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    async def record(self, result: DownloadResult, latency: float) -> None:
+        """
+        记录一个任务结果并按AIMD规则调整并发上限
+
+        Args:
+            result: 下载结果
+            latency: 任务耗时（秒）
+        """
+        self._completed_since_decrease += 1
+        self._recent_skips.append(result.status == DownloadStatus.SKIPPED)
+
+        error_message = result.error_message or ""
+        if any(keyword in error_message for keyword in self.THROTTLE_KEYWORDS):
+            await self._decrease("检测到限流页面")
+        elif result.status == DownloadStatus.FAILED and any(
+                keyword in error_message for keyword in self.TIMEOUT_KEYWORDS):
+            await self._decrease("下载超时")
+        elif self._skip_spike():
+            await self._decrease(f"最近 {len(self._recent_skips)} 篇中跳过比例过高")
+        elif result.is_success() and latency < self.latency_threshold:
+            self._success_streak += 1
+            if self._success_streak >= self.limit:
+                await self._increase(f"连续 {self._success_streak} 篇成功且耗时低于 {self.latency_threshold:g} 秒")
+        else:
+            self._success_streak = 0
+
+    def _skip_spike(self) -> bool:
+        """最近窗口已满且跳过比例达到阈值"""
+        if len(self._recent_skips) < self._recent_skips.maxlen:
+            return False
+        return sum(self._recent_skips) / len(self._recent_skips) >= self.skip_ratio
+
+    async def _increase(self, reason: str) -> None:
+        """加性增加并发上限"""
+        self._success_streak = 0
+        if self.limit < self.max_limit:
+            await self._set_limit(self.limit + 1, reason)
+
+    async def _decrease(self, reason: str) -> None:
+        """乘性减小并发上限"""
+        self._success_streak = 0
+        if self._completed_since_decrease < self.limit:
+            return
+        self._completed_since_decrease = 0
+        self._recent_skips.clear()
+        new_limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        if new_limit < self.limit:
+            await self._set_limit(new_limit, reason)
+
+    async def _set_limit(self, new_limit: int, reason: str) -> None:
+        """设置新的并发上限并唤醒等待者"""
+        change = ConcurrencyChange(
+            timestamp=datetime.now(),
+            old_limit=self.limit,
+            new_limit=new_limit,
+            reason=reason
+        )
+        self.changes.append(change)
+        if self.logger:
+            self.logger.info(f"⚙️ 并发数调整: {change.old_limit} → {change.new_limit}（{reason}）")
+
+        async with self._condition:
+            self.limit = new_limit
+            self._condition.notify_all()
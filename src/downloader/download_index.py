@@ -0,0 +1,216 @@
+"""
+CNKI论文下载器 - 下载索引
+用SQLite记录已下载的论文（CNKI文献编号、规范化标题、文件SHA-256），重复检索时跳过已有论文
+"""
+
+import re
+import sqlite3
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+from src.core.config import CONFIG_DIR
+from src.core.models import Paper
+
+# 详情页URL中表示文献编号的查询参数（kcms2 的 v 参数每次会话都不同，不能作为编号，
+# 这类论文的编号从检索结果行中提取，见 Paper.paper_id）
+PAPER_ID_PARAMS = ("filename", "fileName", "FileName", "FILENAME")
+
+
+def paper_id_from_url(url: Optional[str]) -> Optional[str]:
+    """
+    从详情页URL解析CNKI文献编号
+
+    Args:
+        url: 详情页URL
+
+    Returns:
+        文献编号（大写），URL中没有稳定编号时返回None
+    """
+    if not url:
+        return None
+    query = parse_qs(urlparse(url).query)
+    for name in PAPER_ID_PARAMS:
+        values = query.get(name)
+        if values and values[0].strip():
+            return values[0].strip().upper()
+    return None
+
+
+def paper_id_of(paper: Paper) -> Optional[str]:
+    """
+    获取论文的CNKI文献编号：优先使用从检索结果行提取的编号，其次从详情页或下载链接中解析
+
+    Args:
+        paper: 论文对象
+
+    Returns:
+        文献编号（大写），未知时返回None
+    """
+    if paper.paper_id and paper.paper_id.strip():
+        return paper.paper_id.strip().upper()
+    return paper_id_from_url(paper.url) or paper_id_from_url(paper.download_url)
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """规范化标题或作者：全角转半角、忽略大小写，去掉空白和标点"""
+    if not text:
+        return ""
+    return re.sub(r"[\W_]+", "", unicodedata.normalize("NFKC", text).lower())
+
+
+@dataclass
+class IndexedFile:
+    """下载索引中的一条记录"""
+    path: Path                      # 保存路径（可能已被删除，内容仍在论文仓库中）
+    sha256: Optional[str] = None    # 文件SHA-256
+
+
+class DownloadIndex:
+    """
+    全局下载索引
+
+    每成功下载一篇论文记录一行：文献编号、规范化标题与作者、文件SHA-256、保存路径。
+    查询按文献编号或规范化标题走索引，O(1) 判断论文是否已下载；
+    记录的文件已被删除或移走、且论文仓库中也没有其内容时视为未下载，并清理该记录。
+    数据库使用 WAL 模式，分片下载的多个进程可同时读写。
+    """
+
+    DEFAULT_PATH = CONFIG_DIR / "download_index.db"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS downloads (
+            id INTEGER PRIMARY KEY,
+            paper_id TEXT,
+            title_key TEXT NOT NULL,
+            authors_key TEXT NOT NULL DEFAULT '',
+            sha256 TEXT,
+            file_path TEXT NOT NULL,
+            size INTEGER,
+            downloaded_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_downloads_paper_id ON downloads(paper_id);
+        CREATE INDEX IF NOT EXISTS idx_downloads_title_key ON downloads(title_key);
+        CREATE INDEX IF NOT EXISTS idx_downloads_sha256 ON downloads(sha256);
+    """
+
+    def __init__(self, path: Path = DEFAULT_PATH, store=None, logger=None):
+        """
+        初始化下载索引
+
+        Args:
+            path: SQLite数据库路径
+            store: 论文仓库（PaperStore），文件已删除但仓库中仍有内容的记录继续保留
+            logger: 日志对象
+        """
+        self.path = Path(path)
+        self.store = store
+        self.logger = logger
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self._conn.close()
+
+    def lookup(self, paper: Paper) -> Optional[IndexedFile]:
+        """
+        查询论文是否已下载
+
+        文献编号相同即为同一篇；否则按规范化标题匹配，且要求双方都有作者并且作者一致
+        （只有标题相同不足以判断，同名论文很常见）。
+
+        Args:
+            paper: 论文对象
+
+        Returns:
+            最近一次下载的记录，未下载时返回None
+        """
+        paper_id = paper_id_of(paper)
+        title_key = normalize_text(paper.title)
+        authors_key = normalize_text(paper.authors)
+        if not paper_id and not title_key:
+            return None
+
+        rows = self._conn.execute(
+            "SELECT id, paper_id, authors_key, sha256, file_path FROM downloads "
+            "WHERE paper_id = ? OR title_key = ? ORDER BY downloaded_at DESC",
+            (paper_id, title_key)
+        ).fetchall()
+
+        for row in rows:
+            if paper_id and row["paper_id"] and row["paper_id"] != paper_id:
+                continue
+            if not (paper_id and row["paper_id"] == paper_id):
+                if not authors_key or authors_key != row["authors_key"]:
+                    continue
+            if self._available(row):
+                return IndexedFile(path=Path(row["file_path"]), sha256=row["sha256"])
+        return None
+
+    def find_by_hash(self, sha256: str, directory: Path, exclude: Path = None) -> Optional[Path]:
+        """
+        在指定目录中查找内容相同的已下载文件
+
+        Args:
+            sha256: 文件SHA-256
+            directory: 目录
+            exclude: 不参与比较的文件（通常是刚下载的文件本身）
+
+        Returns:
+            内容相同的文件路径，没有时返回None
+        """
+        directory = Path(directory).resolve()
+        exclude = Path(exclude).resolve() if exclude else None
+        rows = self._conn.execute(
+            "SELECT id, sha256, file_path FROM downloads WHERE sha256 = ?", (sha256,)
+        ).fetchall()
+        for row in rows:
+            path = Path(row["file_path"])
+            if self._available(row) and path.is_file() and path.parent == directory and path != exclude:
+                return path
+        return None
+
+    def record(self, paper: Paper, file_path: Path, sha256: Optional[str] = None, size: Optional[int] = None) -> None:
+        """
+        记录一篇已下载的论文
+
+        Args:
+            paper: 论文对象
+            file_path: 保存路径
+            sha256: 文件SHA-256
+            size: 文件大小（字节）
+        """
+        self._conn.execute(
+            "INSERT INTO downloads (paper_id, title_key, authors_key, sha256, file_path, size, downloaded_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                paper_id_of(paper),
+                normalize_text(paper.title),
+                normalize_text(paper.authors),
+                sha256,
+                str(Path(file_path).resolve()),
+                size,
+                time.time()
+            )
+        )
+        self._conn.commit()
+
+    def _available(self, row: sqlite3.Row) -> bool:
+        """记录对应的文件仍存在或论文仓库中有其内容时返回True，否则删除该记录"""
+        path = Path(row["file_path"])
+        if path.is_file() or (self.store and self.store.has(row["sha256"])):
+            return True
+        self._conn.execute("DELETE FROM downloads WHERE id = ?", (row["id"],))
+        self._conn.commit()
+        if self.logger:
+            self.logger.debug(f"下载索引中的文件已不存在，移除记录: {path}")
+        return False
@@ -5,17 +5,24 @@ CNKI论文下载器 - 并发下载器
 
 import asyncio
 from pathlib import Path
-from typing import List
+from typing import AsyncIterator, Callable, List, Optional
 from datetime import datetime
 
 from src.core.models import (
     DownloadRequest, DownloadSummary, DownloadResult,
     Paper, ErrorLog, DownloadStatus
 )
-from src.platforms.cnki import CNKIBrowser
+from src.platforms.cnki import CNKIBrowser, CNKIBlockedError
+from src.downloader.scheduler import DownloadScheduler, DownloadJob
+from src.downloader.concurrency import AdaptiveConcurrencyController
+from src.downloader.circuit_breaker import CircuitBreaker
+from src.downloader.retry import RetryPolicy
+from src.downloader.download_index import DownloadIndex
+from src.downloader.paper_store import PaperStore
+from src.downloader.unavailable_cache import UnavailableCache
 from src.utils import (
     ensure_directory, is_valid_download_directory,
-    save_error_log, generate_download_report, setup_logging
+    save_error_log, generate_download_report, setup_logging, file_sha256, FilenameIndex
 )
 
 
@@ -26,7 +33,12 @@ class ConcurrentDownloader:
         self,
         max_concurrent: int = 3,
         config = None,
-        logger = None
+        logger = None,
+        request_interval: float = None,
+        browser_pool = None,
+        rate_limiter = None,
+        max_concurrent_limit: int = None,
+        breaker_state = None
     ):
         """
         初始化并发下载器
@@ -35,13 +47,72 @@ class ConcurrentDownloader:
             max_concurrent: 最大并发数
             config: 配置对象
             logger: 日志对象
+            request_interval: 相邻下载任务的最小启动间隔（秒），为None时使用配置
+            browser_pool: 浏览器池（BrowserPool），提供时复用池中的浏览器，否则每次下载启动新浏览器
+            rate_limiter: 新启动浏览器使用的请求限速器，为None时由浏览器按配置创建
+            max_concurrent_limit: 自适应并发的上限，为None时使用配置
+            breaker_state: 跨进程共享的熔断状态（SharedBreakerState），分片下载时由协调进程提供
         """
         self.max_concurrent = max_concurrent
         self.config = config
+        self.browser_pool = browser_pool
+        self.rate_limiter = rate_limiter
+        self.breaker_state = breaker_state
+        if request_interval is None:
+            request_interval = config.download.request_interval if config else 1.0
+        self.request_interval = request_interval
         self.logger = logger or setup_logging(Path.home() / "cnki_downloader_logs")
 
-        # 信号量控制并发数
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        # 自适应并发：以 max_concurrent 为初始值，运行时在 [1, max_concurrent_limit] 内调整
+        self.adaptive_concurrency = config.download.adaptive_concurrency if config else False
+        if self.adaptive_concurrency:
+            if max_concurrent_limit is None:
+                max_concurrent_limit = config.download.max_concurrent_limit
+            self.max_workers = max(max_concurrent, max_concurrent_limit)
+        else:
+            self.max_workers = max_concurrent
+
+        # 论文仓库：同一篇论文在磁盘上只保存一份，各下载目录通过硬链接共享
+        self.paper_store = PaperStore(PaperStore.DEFAULT_ROOT, logger=self.logger) if (
+            config and config.download.paper_store
+        ) else None
+
+        # 下载索引：跳过以前下载过的论文
+        self.download_index = None
+        if config and config.download.skip_downloaded:
+            try:
+                self.download_index = DownloadIndex(
+                    DownloadIndex.DEFAULT_PATH, store=self.paper_store, logger=self.logger
+                )
+            except Exception as e:
+                self.logger.warning(f"⚠️ 无法打开下载索引，不跳过已下载论文: {e}")
+
+        # 不可下载缓存：近期确认需要付费或没有下载按钮的论文直接跳过，不再打开详情页
+        # recheck_unavailable 时不跳过，但仍按本次结果更新缓存
+        self.unavailable_cache = None
+        self.recheck_unavailable = config.download.recheck_unavailable if config else False
+        if config:
+            try:
+                self.unavailable_cache = UnavailableCache(
+                    ttls={
+                        UnavailableCache.REASON_PAYWALL: config.download.unavailable_paywall_ttl,
+                        UnavailableCache.REASON_NO_BUTTON: config.download.unavailable_no_button_ttl,
+                    },
+                    path=DownloadIndex.DEFAULT_PATH,
+                    logger=self.logger
+                )
+            except Exception as e:
+                self.logger.warning(f"⚠️ 无法打开不可下载缓存，将重新检查所有论文: {e}")
+        self._filename_index: Optional[FilenameIndex] = None
+
+    def close(self) -> None:
+        """释放下载器持有的资源（下载索引和不可下载缓存的连接）"""
+        if self.download_index:
+            self.download_index.close()
+            self.download_index = None
+        if self.unavailable_cache:
+            self.unavailable_cache.close()
+            self.unavailable_cache = None
 
     async def download(self, request: DownloadRequest) -> DownloadSummary:
         """
@@ -72,52 +143,24 @@ class ConcurrentDownloader:
             raise Exception(f"下载目录无效: {error_msg}")
 
         try:
+            if self.browser_pool:
+                # 复用浏览器池中已启动的浏览器（任务结束后不关闭）
+                async with self.browser_pool.lease(request.save_dir, self.max_workers) as browser:
+                    return await self._download_with_browser(browser, request, summary)
+
             # 启动浏览器（使用配置）
             browser = CNKIBrowser(
                 download_dir=request.save_dir,
                 config=self.config,  # 传递完整配置对象
+                max_pages=self.max_workers,  # 每个并发下载独占一个标签页
+                rate_limiter=self.rate_limiter,
                 logger=self.logger
             )
 
             await browser.start()
 
             try:
-                # 步骤1: 导航到CNKI首页
-                await browser.goto_homepage()
-
-                # 步骤2: 选择文献类型
-                await browser.select_document_type(request.doc_type)
-
-                # 步骤3: 执行检索
-                await browser.search(request.keyword)
-
-                # 步骤4: 获取论文列表
-                papers = await browser.get_paper_list(request.count)
-
-                if not papers:
-                    self.logger.warning("未找到任何论文")
-                    summary.end_time = datetime.now()
-                    return summary
-
-                self.logger.info(f"✓ 共找到 {len(papers)} 篇论文")
-
-                # 步骤5: 分批次并发下载
-                self.logger.info(f"正在分批次下载（每批 {self.max_concurrent} 篇）...")
-
-                results = await self._download_all_in_batches(papers, browser)
-
-                # 汇总结果
-                for result in results:
-                    summary.add_result(result)
-
-                summary.end_time = datetime.now()
-
-                # 生成报告
-                report = generate_download_report(summary)
-                self.logger.info("\n" + report)
-
-                return summary
-
+                return await self._download_with_browser(browser, request, summary)
             finally:
                 # 关闭浏览器
                 await browser.close()
@@ -145,6 +188,58 @@ class ConcurrentDownloader:
 
             raise
 
+        finally:
+            if self.paper_store:
+                try:
+                    await asyncio.to_thread(self.paper_store.prune)
+                except Exception as e:
+                    self.logger.debug(f"清理论文仓库失败: {e}")
+            self.close()
+
+    async def _download_with_browser(
+        self,
+        browser: CNKIBrowser,
+        request: DownloadRequest,
+        summary: DownloadSummary
+    ) -> DownloadSummary:
+        """
+        使用已启动的浏览器执行检索和下载
+
+        Args:
+            browser: 已启动的浏览器对象
+            request: 下载请求对象
+            summary: 汇总对象
+
+        Returns:
+            DownloadSummary: 下载汇总结果
+        """
+        # 步骤1-5: 边获取论文列表边滑动窗口并发下载
+        # （结果页缓存未命中时才打开检索结果页：直达URL，失败时回退到 首页 → 文献类型 → 检索）
+        self.logger.info(
+            f"正在下载（并发 {self.max_concurrent} 篇，启动间隔 {self.request_interval} 秒）..."
+        )
+
+        results = await self._download_all_in_window(
+            browser.iter_papers(request.count, request=request), browser, request.count, summary
+        )
+
+        if not results:
+            self.logger.warning("未找到任何论文")
+            summary.end_time = datetime.now()
+            return summary
+
+        # 汇总结果
+        for result in results:
+            summary.add_result(result)
+
+        summary.end_time = datetime.now()
+
+        # 生成报告
+        report = generate_download_report(summary)
+        self.logger.info("\n" + report)
+
+        return summary
+
     async def _download_all(
         self,
         papers: List[Paper],
@@ -184,64 +279,242 @@ class ConcurrentDownloader:
 
         return final_results
 
-    async def _download_all_in_batches(
+    async def _download_all_in_window(
         self,
-        papers: List[Paper],
-        browser: CNKIBrowser
+        papers: AsyncIterator[Paper],
+        browser: CNKIBrowser,
+        total: int,
+        summary: DownloadSummary = None,
+        on_result: Callable[[DownloadJob, DownloadResult], None] = None
     ) -> List[DownloadResult]:
         """
-        分批次并发下载所有论文
+        流水线式滑动窗口下载：论文列表边获取边下载
+
+        列表生产者通过有界队列向下载工作协程投递论文，第一页解析完即开始下载，
+        后续页面的翻页解析与下载并行进行。
 
         Args:
-            papers: 论文列表
+            papers: 论文异步迭代器（如 browser.iter_papers）
             browser: 浏览器对象
+            total: 预期论文总数（用于日志）
+            summary: 汇总对象（记录自适应并发的调整情况）
+            on_result: 每篇论文得到最终结果时的回调
 
         Returns:
             下载结果列表
         """
-        all_results = []
-        total_papers = len(papers)
-        batch_size = self.max_concurrent
-        total_batches = (total_papers + batch_size - 1) // batch_size  # 向上取整
-
-        # 分批处理
-        for batch_num in range(total_batches):
-            start_idx = batch_num * batch_size
-            end_idx = min(start_idx + batch_size, total_papers)
-            batch_papers = papers[start_idx:end_idx]
-
-            current_batch = batch_num + 1
-            self.logger.info(f"\n--- 开始处理第 {current_batch}/{total_batches} 批 (论文 {start_idx + 1}-{end_idx}) ---")
-
-            # 创建当前批次的下载任务
-            tasks = [
-                self._download_single(paper, browser, start_idx + i + 1, total_papers)
-                for i, paper in enumerate(batch_papers)
-            ]
-
-            # 并发执行当前批次的任务
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # 处理当前批次的结果
-            for i, result in enumerate(batch_results):
-                if isinstance(result, Exception):
-                    # 创建失败结果
-                    all_results.append(DownloadResult(
-                        paper=batch_papers[i],
-                        status=DownloadStatus.FAILED,
-                        error_message=str(result)
-                    ))
-                else:
-                    all_results.append(result)
+        controller = None
+        if self.adaptive_concurrency:
+            controller = AdaptiveConcurrencyController(
+                initial=self.max_concurrent,
+                max_limit=self.max_workers,
+                latency_threshold=self.config.download.latency_threshold,
+                logger=self.logger
+            )
+
+        # CNKI返回限流/验证页面时暂停全部下载，冷却后重新排队
+        download_settings = self.config.download if self.config else None
+        breaker = CircuitBreaker(
+            trip_on=(CNKIBlockedError,),
+            cooldown=download_settings.circuit_breaker_cooldown if download_settings else 30.0,
+            max_cooldown=download_settings.circuit_breaker_max_cooldown if download_settings else 300.0,
+            max_trips=download_settings.circuit_breaker_max_trips if download_settings else 5,
+            logger=self.logger,
+            shared_state=self.breaker_state
+        )
+
+        # 超时、导航失败和限流等临时错误按指数退避重试
+        retry_policy = RetryPolicy(
+            retry_times=download_settings.retry_times if download_settings else 2,
+            base_delay=download_settings.retry_base_delay if download_settings else 2.0,
+            max_delay=download_settings.retry_max_delay if download_settings else 60.0
+        )
+
+        def finished(job: DownloadJob, result: DownloadResult) -> None:
+            # 按最终结果（含重试）更新不可下载缓存
+            if self.unavailable_cache:
+                try:
+                    self.unavailable_cache.remember(result)
+                except Exception as e:
+                    self.logger.debug(f"更新不可下载缓存失败: {e}")
+            if on_result:
+                on_result(job, result)
+
+        scheduler = DownloadScheduler(
+            handler=lambda job: self._download_single(job.paper, browser, job.index, total),
+            concurrency=self.max_concurrent,
+            request_interval=self.request_interval,
+            queue_size=self.max_workers * 2,
+            controller=controller,
+            breaker=breaker,
+            retry_policy=retry_policy,
+            on_result=finished,
+            logger=self.logger
+        )
+
+        async def produce() -> int:
+            found = 0
+            try:
+                async for paper in papers:
+                    found += 1
+                    held = await self._find_downloaded(paper, browser.download_dir, found, total)
+                    if held:
+                        scheduler.resolve(paper, found, held)
+                        continue
+                    unavailable = self._find_unavailable(paper, found, total)
+                    if unavailable:
+                        scheduler.resolve(paper, found, unavailable)
+                        continue
+                    await scheduler.submit(paper, found)
+            except Exception as e:
+                # 已获取的论文继续下载；一篇都没有获取到时向上抛出
+                self.logger.error(f"❌ 获取论文列表失败: {e}")
+                if found == 0:
+                    raise
+            finally:
+                scheduler.close()
+            return found
+
+        found, results = await asyncio.gather(produce(), scheduler.run())
+
+        if summary is not None:
+            summary.final_concurrency = controller.limit if controller else self.max_concurrent
+            summary.concurrency_changes = list(controller.changes) if controller else []
+
+        self.logger.info(f"✓ 共找到 {found} 篇论文")
+        self.logger.info(f"\n✓ 所有下载任务处理完成")
+        return results
+
+    async def _find_downloaded(
+        self,
+        paper: Paper,
+        directory: Path,
+        index: int,
+        total: int
+    ) -> Optional[DownloadResult]:
+        """
+        查询下载索引，论文已下载过时不访问详情页
 
-            # 如果不是最后一批，等待一段时间再处理下一批
-            if current_batch < total_batches:
-                delay = 3  # 批次之间延迟3秒
-                self.logger.info(f"✓ 第 {current_batch} 批完成，等待 {delay} 秒后处理下一批...")
-                await asyncio.sleep(delay)
+        - 下载目录中已有该论文：记为跳过
+        - 论文仓库中有该论文：链接到下载目录，记为成功（不访问网络）
+        - 仅在其他目录中下载过且未启用论文仓库：记为跳过
+
+        Args:
+            paper: 论文对象
+            directory: 本次任务的下载目录
+            index: 当前是第几篇
+            total: 总篇数
+
+        Returns:
+            已下载时返回对应结果，否则返回None
+        """
+        if not self.download_index:
+            return None
+        try:
+            record = self.download_index.lookup(paper)
+            if not record:
+                return None
+
+            if record.path.is_file() and record.path.parent == directory.resolve():
+                return self._held_result(paper, record.path, index, total)
+
+            if self.paper_store and self.paper_store.has(record.sha256):
+                # 与浏览器共用同一目录的文件名索引，避免分配到同一个文件名
+                if self._filename_index is None or self._filename_index.directory != directory.resolve():
+                    self._filename_index = FilenameIndex.shared(directory, ".pdf")
+                dest = directory / self._filename_index.reserve(record.path.name)
+                await asyncio.to_thread(self.paper_store.materialize, record.sha256, dest)
+                self.download_index.record(paper, dest, record.sha256, dest.stat().st_size)
+                self.logger.info(f"[{index}/{total}] ✅ 从本地仓库取得: {dest.name}")
+                return DownloadResult(
+                    paper=paper,
+                    status=DownloadStatus.SUCCESS,
+                    file_path=dest,
+                    download_time=0.0,
+                    sha256=record.sha256
+                )
 
-        self.logger.info(f"\n✓ 所有批次处理完成")
-        return all_results
+            if record.path.is_file():
+                return self._held_result(paper, record.path, index, total)
+        except Exception as e:
+            self.logger.debug(f"查询下载索引失败: {e}")
+        return None
+
+    def _find_unavailable(self, paper: Paper, index: int, total: int) -> Optional[DownloadResult]:
+        """
+        查询论文是否近期已确认不可下载（需要付费、没有下载按钮）
+
+        Args:
+            paper: 论文对象
+            index: 论文序号
+            total: 论文总数
+
+        Returns:
+            跳过结果，不在不可下载缓存中时返回None
+        """
+        if not self.unavailable_cache or self.recheck_unavailable:
+            return None
+        try:
+            reason = self.unavailable_cache.check(paper)
+        except Exception as e:
+            self.logger.debug(f"查询不可下载缓存失败: {e}")
+            return None
+        if not reason:
+            return None
+
+        self.logger.info(f"[{index}/{total}] ⚠️ 跳过: {reason} {paper.title[:50]}")
+        return DownloadResult(
+            paper=paper,
+            status=DownloadStatus.SKIPPED,
+            error_message=reason
+        )
+
+    def _held_result(self, paper: Paper, path: Path, index: int, total: int) -> DownloadResult:
+        """已下载过的论文对应的跳过结果"""
+        self.logger.info(f"[{index}/{total}] ⚠️ 跳过: 已下载过 {path}")
+        return DownloadResult(
+            paper=paper,
+            status=DownloadStatus.SKIPPED,
+            file_path=path,
+            error_message=f"已下载过: {path}"
+        )
+
+    async def _index_download(self, result: DownloadResult) -> DownloadResult:
+        """
+        把下载成功的论文登记到论文仓库和下载索引
+
+        同一目录中已有内容完全相同的文件时，删除刚下载的副本，改为跳过结果。
+
+        Args:
+            result: 下载成功的结果
+
+        Returns:
+            写入索引后的结果
+        """
+        path = result.file_path
+        try:
+            # 直接下载时已边写边算；点击下载保存的文件需读一遍
+            sha256 = result.sha256 or await asyncio.to_thread(file_sha256, path)
+            result.sha256 = sha256
+            duplicate = self.download_index and self.download_index.find_by_hash(sha256, path.parent, exclude=path)
+            if duplicate:
+                path.unlink()
+                self.logger.info(f"⚠️ 与已下载文件内容相同，删除副本: {path.name} → {duplicate.name}")
+                return DownloadResult(
+                    paper=result.paper,
+                    status=DownloadStatus.SKIPPED,
+                    file_path=duplicate,
+                    error_message=f"已下载过: {duplicate}",
+                    download_time=result.download_time,
+                    sha256=sha256
+                )
+            if self.paper_store:
+                await asyncio.to_thread(self.paper_store.adopt, path, sha256)
+            if self.download_index:
+                self.download_index.record(result.paper, path, sha256, path.stat().st_size)
+        except Exception as e:
+            self.logger.debug(f"写入下载索引失败: {e}")
+        return result
 
     async def _download_single(
         self,
@@ -251,7 +524,7 @@ class ConcurrentDownloader:
         total: int
     ) -> DownloadResult:
         """
-        下载单篇论文（带并发控制）
+        下载单篇论文（并发数由调度器控制）
 
         Args:
             paper: 论文对象
@@ -262,45 +535,52 @@ class ConcurrentDownloader:
         Returns:
             DownloadResult对象
         """
-        async with self.semaphore:
-            try:
-                self.logger.info(f"[{index}/{total}] 准备下载: {paper.title[:50]}...")
-
-                # 执行下载
-                result = await browser.download_paper(paper)
+        try:
+            self.logger.info(f"[{index}/{total}] 准备下载: {paper.title[:50]}...")
+
+            # 执行下载
+            result = await browser.download_paper(paper)
+            if result.is_success() and (self.download_index or self.paper_store):
+                result = await self._index_download(result)
+
+            # 记录结果
+            if result.is_success():
+                self.logger.info(f"[{index}/{total}] ✅ {result.file_path.name}")
+            elif result.status == DownloadStatus.SKIPPED:
+                self.logger.warning(f"[{index}/{total}] ⚠️ 跳过: {result.error_message}")
+            else:
+                self.logger.error(f"[{index}/{total}] ❌ 失败: {result.error_message}")
 
-                # 记录结果
-                if result.is_success():
-                    self.logger.info(f"[{index}/{total}] ✅ {result.file_path.name}")
-                elif result.status == DownloadStatus.SKIPPED:
-                    self.logger.warning(f"[{index}/{total}] ⚠️ 跳过: {result.error_message}")
-                else:
-                    self.logger.error(f"[{index}/{total}] ❌ 失败: {result.error_message}")
+            return result
 
-                return result
+        except CNKIBlockedError:
+            # 由调度器触发熔断并重新排队
+            raise
 
-            except Exception as e:
-                self.logger.error(f"[{index}/{total}] ❌ 异常: {e}")
+        except Exception as e:
+            self.logger.error(f"[{index}/{total}] ❌ 异常: {e}")
 
-                # 创建失败结果
-                return DownloadResult(
-                    paper=paper,
-                    status=DownloadStatus.FAILED,
-                    error_message=str(e)
-                )
+            # 创建失败结果
+            return DownloadResult(
+                paper=paper,
+                status=DownloadStatus.FAILED,
+                error_message=str(e)
+            )
 
 
 class CNKIDownloader:
     """CNKI论文下载器（高层接口）"""
 
-    def __init__(self, config=None):
+    def __init__(self, config=None, browser_pool=None):
         """
         初始化下载器
 
         Args:
             config: 配置对象（可选）
+            browser_pool: 浏览器池（可选，常驻进程中复用浏览器）
         """
         self.config = config
+        self.browser_pool = browser_pool
         self.logger = setup_logging(
             config.logging.log_dir if config else Path.home() / "cnki_downloader_logs",
             config.logging.level if config else "INFO"
@@ -336,15 +616,8 @@ class CNKIDownloader:
             **kwargs
         )
 
-        # 创建并发下载器
-        downloader = ConcurrentDownloader(
-            max_concurrent=self.config.download.max_concurrent if self.config else 3,
-            config=self.config,
-            logger=self.logger
-        )
-
         # 执行下载
-        return await downloader.download(request)
+        return await self.download_from_request(request)
 
     async def download_from_request(self, request: DownloadRequest) -> DownloadSummary:
         """
@@ -356,12 +629,25 @@ class CNKIDownloader:
         Returns:
             DownloadSummary: 下载汇总结果
         """
-        # 创建并发下载器
-        downloader = ConcurrentDownloader(
-            max_concurrent=self.config.download.max_concurrent if self.config else 3,
-            config=self.config,
-            logger=self.logger
-        )
+        # 创建并发下载器（大批量任务拆分到多个浏览器进程）
+        max_concurrent = self.config.download.max_concurrent if self.config else 3
+        shards = self.config.download.shard_processes if self.config else 1
+        if shards > 1 and request.count >= self.config.download.shard_min_papers:
+            from src.downloader.sharding import ShardedDownloader
+            downloader = ShardedDownloader(
+                shards=shards,
+                max_concurrent=max_concurrent,
+                config=self.config,
+                logger=self.logger,
+                browser_pool=self.browser_pool
+            )
+        else:
+            downloader = ConcurrentDownloader(
+                max_concurrent=max_concurrent,
+                config=self.config,
+                logger=self.logger,
+                browser_pool=self.browser_pool
+            )
 
         # 执行下载
         return await downloader.download(request)
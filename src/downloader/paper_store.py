@@ -0,0 +1,133 @@
+"""
+CNKI论文下载器 - 论文内容仓库
+按SHA-256保存每篇论文的唯一一份文件，各下载目录中的文件是指向它的硬链接
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+from src.core.config import CONFIG_DIR
+
+
+class PaperStore:
+    """
+    内容寻址的论文仓库
+
+    文件保存为 <root>/<sha256前两位>/<sha256>.pdf。下载完成的文件登记到仓库后，
+    下载目录中的文件与仓库文件是同一份数据（硬链接）；之后其他下载目录需要同一篇论文时，
+    直接从仓库链接过去，不访问网络也不额外占用磁盘。
+    仓库只保存能与下载目录硬链接的文件：无法建立硬链接（跨文件系统、文件系统不支持）时不登记，
+    不会为每篇论文多复制一份；下载目录中的链接都被删除后，prune() 清理仓库中的对应文件。
+
+    注意：硬链接的文件共享内容，直接在原文件上修改（如部分PDF阅读器保存批注）会同时影响其他目录中的同一篇论文。
+    """
+
+    DEFAULT_ROOT = CONFIG_DIR / "store"
+
+    def __init__(self, root: Path = DEFAULT_ROOT, logger=None):
+        """
+        初始化论文仓库
+
+        Args:
+            root: 仓库根目录
+            logger: 日志对象
+        """
+        self.root = Path(root)
+        self.logger = logger
+
+    def blob_path(self, sha256: str) -> Path:
+        """获取内容对应的仓库文件路径"""
+        return self.root / sha256[:2] / f"{sha256}.pdf"
+
+    def has(self, sha256: str) -> bool:
+        """仓库中是否已有该内容"""
+        return bool(sha256) and self.blob_path(sha256).is_file()
+
+    def adopt(self, path: Path, sha256: str) -> Path:
+        """
+        登记一个下载完成的文件（同步函数，调用方应放到线程中执行）
+
+        仓库中还没有该内容时，把文件链接进仓库；已有时，把文件替换为指向仓库的链接，释放重复占用的空间。
+        无法建立硬链接时保持原样，不登记到仓库。
+
+        Args:
+            path: 下载完成的文件
+            sha256: 文件SHA-256
+
+        Returns:
+            文件路径（与 path 相同）
+        """
+        blob = self.blob_path(sha256)
+        try:
+            if blob.is_file():
+                if not os.path.samefile(blob, path):
+                    self._link(blob, path)
+                return path
+
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            self._link(path, blob)
+        except OSError as e:
+            if self.logger:
+                self.logger.debug(f"无法建立硬链接，不登记到论文仓库: {e}")
+        return path
+
+    def materialize(self, sha256: str, dest: Path) -> Path:
+        """
+        把仓库中的内容放到指定路径（同步函数，调用方应放到线程中执行）
+
+        无法建立硬链接时复制（目标目录需要一份自己的文件）。
+
+        Args:
+            sha256: 文件SHA-256
+            dest: 目标文件路径
+
+        Returns:
+            目标文件路径
+        """
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        self._link(self.blob_path(sha256), dest, copy_fallback=True)
+        return dest
+
+    def prune(self) -> int:
+        """
+        删除仓库中已没有下载目录引用的文件（硬链接数为1，同步函数，调用方应放到线程中执行）
+
+        Returns:
+            删除的文件数
+        """
+        removed = 0
+        for blob in self.root.glob("*/*.pdf"):
+            try:
+                if blob.stat().st_nlink <= 1:
+                    blob.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        if removed and self.logger:
+            self.logger.debug(f"论文仓库: 清理 {removed} 个不再被引用的文件")
+        return removed
+
+    def _link(self, src: Path, dest: Path, copy_fallback: bool = False) -> None:
+        """
+        让 dest 成为 src 的硬链接，通过临时文件原子替换
+
+        Args:
+            src: 源文件
+            dest: 目标文件
+            copy_fallback: 无法建立硬链接时是否改为复制
+
+        Raises:
+            OSError: 无法建立硬链接且不复制
+        """
+        tmp_path = dest.with_name(f"{dest.name}.{os.getpid()}.link")
+        tmp_path.unlink(missing_ok=True)
+        try:
+            os.link(src, tmp_path)
+        except OSError as e:
+            if not copy_fallback:
+                raise
+            if self.logger:
+                self.logger.debug(f"无法建立硬链接，改为复制: {e}")
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dest)
@@ -0,0 +1,65 @@
+"""
+CNKI论文下载器 - 失败重试策略
+只重试超时、导航失败和限流等临时错误，重试间隔按指数退避并加入随机抖动
+"""
+
+import random
+
+from src.core.models import DownloadResult, DownloadStatus
+
+
+class RetryPolicy:
+    """
+    下载重试策略
+
+    第 n 次重试前等待 min(max_delay, base_delay * 2^(n-1)) 的一半到全部之间的随机时长，
+    避免多篇论文在同一时刻集中重试。
+    """
+
+    # 错误信息中表示可重试的临时错误的关键词（超时、导航/网络失败、限流）
+    RETRYABLE_KEYWORDS = [
+        "Timeout", "timeout", "超时",
+        "net::ERR_", "Navigation", "navigation", "Target closed", "has been closed",
+        "下载不完整", "Connection", "connection",
+        "频繁", "限流", "验证", "429",
+    ]
+
+    def __init__(self, retry_times: int = 2, base_delay: float = 2.0, max_delay: float = 60.0):
+        """
+        初始化重试策略
+
+        Args:
+            retry_times: 最大重试次数（不含首次尝试）
+            base_delay: 首次重试前的基准等待时间（秒）
+            max_delay: 等待时间上限（秒）
+        """
+        self.retry_times = max(0, retry_times)
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+
+    def is_retryable(self, result: DownloadResult) -> bool:
+        """失败结果是否为可重试的临时错误（跳过的付费论文等不重试）"""
+        if result.status != DownloadStatus.FAILED:
+            return False
+        error_message = result.error_message or ""
+        return any(keyword in error_message for keyword in self.RETRYABLE_KEYWORDS)
+
+    def should_retry(self, result: DownloadResult, attempt: int) -> bool:
+        """
+        判断是否需要重试
+
+        Args:
+            result: 本次尝试的结果
+            attempt: 本次是第几次尝试（从1开始）
+        """
+        return attempt <= self.retry_times and self.is_retryable(result)
+
+    def next_delay(self, attempt: int) -> float:
+        """
+        计算第 attempt 次尝试失败后的等待时间（秒）
+
+        Args:
+            attempt: 刚失败的是第几次尝试（从1开始）
+        """
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(delay / 2, delay)
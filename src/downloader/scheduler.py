@@ -0,0 +1,252 @@
+"""
+CNKI论文下载器 - 下载调度器
+基于队列的滑动窗口调度：始终保持 N 个下载同时进行
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.core.models import Paper, DownloadResult, DownloadStatus
+
+
+@dataclass
+class DownloadJob:
+    """调度队列中的单个下载任务"""
+    paper: Paper                    # 论文对象
+    index: int                      # 序号（从1开始，用于日志和结果排序）
+    requeued: bool = False          # 是否为重新排队的任务（不占用等待队列容量）
+    attempt: int = 1                # 当前是第几次尝试
+    attempt_times: List[float] = field(default_factory=list)  # 已完成尝试的耗时（秒）
+
+
+class DownloadScheduler:
+    """
+    滑动窗口下载调度器
+
+    启动 concurrency 个工作协程从队列中取任务，任一任务完成后立即开始下一个，
+    不再等待整批中最慢的论文。相邻两次任务启动之间至少间隔 request_interval 秒。
+    提供熔断器时，被CNKI拦截的任务会触发熔断并重新排队，而不是记为失败；
+    提供重试策略时，可重试的失败任务在退避等待后重新排队。
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[DownloadJob], Awaitable[DownloadResult]],
+        concurrency: int = 1,
+        request_interval: float = 0.0,
+        queue_size: int = 0,
+        controller=None,
+        breaker=None,
+        retry_policy=None,
+        on_result: Optional[Callable[[DownloadJob, DownloadResult], None]] = None,
+        logger=None
+    ):
+        """
+        初始化调度器
+
+        Args:
+            handler: 执行单个下载任务的协程函数
+            concurrency: 同时进行的下载数
+            request_interval: 相邻任务启动的最小间隔（秒）
+            queue_size: 等待队列容量（0表示不限），队列满时 submit() 等待空位
+            controller: 自适应并发控制器（AdaptiveConcurrencyController），
+                提供时按其上限启动工作协程，运行时由其动态控制同时进行的下载数
+            breaker: 全局熔断器（CircuitBreaker），被拦截的任务暂停全部下载并重新排队
+            retry_policy: 重试策略（RetryPolicy），为None时失败任务不重试
+            on_result: 任务得到最终结果时的回调（用于边下载边汇报进度）
+            logger: 日志对象
+        """
+        self.handler = handler
+        self.controller = controller
+        self.breaker = breaker
+        self.retry_policy = retry_policy
+        self.on_result = on_result
+        self.concurrency = controller.max_limit if controller else max(1, concurrency)
+        self.request_interval = max(0.0, request_interval)
+        self.logger = logger
+
+        # 队列本身不限容量，以便任务随时重新排队；提交时由 _capacity 限制等待中的新任务数
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._capacity = asyncio.Semaphore(queue_size) if queue_size > 0 else None
+        self._results: Dict[int, DownloadResult] = {}
+        self._retry_tasks = set()
+        self._closed = asyncio.Event()
+        self._start_lock = asyncio.Lock()
+        self._next_start_time = 0.0
+
+    async def submit(self, paper: Paper, index: int) -> None:
+        """
+        提交一个下载任务（可与 run() 并发调用，边提交边下载）
+
+        Args:
+            paper: 论文对象
+            index: 序号
+        """
+        if self._capacity:
+            await self._capacity.acquire()
+        self._queue.put_nowait(DownloadJob(paper=paper, index=index))
+
+    def resolve(self, paper: Paper, index: int, result: DownloadResult) -> None:
+        """
+        直接登记一个无需下载的任务结果（如已下载过的论文），不进入队列
+
+        Args:
+            paper: 论文对象
+            index: 序号
+            result: 下载结果
+        """
+        self._results[index] = result
+        if self.on_result:
+            self.on_result(DownloadJob(paper=paper, index=index), result)
+
+    def _requeue(self, job: DownloadJob) -> None:
+        """将任务放回队列末尾（须在原任务 task_done() 之前调用，保证 run() 不会提前结束）"""
+        job.requeued = True
+        self._queue.put_nowait(job)
+
+    def close(self) -> None:
+        """声明不会再有新任务提交，队列清空后 run() 返回"""
+        self._closed.set()
+
+    async def run(self) -> List[DownloadResult]:
+        """
+        运行调度器直到所有任务完成
+
+        Returns:
+            按序号排序的下载结果列表
+        """
+        workers = [
+            asyncio.create_task(self._worker(worker_id))
+            for worker_id in range(self.concurrency)
+        ]
+
+        try:
+            await self._closed.wait()
+            await self._queue.join()
+        finally:
+            pending = workers + list(self._retry_tasks)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return [self._results[index] for index in sorted(self._results)]
+
+    async def _worker(self, worker_id: int) -> None:
+        """工作协程：循环取任务并执行"""
+        while True:
+            if self.controller:
+                await self.controller.acquire()
+            try:
+                job = await self._queue.get()
+                if self._capacity and not job.requeued:
+                    self._capacity.release()
+                retrying = False
+                try:
+                    epoch = await self.breaker.acquire() if self.breaker else 0
+                    await self._wait_for_start_slot()
+                    loop = asyncio.get_running_loop()
+                    started = loop.time()
+                    result = await self._run_job(job, epoch)
+                    elapsed = loop.time() - started
+                    if result is not None:
+                        job.attempt_times.append(elapsed)
+                        retrying = self._schedule_retry(job, result)
+                        if not retrying:
+                            result.attempts = job.attempt
+                            result.attempt_times = list(job.attempt_times)
+                            self._results[job.index] = result
+                            if self.on_result:
+                                self.on_result(job, result)
+                    if self.controller:
+                        await self.controller.record(result or self._blocked_result(job), elapsed)
+                finally:
+                    # 等待重试的任务由重试协程在重新入队后调用 task_done()
+                    if not retrying:
+                        self._queue.task_done()
+            finally:
+                if self.controller:
+                    await self.controller.release()
+
+    async def _run_job(self, job: DownloadJob, epoch: int = 0) -> Optional[DownloadResult]:
+        """
+        执行任务，将未捕获的异常转换为失败结果
+
+        Returns:
+            下载结果；任务因熔断重新排队时返回None
+        """
+        try:
+            result = await self.handler(job)
+        except Exception as e:
+            if self.breaker and self.breaker.should_trip(e):
+                if await self.breaker.trip(str(e), epoch):
+                    if self.logger:
+                        self.logger.info(f"[{job.index}] 🔁 {e}，任务重新排队")
+                    self._requeue(job)
+                    return None
+                if self.logger:
+                    self.logger.error(f"[{job.index}] ❌ {e}，熔断次数已用尽")
+                return self._blocked_result(job, str(e))
+            if self.breaker:
+                await self.breaker.record_success(epoch)
+            if self.logger:
+                self.logger.error(f"[{job.index}] ❌ 调度任务异常: {e}")
+            return DownloadResult(
+                paper=job.paper,
+                status=DownloadStatus.FAILED,
+                error_message=str(e)
+            )
+
+        if self.breaker:
+            await self.breaker.record_success(epoch)
+        return result
+
+    def _schedule_retry(self, job: DownloadJob, result: DownloadResult) -> bool:
+        """
+        失败结果可重试时，退避等待后将任务重新排队
+
+        Returns:
+            是否已安排重试
+        """
+        if not self.retry_policy or not self.retry_policy.should_retry(result, job.attempt):
+            return False
+
+        delay = self.retry_policy.next_delay(job.attempt)
+        if self.logger:
+            self.logger.info(
+                f"[{job.index}] 🔁 第 {job.attempt} 次尝试失败（{result.error_message}），{delay:.1f} 秒后重试"
+            )
+        job.attempt += 1
+
+        async def retry_later():
+            try:
+                await asyncio.sleep(delay)
+                self._requeue(job)
+            finally:
+                self._queue.task_done()
+
+        task = asyncio.create_task(retry_later())
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+        return True
+
+    @staticmethod
+    def _blocked_result(job: DownloadJob, message: str = "CNKI返回限流页面") -> DownloadResult:
+        """被拦截任务对应的失败结果（熔断次数用尽时作为最终结果，也用于通知并发控制器）"""
+        return DownloadResult(
+            paper=job.paper,
+            status=DownloadStatus.FAILED,
+            error_message=message
+        )
+
+    async def _wait_for_start_slot(self) -> None:
+        """保证相邻两次任务启动之间至少间隔 request_interval 秒"""
+        if self.request_interval <= 0:
+            return
+
+        async with self._start_lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_start_time - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start_time = loop.time() + self.request_interval
@@ -0,0 +1,323 @@
+"""
+CNKI论文下载器 - 多进程分片下载
+协调进程获取论文列表后拆分给多个下载进程，每个进程驱动独立的浏览器，结果实时汇总
+"""
+
+import asyncio
+import multiprocessing
+import queue
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from src.core.models import DownloadRequest, DownloadSummary, DownloadResult, DownloadStatus, Paper
+from src.downloader.circuit_breaker import SharedBreakerState
+from src.downloader.downloader import ConcurrentDownloader
+from src.platforms.cnki import CNKIBrowser
+from src.utils import SharedTokenBucket, generate_download_report, setup_logging
+
+# 下载进程发回协调进程的消息类型
+MSG_RESULT = "result"   # (MSG_RESULT, 分片号, 序号, DownloadResult)
+MSG_DONE = "done"       # (MSG_DONE, 分片号, 结束时并发数, 并发数调整记录)
+MSG_ERROR = "error"     # (MSG_ERROR, 分片号, 错误信息)
+
+
+def _shard_main(
+    shard_id: int,
+    config,
+    request: DownloadRequest,
+    jobs: List[Tuple[int, Paper]],
+    limits: Tuple[int, int],
+    rate_limiter: SharedTokenBucket,
+    breaker_state: SharedBreakerState,
+    results
+) -> None:
+    """
+    下载进程入口：启动独立的浏览器下载本分片的论文
+
+    Args:
+        shard_id: 分片号
+        config: 配置对象
+        request: 原始下载请求
+        jobs: 本分片的 (序号, 论文) 列表
+        limits: 本分片的 (初始并发数, 自适应并发上限)
+        rate_limiter: 所有进程共享的请求限速器
+        breaker_state: 所有进程共享的熔断状态
+        results: 发回结果的进程间队列
+    """
+    try:
+        asyncio.run(_run_shard(shard_id, config, request, jobs, limits, rate_limiter, breaker_state, results))
+    except Exception as e:
+        results.put((MSG_ERROR, shard_id, str(e)))
+
+
+async def _run_shard(
+    shard_id: int,
+    config,
+    request: DownloadRequest,
+    jobs: List[Tuple[int, Paper]],
+    limits: Tuple[int, int],
+    rate_limiter: SharedTokenBucket,
+    breaker_state: SharedBreakerState,
+    results
+) -> None:
+    """在下载进程中运行滑动窗口下载，每篇论文完成后立即把结果发回协调进程"""
+    logger = setup_logging(config.logging.log_dir, config.logging.level)
+    logger.info(f"分片 {shard_id + 1}: 开始下载 {len(jobs)} 篇论文")
+
+    max_concurrent, max_concurrent_limit = limits
+    downloader = ConcurrentDownloader(
+        max_concurrent=max_concurrent,
+        config=config,
+        logger=logger,
+        max_concurrent_limit=max_concurrent_limit,
+        breaker_state=breaker_state
+    )
+    browser = CNKIBrowser(
+        download_dir=request.save_dir,
+        config=config,
+        max_pages=downloader.max_workers,
+        rate_limiter=rate_limiter,
+        logger=logger
+    )
+    await browser.start()
+
+    try:
+        async def papers():
+            for _, paper in jobs:
+                yield paper
+
+        # 调度器内的序号从1开始，对应本分片列表中的位置
+        summary = DownloadSummary(request=request)
+        await downloader._download_all_in_window(
+            papers(), browser, len(jobs), summary,
+            on_result=lambda job, result: results.put((MSG_RESULT, shard_id, jobs[job.index - 1][0], result))
+        )
+        results.put((MSG_DONE, shard_id, summary.final_concurrency, summary.concurrency_changes))
+    finally:
+        await browser.close()
+        downloader.close()
+
+
+class ShardedDownloader(ConcurrentDownloader):
+    """
+    多进程分片下载器
+
+    单个进程只有一个事件循环，Playwright消息处理和日志格式化都限制在一个CPU核心上。
+    本下载器先在协调进程中打开检索结果页并获取全部论文，再按轮询方式拆分给 shards 个下载进程，
+    每个进程启动自己的浏览器（载入协调进程保存的会话）并按原有的滑动窗口方式下载。
+    所有进程共享一个跨进程令牌桶，合计请求速率不超过 rate_limit_rps；并发数（及自适应上限）按进程数平分，
+    合计不超过单进程下载时的设置；所有进程共享熔断状态，任一进程被拦截时全部暂停。
+    各进程的结果实时发回协调进程，汇总到同一个 DownloadSummary。
+    """
+
+    # 协调进程等待结果时的轮询间隔（秒）
+    POLL_INTERVAL = 0.5
+
+    # 结束时等待下载进程退出的时间（秒），超时后强制结束
+    JOIN_TIMEOUT = 10.0
+
+    def __init__(self, shards: int = 2, max_concurrent: int = 3, config=None, logger=None, browser_pool=None):
+        """
+        初始化分片下载器
+
+        Args:
+            shards: 下载进程数
+            max_concurrent: 所有下载进程合计的最大并发数
+            config: 配置对象
+            logger: 日志对象
+            browser_pool: 浏览器池（仅用于协调进程获取论文列表）
+        """
+        # 浏览器进程需用 spawn 方式启动（Playwright 不支持在 fork 出的子进程中继续使用）
+        self.mp_context = multiprocessing.get_context("spawn")
+        download_settings = config.download if config else None
+        super().__init__(
+            max_concurrent=max_concurrent,
+            config=config,
+            logger=logger,
+            browser_pool=browser_pool,
+            rate_limiter=SharedTokenBucket(
+                download_settings.rate_limit_rps if download_settings else 1.0,
+                download_settings.rate_limit_burst if download_settings else 3,
+                context=self.mp_context
+            )
+        )
+        self.shards = max(1, shards)
+        self.breaker_state = SharedBreakerState(context=self.mp_context)
+
+    async def _download_with_browser(
+        self,
+        browser: CNKIBrowser,
+        request: DownloadRequest,
+        summary: DownloadSummary
+    ) -> DownloadSummary:
+        """
+        用协调进程的浏览器获取论文列表，再分片交给下载进程
+
+        Args:
+            browser: 协调进程的浏览器对象
+            request: 下载请求对象
+            summary: 汇总对象
+
+        Returns:
+            DownloadSummary: 下载汇总结果
+        """
+        papers = [paper async for paper in browser.iter_papers(request.count, request=request)]
+        self.logger.info(f"✓ 共找到 {len(papers)} 篇论文")
+
+        if not papers:
+            self.logger.warning("未找到任何论文")
+            summary.end_time = datetime.now()
+            return summary
+
+        # 下载进程启动时载入这里保存的会话，不必重新预热
+        await browser.save_session()
+
+        # 每个进程至少并发1篇，进程数不超过总并发数
+        shard_count = min(self.shards, len(papers), self.max_concurrent)
+        if shard_count < self.shards:
+            self.logger.info(f"下载进程数调整为 {shard_count}（不超过论文数和总并发数 {self.max_concurrent}）")
+        indexed = list(enumerate(papers, start=1))
+        shards = [indexed[shard_id::shard_count] for shard_id in range(shard_count)]
+        limits = [
+            (self._split(self.max_concurrent, shard_count, shard_id), self._split(self.max_workers, shard_count, shard_id))
+            for shard_id in range(shard_count)
+        ]
+        self.logger.info(
+            f"正在下载（{shard_count} 个进程，合计并发 {self.max_concurrent} 篇，"
+            f"共享限速 {self.rate_limiter.rate:g} 次/秒）..."
+        )
+
+        results_queue = self.mp_context.Queue()
+        processes = [
+            self.mp_context.Process(
+                target=_shard_main,
+                args=(
+                    shard_id, self.config, request, jobs, limits[shard_id],
+                    self.rate_limiter, self.breaker_state, results_queue
+                ),
+                name=f"cnki-shard-{shard_id + 1}"
+            )
+            for shard_id, jobs in enumerate(shards)
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            results = await self._collect_results(processes, shards, results_queue, len(papers), summary)
+        finally:
+            self._stop_processes(processes, results_queue)
+
+        # 汇总结果（按论文序号排序）
+        for index in sorted(results):
+            summary.add_result(results[index])
+
+        summary.end_time = datetime.now()
+
+        report = generate_download_report(summary)
+        self.logger.info("\n" + report)
+
+        return summary
+
+    async def _collect_results(
+        self,
+        processes: List,
+        shards: List[List[Tuple[int, Paper]]],
+        results_queue,
+        total: int,
+        summary: DownloadSummary
+    ) -> Dict[int, DownloadResult]:
+        """
+        接收下载进程发回的结果，直到所有进程结束
+
+        异常退出的进程中尚未完成的论文记为失败。
+
+        Returns:
+            {序号: 下载结果}
+        """
+        loop = asyncio.get_running_loop()
+        results: Dict[int, DownloadResult] = {}
+        finished = set()
+        errors: Dict[int, str] = {}
+        final_concurrency = 0
+
+        while True:
+            message = await loop.run_in_executor(None, self._get_message, results_queue)
+            if message is None:
+                if all(not process.is_alive() for process in processes):
+                    # 进程退出前已把消息写入管道，再取一次确认队列已空
+                    message = self._get_message(results_queue, block=False)
+                    if message is None:
+                        break
+                else:
+                    continue
+
+            kind, shard_id = message[0], message[1]
+            if kind == MSG_RESULT:
+                index, result = message[2], message[3]
+                results[index] = result
+                status = "✅" if result.is_success() else ("⚠️" if result.status == DownloadStatus.SKIPPED else "❌")
+                self.logger.info(f"[{len(results)}/{total}] {status} 分片 {shard_id + 1}: {result.paper.title[:50]}")
+            elif kind == MSG_DONE:
+                finished.add(shard_id)
+                final_concurrency += message[2] or 0
+                summary.concurrency_changes.extend(message[3])
+            elif kind == MSG_ERROR:
+                errors[shard_id] = message[2]
+                self.logger.error(f"❌ 分片 {shard_id + 1} 出错: {message[2]}")
+
+        for shard_id, (process, jobs) in enumerate(zip(processes, shards)):
+            if shard_id in finished:
+                continue
+            reason = errors.get(shard_id) or f"下载进程异常退出（退出码 {process.exitcode}）"
+            for index, paper in jobs:
+                if index not in results:
+                    results[index] = DownloadResult(
+                        paper=paper,
+                        status=DownloadStatus.FAILED,
+                        error_message=reason
+                    )
+
+        summary.final_concurrency = final_concurrency
+        summary.concurrency_changes.sort(key=lambda change: change.timestamp)
+        return results
+
+    @staticmethod
+    def _split(total: int, parts: int, index: int) -> int:
+        """把 total 平分为 parts 份，返回第 index 份（余数分给前几份）"""
+        return total // parts + (1 if index < total % parts else 0)
+
+    def _stop_processes(self, processes: List, results_queue) -> None:
+        """
+        结束下载进程
+
+        协调进程出错时下载进程可能仍在向队列写入，子进程退出前会等待管道中的数据被读走，
+        因此先结束仍在运行的进程并清空队列，再限时等待退出，避免 join() 一直阻塞。
+        """
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self.JOIN_TIMEOUT
+        while any(process.is_alive() for process in processes) and time.monotonic() < deadline:
+            # 读走子进程留在管道中的消息，子进程才能退出
+            while self._get_message(results_queue, block=False) is not None:
+                pass
+            for process in processes:
+                process.join(timeout=0.1)
+
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+            process.join()
+
+        # 协调进程不再读取队列，退出时不等待队列的后台线程
+        results_queue.close()
+        results_queue.cancel_join_thread()
+
+    def _get_message(self, results_queue, block: bool = True):
+        """从进程间队列取一条消息，超时返回None"""
+        try:
+            return results_queue.get(block=block, timeout=self.POLL_INTERVAL if block else None)
+        except queue.Empty:
+            return None
@@ -0,0 +1,145 @@
+"""
+CNKI论文下载器 - 不可下载论文缓存
+记录近期确认需要付费或没有下载按钮的论文，有效期内再次遇到时直接跳过
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.core.models import DownloadResult, DownloadStatus, Paper
+from src.downloader.download_index import DownloadIndex, paper_id_of, normalize_text
+
+
+class UnavailableCache:
+    """
+    不可下载论文的负缓存
+
+    与下载索引存放在同一个SQLite数据库中。优先以CNKI文献编号为键，
+    编号未知时以规范化的标题和作者为键（缺少作者时不缓存）。不同原因使用不同的有效期（ttls，秒，<=0 表示不缓存该原因），
+    过期后重新尝试下载；下载成功的论文会从缓存中移除。
+    需要登录取决于当前会话而不是论文本身，不记录。
+    """
+
+    REASON_PAYWALL = "paywall"          # 需要付费权限
+    REASON_NO_BUTTON = "no_button"      # 详情页没有下载按钮
+
+    # 未找到下载按钮时的错误信息
+    NO_BUTTON_MESSAGE = "未找到下载按钮"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS unavailable (
+            paper_key TEXT PRIMARY KEY,
+            reason TEXT NOT NULL,
+            message TEXT,
+            checked_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, ttls: Dict[str, float], path: Path = DownloadIndex.DEFAULT_PATH, logger=None):
+        """
+        初始化负缓存
+
+        Args:
+            ttls: 各原因的有效期（秒）
+            path: SQLite数据库路径
+            logger: 日志对象
+        """
+        self.ttls = ttls
+        self.path = Path(path)
+        self.logger = logger
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self._conn.close()
+
+    @staticmethod
+    def paper_key(paper: Paper) -> Optional[str]:
+        """论文在缓存中的键"""
+        paper_id = paper_id_of(paper)
+        if paper_id:
+            return f"id:{paper_id}"
+        # 只有标题不足以区分论文（同名论文很常见），缺少作者时不缓存
+        title_key = normalize_text(paper.title)
+        authors_key = normalize_text(paper.authors)
+        if title_key and authors_key:
+            return f"title:{title_key}|{authors_key}"
+        return None
+
+    @classmethod
+    def reason_for(cls, result: DownloadResult) -> Optional[str]:
+        """
+        判断下载结果是否属于需要缓存的不可下载原因
+
+        付费只认详情页识别的结果（paywalled），按错误信息中的关键词推断的"需要付费权限"可能只是登录问题，不缓存。
+
+        Returns:
+            原因，不属于时返回None
+        """
+        message = result.error_message or ""
+        if result.status == DownloadStatus.SKIPPED and result.paywalled:
+            return cls.REASON_PAYWALL
+        if result.status == DownloadStatus.FAILED and cls.NO_BUTTON_MESSAGE in message:
+            return cls.REASON_NO_BUTTON
+        return None
+
+    def check(self, paper: Paper) -> Optional[str]:
+        """
+        查询论文是否在有效期内被确认为不可下载
+
+        Args:
+            paper: 论文对象
+
+        Returns:
+            上次的原因说明（如"需要付费权限（3小时前确认）"），不在缓存中或已过期时返回None
+        """
+        key = self.paper_key(paper)
+        if not key:
+            return None
+        row = self._conn.execute(
+            "SELECT reason, message, checked_at FROM unavailable WHERE paper_key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+
+        age = time.time() - row["checked_at"]
+        if age > self.ttls.get(row["reason"], 0):
+            self.forget(paper)
+            return None
+        return f"{row['message']}（{age / 3600:.1f}小时前确认）"
+
+    def remember(self, result: DownloadResult) -> None:
+        """
+        根据最终下载结果更新缓存：不可下载时记录，下载成功时移除
+
+        Args:
+            result: 最终下载结果（含重试）
+        """
+        if result.is_success():
+            self.forget(result.paper)
+            return
+
+        reason = self.reason_for(result)
+        key = self.paper_key(result.paper)
+        if not reason or not key or self.ttls.get(reason, 0) <= 0:
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO unavailable (paper_key, reason, message, checked_at) VALUES (?, ?, ?, ?)",
+            (key, reason, result.error_message, time.time())
+        )
+        self._conn.commit()
+
+    def forget(self, paper: Paper) -> None:
+        """从缓存中移除论文"""
+        key = self.paper_key(paper)
+        if key:
+            self._conn.execute("DELETE FROM unavailable WHERE paper_key = ?", (key,))
+            self._conn.commit()
@@ -11,14 +11,20 @@ from src.core.parser import InputParser
 from src.downloader import CNKIDownloader
 from src.core.config import ConfigManager
 from src.core.models import DownloadRequest
+from src.daemon import DaemonClient, DaemonUnavailable
 from src.utils import ensure_directory, setup_logging
 
 
 class CNKIPaperDownloaderSkill:
     """CNKI论文下载器Skill"""
 
-    def __init__(self):
-        """初始化Skill"""
+    def __init__(self, browser_pool=None):
+        """
+        初始化Skill
+
+        Args:
+            browser_pool: 浏览器池（仅在常驻进程中提供，此时直接在本进程下载）
+        """
         # 加载配置
         self.config_manager = ConfigManager()
         self.config = self.config_manager.get()
@@ -35,12 +41,41 @@ class CNKIPaperDownloaderSkill:
         )
 
         # 初始化下载器
-        self.downloader = CNKIDownloader(config=self.config)
+        self.downloader = CNKIDownloader(config=self.config, browser_pool=browser_pool)
+
+        # 常驻进程客户端：下载任务交给复用浏览器的常驻进程执行
+        daemon_settings = self.config.daemon
+        self.daemon_client = None
+        if browser_pool is None and daemon_settings.enabled and DaemonClient.supported():
+            self.daemon_client = DaemonClient(
+                daemon_settings.socket_path,
+                start_timeout=daemon_settings.start_timeout,
+                config_fingerprint=self.config.fingerprint(),
+                logger=self.logger
+            )
 
     async def download_papers(self, user_input: str) -> str:
         """
         下载论文（主接口）
 
+        Args:
+            user_input: 用户输入文本
+
+        Returns:
+            下载结果报告
+        """
+        if self.daemon_client:
+            try:
+                return await self.daemon_client.download(user_input)
+            except DaemonUnavailable as e:
+                self.logger.warning(f"⚠️ 常驻进程不可用，在当前进程中下载: {e}")
+
+        return await self._download_papers_local(user_input)
+
+    async def _download_papers_local(self, user_input: str) -> str:
+        """
+        在当前进程中解析输入并下载论文
+
         Args:
             user_input: 用户输入文本
 
@@ -122,6 +157,11 @@ class CNKIPaperDownloaderSkill:
                     if result.error_message:
                         lines.append(f"   ⚠️ {paper_info} - 原因: {result.error_message}")
 
+        if summary.concurrency_changes:
+            lines.append(
+                f"\n⚙️ 并发调整 {len(summary.concurrency_changes)} 次，最终并发数: {summary.final_concurrency}"
+            )
+
         elapsed = summary.get_elapsed_time()
         if elapsed:
             from src.utils.format_utils import format_duration
@@ -3,5 +3,7 @@ CNKI平台实现
 """
 
 from src.platforms.cnki.browser import CNKIBrowser
+from src.platforms.cnki.search_url import build_search_url
+from src.platforms.cnki.page_state import PageState, CNKIBlockedError, classify_page
 
-__all__ = ["CNKIBrowser"]
+__all__ = ["CNKIBrowser", "build_search_url", "PageState", "CNKIBlockedError", "classify_page"]
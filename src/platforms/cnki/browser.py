@@ -4,15 +4,32 @@ CNKI论文下载器 - CNKI浏览器操作
 """
 
 import asyncio
+import dataclasses
+from contextlib import asynccontextmanager
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
+from urllib.parse import parse_qs, urljoin, urlparse
 
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Download
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Download, Route, ElementHandle
 
 from src.platforms.base import PlatformBase
-from src.core.models import Paper, DownloadResult, DownloadStatus, ErrorLog
-from src.utils import sanitize_filename, generate_unique_filename, setup_logging
+from src.core.config import BrowserSettings, CONFIG_DIR
+from src.core.models import Paper, DownloadRequest, DownloadResult, DownloadStatus, ErrorLog
+from src.platforms.cnki.search_url import build_search_url, build_detail_url, CNKI_SEARCH_RESULT_URL
+from src.platforms.cnki.download_links import extract_download_links, parse_content_disposition
+from src.platforms.cnki.selector_stats import SelectorStats
+from src.platforms.cnki.session_store import load_storage_state, save_storage_state
+from src.platforms.cnki.server_info import read_server_endpoint
+from src.platforms.cnki.results_cache import ResultsCache
+from src.platforms.cnki.page_state import (
+    PageState, CNKIBlockedError, PAGE_STATE_SCRIPT, classify_page, html_to_text
+)
+from src.utils import (
+    sanitize_filename, FilenameIndex, setup_logging, format_file_size, TokenBucket,
+    stream_download, part_path_for, part_path_for_url, cookie_jar_from, finalize_download, NotAFileError
+)
 
 
 class CNKIBrowser(PlatformBase):
@@ -39,7 +56,7 @@ class CNKIBrowser(PlatformBase):
 
     # 检索框选择器（多种策略）
     SEARCH_INPUT_SELECTORS = [
-        "input[class*='n-input__input']",  # 优先使用，选择第一个匹配的元素
+        "input[class*='n-input__input']",  # 优先使用
         "input[placeholder*='文献']",
         "input[type='text'].search-input",
         "input[class*='search']",
@@ -61,6 +78,110 @@ class CNKIBrowser(PlatformBase):
     PAPER_ITEM_SELECTOR_ALT = ("#layoutContainer > div.main-view > div > div.main-content-wrap >"
                                " div.main-content > div > div.main > div > div.result-main-list.box-shadow > "
                                "div.main-list__content > div.n-data-table.n-data-table--bottom-bordered.n-data-table--single-line.result-list.has-selection > div > div > div > div.n-scrollbar-container > div > table > tbody > tr")
+    # 直达结果页（kns）的列表选择器
+    PAPER_ITEM_SELECTOR_KNS = ".result-table-list tbody tr"
+
+    # "无结果"提示及加载中状态选择器
+    NO_RESULT_SELECTORS = [".no-result", ".n-data-table-empty", ".n-empty"]
+    LOADING_SELECTORS = [".n-data-table--loading", ".n-base-loading", ".n-spin"]
+
+    # 等待结果列表的最长时间（毫秒）；"无结果"提示需持续的时间（毫秒），避免把加载前的空表当作无结果
+    RESULT_WAIT_TIMEOUT = 30000
+    RESULT_EMPTY_SETTLE_TIME = 800
+
+    # 在页面内通过 MutationObserver 等待结果行或"无结果"提示出现
+    WAIT_FOR_RESULTS_SCRIPT = """
+        ({ rowSelectors, emptySelectors, loadingSelectors, timeout, settle }) => new Promise((resolve) => {
+            const queryAll = (selector) => {
+                try {
+                    return Array.from(document.querySelectorAll(selector));
+                } catch (e) {
+                    return [];
+                }
+            };
+            const isVisible = (el) => {
+                const rect = el.getBoundingClientRect();
+                return rect.width > 0 && rect.height > 0;
+            };
+            const firstVisible = (selectors) => {
+                for (const selector of selectors) {
+                    const el = queryAll(selector).find(isVisible);
+                    if (el) return el;
+                }
+                return null;
+            };
+
+            let done = false;
+            let settleTimer = null;
+            let observer = null;
+            let deadline = null;
+            const finish = (result) => {
+                if (done) return;
+                done = true;
+                if (observer) observer.disconnect();
+                clearTimeout(deadline);
+                clearTimeout(settleTimer);
+                resolve(result);
+            };
+
+            const check = () => {
+                for (const selector of rowSelectors) {
+                    const rows = queryAll(selector);
+                    if (rows.some(isVisible)) {
+                        finish({ state: 'results', selector, count: rows.length });
+                        return;
+                    }
+                }
+
+                const emptyEl = firstVisible(emptySelectors);
+                if (emptyEl && !firstVisible(loadingSelectors)) {
+                    if (!settleTimer) {
+                        settleTimer = setTimeout(() => finish({
+                            state: 'empty',
+                            message: (emptyEl.innerText || emptyEl.textContent || '').trim(),
+                        }), settle);
+                    }
+                } else if (settleTimer) {
+                    clearTimeout(settleTimer);
+                    settleTimer = null;
+                }
+            };
+
+            observer = new MutationObserver(check);
+            observer.observe(document.documentElement, {
+                childList: true, subtree: true, attributes: true, characterData: true,
+            });
+            deadline = setTimeout(() => finish({ state: 'timeout' }), timeout);
+            check();
+        })
+    """
+
+    # "下一页"按钮选择器：kns8s 结果页为 #PageNext，旧版结果页为带"下一页"文字的链接或按钮
+    NEXT_PAGE_SELECTOR = "#PageNext, a.pagesnums:has-text('下一页'), a:has-text('下一页'), a.next, button:has-text('下一页')"
+
+    # 当前结果列表的特征（首行文本 + 行数），用于判断翻页后列表是否已刷新
+    ROWS_SIGNATURE_SCRIPT = """
+        (rowSelectors) => {
+            for (const selector of rowSelectors) {
+                let rows = [];
+                try {
+                    rows = document.querySelectorAll(selector);
+                } catch (e) {
+                    continue;
+                }
+                if (rows.length) {
+                    return (rows[0].innerText || rows[0].textContent || '').trim().slice(0, 200) + '|' + rows.length;
+                }
+            }
+            return '';
+        }
+    """
+    # kns8s 结果页通过AJAX翻页，URL和文档都不变，需要等列表内容变化
+    ROWS_CHANGED_SCRIPT = (
+        "({ rowSelectors, previous }) => {"
+        " const signature = (" + ROWS_SIGNATURE_SCRIPT + ")(rowSelectors);"
+        " return signature !== '' && signature !== previous; }"
+    )
 
     # 下载按钮选择器（支持button和a标签）
     PDF_DOWNLOAD_SELECTOR = "button:has-text('PDF下载'), button .n-button__content:text-is('PDF下载'), a:has-text('PDF下载')"
@@ -69,12 +190,159 @@ class CNKIBrowser(PlatformBase):
     # 标题选择器列表
     TITLE_SELECTORS = ["a.title", ".name a", "a[href*='detail']", "td a", "a"]
 
+    # 宽泛的兜底选择器：会匹配到行内任意链接或输入框，按命中统计排序时固定在最后
+    FALLBACK_SELECTORS = frozenset(["td a", "a", "input[class*='search']"])
+
+    # 列表行字段选择器（按顺序尝试，取第一个非空文本）
+    AUTHOR_SELECTORS = [".author", "td:nth-child(2)", "[class*='author']"]
+    SOURCE_SELECTORS = [".source", "td:nth-child(3)", "[class*='source']"]
+    YEAR_SELECTORS = [".date", "td:nth-child(4)", "[class*='date'], [class*='year']"]
+    CITE_COUNT_SELECTORS = [".quote", "td:nth-child(6)", "[class*='quote'], [class*='cite']"]
+    DOWNLOAD_COUNT_SELECTORS = [".download", "td:nth-child(7)", "[class*='download']"]
+    # 列表行中的下载链接（取 href）
+    DOWNLOAD_LINK_SELECTORS = ["a.downloadlink", "a[href*='download']"]
+
+    # 一次性提取当前页所有论文行的脚本（单次往返，替代逐行逐字段查询）
+    EXTRACT_ROWS_SCRIPT = """
+        ({ rowSelectors, titleSelectors, fields }) => {
+            const textOf = (el) => (el.innerText || el.textContent || '').trim();
+            const query = (root, selector) => {
+                try {
+                    return root.querySelector(selector);
+                } catch (e) {
+                    return null;
+                }
+            };
+            const pick = (row, selectors, numeric, attr) => {
+                for (const selector of selectors) {
+                    const el = query(row, selector);
+                    if (!el) continue;
+                    if (attr) {
+                        const value = el.getAttribute(attr);
+                        if (value && !value.startsWith('javascript:')) return value;
+                        continue;
+                    }
+                    const text = textOf(el);
+                    if (!text) continue;
+                    if (numeric) {
+                        const digits = text.replace(/[,\\s]/g, '');
+                        if (/^\\d+$/.test(digits)) return parseInt(digits, 10);
+                        continue;
+                    }
+                    return text;
+                }
+                return null;
+            };
+            // 稳定的文献编号：收藏/导出按钮的 data-filename、复选框值（库名!文献编号!…）或链接中的 filename 参数
+            // （kcms2 详情页链接只有随会话变化的 v 参数）
+            const idOf = (row) => {
+                const tagged = query(row, '[data-filename]');
+                if (tagged && tagged.getAttribute('data-filename')) {
+                    return { filename: tagged.getAttribute('data-filename'), dbname: tagged.getAttribute('data-dbname') };
+                }
+                for (const box of row.querySelectorAll('input[type="checkbox"]')) {
+                    const match = /^([A-Za-z0-9_]+)!([A-Za-z0-9_.-]+)/.exec(box.value || '');
+                    if (match) return { filename: match[2], dbname: match[1] };
+                }
+                for (const link of row.querySelectorAll('a[href]')) {
+                    let params;
+                    try {
+                        params = new URL(link.getAttribute('href'), location.href).searchParams;
+                    } catch (e) {
+                        continue;
+                    }
+                    const lower = {};
+                    for (const [name, value] of params) lower[name.toLowerCase()] = value;
+                    if (lower.filename) return { filename: lower.filename, dbname: lower.dbname || null };
+                }
+                return { filename: null, dbname: null };
+            };
+
+            let rows = [];
+            let rowSelector = null;
+            for (const selector of rowSelectors) {
+                rows = Array.from(document.querySelectorAll(selector));
+                if (rows.length) {
+                    rowSelector = selector;
+                    break;
+                }
+            }
+
+            return {
+                rowSelector,
+                rows: rows.map((row) => {
+                    let titleEl = null;
+                    let titleSelector = null;
+                    for (const selector of titleSelectors) {
+                        titleEl = query(row, selector);
+                        if (titleEl) {
+                            titleSelector = selector;
+                            break;
+                        }
+                    }
+                    if (!titleEl) return null;
+
+                    const ids = idOf(row);
+                    const item = {
+                        title: textOf(titleEl),
+                        href: titleEl.getAttribute('href'),
+                        titleSelector,
+                        paperId: ids.filename,
+                        dbName: ids.dbname,
+                    };
+                    for (const [name, spec] of Object.entries(fields)) {
+                        item[name] = pick(row, spec.selectors, spec.numeric, spec.attr);
+                    }
+                    return item;
+                }),
+            };
+        }
+    """
+
+    # 选择器命中统计文件
+    SELECTOR_STATS_PATH = CONFIG_DIR / "selector_stats.json"
+    # 会话状态文件（Cookie 与 localStorage）
+    SESSION_STATE_PATH = CONFIG_DIR / "storage_state.json"
+    # 检索结果页缓存目录
+    RESULTS_CACHE_DIR = CONFIG_DIR / "results_cache"
+
+    # 注入到每个页面的初始化脚本，隐藏自动化特征
+    STEALTH_INIT_SCRIPT = """
+        // 覆盖navigator.webdriver属性
+        Object.defineProperty(navigator, 'webdriver', {
+            get: () => undefined,
+        });
+
+        // 覆盖chrome对象
+        window.chrome = {
+            runtime: {},
+        };
+
+        // 覆盖permissions
+        const originalQuery = window.navigator.permissions.query;
+        window.navigator.permissions.query = (parameters) => (
+            parameters.name === 'notifications' ?
+                Promise.resolve({ state: Notification.permission }) :
+                originalQuery(parameters)
+        );
+
+        // 覆盖plugins长度
+        Object.defineProperty(navigator, 'plugins', {
+            get: () => [1, 2, 3, 4, 5],
+        });
+
+        // 覆盖languages
+        Object.defineProperty(navigator, 'languages', {
+            get: () => ['zh-CN', 'zh', 'en'],
+        });
+    """
+
     def __init__(
             self,
             download_dir: Path,
             config=None,
             headless: bool = False,
-            slow_mo: int = 500,
+            slow_mo: int = 0,
             timeout: int = 30000,
             viewport_width: int = 1366,
             viewport_height: int = 768,
@@ -82,6 +350,8 @@ class CNKIBrowser(PlatformBase):
             timezone: str = "Asia/Shanghai",
             browser_args: list = None,
             user_agent: str = None,
+            max_pages: int = 1,
+            rate_limiter: TokenBucket = None,
             logger=None
     ):
         """
@@ -99,6 +369,8 @@ class CNKIBrowser(PlatformBase):
             timezone: 时区
             browser_args: 浏览器启动参数
             user_agent: 用户代理字符串
+            max_pages: 下载标签页池大小（每个并发下载独占一个标签页）
+            rate_limiter: 共享的请求限速器（为None时根据配置创建）
             logger: 日志对象
         """
         self.config = config
@@ -132,106 +404,337 @@ class CNKIBrowser(PlatformBase):
             )
         self.logger = logger or setup_logging(download_dir / "logs")
 
+        # 网络资源拦截策略
+        resource_settings = config.browser if config and hasattr(config, 'browser') else BrowserSettings()
+        self.block_resources = resource_settings.block_resources
+        # URL匹配不区分大小写：模式和URL都转为小写
+        self.blocked_resource_types = {resource_type.lower() for resource_type in resource_settings.blocked_resource_types}
+        self.blocked_url_patterns = [pattern.lower() for pattern in resource_settings.blocked_url_patterns]
+        self.allowed_url_patterns = [pattern.lower() for pattern in resource_settings.allowed_url_patterns]
+
+        # 是否优先通过HTTP请求直接下载；流式写入的分块大小
+        self.direct_download = resource_settings.direct_download
+        self.chunk_size = config.download.chunk_size if config and hasattr(config, 'download') else 65536
+
+        # 所有对CNKI的导航和请求共享同一个令牌桶
+        if rate_limiter is None and config and hasattr(config, 'download'):
+            rate_limiter = TokenBucket(config.download.rate_limit_rps, config.download.rate_limit_burst)
+        self.rate_limiter = rate_limiter
+
+        # 选择器命中统计：最近命中的选择器优先尝试
+        self.selector_stats = (
+            SelectorStats(self.SELECTOR_STATS_PATH, logger=self.logger)
+            if resource_settings.learn_selector_order else None
+        )
+
+        # 跨运行复用CNKI会话
+        self.persist_session = resource_settings.persist_session
+        self.session_max_age = resource_settings.session_max_age
+        self.session_restored = False
+
+        # 检索结果页缓存：短时间内重复检索时直接使用缓存的论文列表
+        self.results_cache = (
+            ResultsCache(
+                self.RESULTS_CACHE_DIR,
+                ttl=resource_settings.results_cache_ttl,
+                max_bytes=resource_settings.results_cache_max_mb * 1024 * 1024,
+                logger=self.logger
+            )
+            if resource_settings.results_cache_ttl > 0 else None
+        )
+        # 来自缓存的论文：{id(论文): (论文, 下载请求, 页码)}，详情页打不开时删除对应的缓存页
+        self._cached_sources: Dict[int, Tuple[Paper, DownloadRequest, int]] = {}
+
+        # 共享浏览器：优先连接已运行的浏览器，连接失败时在本地启动
+        self.remote_endpoint = resource_settings.remote_endpoint
+        self.use_shared_server = resource_settings.use_shared_server
+        self.remote_connect_timeout = resource_settings.remote_connect_timeout
+        self.remote = False
+
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
 
+        # 下载标签页池：检索/列表页使用 self.page，每个下载任务租用独立的标签页
+        self.max_pages = max(1, max_pages)
+        self._page_pool: Optional[asyncio.Queue] = None
+        self._pool_pages: List[Page] = []
+        self._pool_size = 0
+
+        # 下载目录的文件名索引（首次保存文件时获取，持有引用期间保留已分配的文件名）
+        self._filename_index: Optional[FilenameIndex] = None
+
     async def start(self) -> None:
         """启动浏览器"""
         try:
             self.logger.info("正在启动浏览器（使用反检测配置）...")
             self.playwright = await async_playwright().start()
+            self.browser = await self._connect_remote() or await self._launch_local()
 
-            # 使用反检测参数启动浏览器
-            launch_options = {
-                "headless": self.headless,
-                "slow_mo": self.slow_mo,
-            }
-
-            # 添加浏览器启动参数
-            if self.browser_args:
-                launch_options["args"] = self.browser_args
-
-            self.logger.debug(f"浏览器启动参数: {launch_options}")
-            self.browser = await self.playwright.chromium.launch(**launch_options)
-
-            # 创建浏览器上下文，使用更真实的配置
-            self.context = await self.browser.new_context(
-                accept_downloads=True,
-                viewport={'width': self.viewport_width, 'height': self.viewport_height},
-                locale=self.locale,
-                timezone_id=self.timezone,
-                user_agent=self.user_agent,
-                # 添加额外的权限和特性
-                permissions=["geolocation", "notifications"],
-                color_scheme="light",  # 使用浅色模式
-                # 添加更多真实用户的HTTP头
-                extra_http_headers={
-                    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-                    "Accept-Encoding": "gzip, deflate, br",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                    "Connection": "keep-alive",
-                    "Upgrade-Insecure-Requests": "1",
-                }
-            )
+            # 加载上次保存的会话（本地快速校验，无效时建立新会话）
+            storage_state = None
+            if self.persist_session:
+                storage_state = load_storage_state(self.SESSION_STATE_PATH, self.session_max_age, self.logger)
+            self.session_restored = storage_state is not None
 
-            # 创建新页面
-            self.page = await self.context.new_page()
-
-            # 在页面中添加一些初始化脚本，进一步隐藏自动化特征
-            await self.page.add_init_script("""
-                // 覆盖navigator.webdriver属性
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined,
-                });
-
-                // 覆盖chrome对象
-                window.chrome = {
-                    runtime: {},
-                };
-
-                // 覆盖permissions
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({ state: Notification.permission }) :
-                        originalQuery(parameters)
-                );
-
-                // 覆盖plugins长度
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [1, 2, 3, 4, 5],
-                });
-
-                // 覆盖languages
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['zh-CN', 'zh', 'en'],
-                });
-            """)
+            await self._new_context(storage_state)
 
+            if self.session_restored:
+                self.logger.info("✓ 已恢复上次的CNKI会话")
             self.logger.info("✓ 浏览器启动成功（已应用反检测配置）")
 
         except Exception as e:
             self.logger.error(f"❌ 启动浏览器失败: {e}")
             raise
 
+    async def _new_context(self, storage_state: Optional[dict] = None) -> None:
+        """
+        创建浏览器上下文、主页面和空的下载标签页池
+
+        Args:
+            storage_state: 要载入的会话状态（Cookie 与 localStorage）
+        """
+        # 创建浏览器上下文，使用更真实的配置
+        self.context = await self.browser.new_context(
+            storage_state=storage_state,
+            accept_downloads=True,
+            viewport={'width': self.viewport_width, 'height': self.viewport_height},
+            locale=self.locale,
+            timezone_id=self.timezone,
+            user_agent=self.user_agent,
+            # 添加额外的权限和特性
+            permissions=["geolocation", "notifications"],
+            color_scheme="light",  # 使用浅色模式
+            # 添加更多真实用户的HTTP头
+            extra_http_headers={
+                "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+                "Accept-Encoding": "gzip, deflate, br",
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+                "Connection": "keep-alive",
+                "Upgrade-Insecure-Requests": "1",
+            }
+        )
+
+        # 在上下文中添加初始化脚本，对所有页面（包括下载标签页）生效
+        await self.context.add_init_script(self.STEALTH_INIT_SCRIPT)
+
+        # 拦截图片、字体、统计脚本等不需要的资源
+        if self.block_resources:
+            await self.context.route("**/*", self._route_request)
+            self.logger.debug(
+                f"已启用资源拦截: 类型={sorted(self.blocked_resource_types)}, "
+                f"URL模式={len(self.blocked_url_patterns)}个, 放行模式={len(self.allowed_url_patterns)}个"
+            )
+
+        # 创建新页面
+        self.page = await self.context.new_page()
+        self._page_pool = asyncio.Queue()
+        self._pool_pages = []
+        self._pool_size = 0
+
+    async def reset(self) -> None:
+        """
+        重置浏览器上下文（浏览器池再次租出前调用）
+
+        关闭上一个任务留下的主页面、下载标签页、额外打开的标签页和路由，
+        在同一个浏览器中新建上下文并载入当前会话，保留已预热的Cookie。
+        """
+        storage_state = None
+        try:
+            storage_state = await self.context.storage_state()
+        except Exception as e:
+            self.logger.debug(f"读取会话状态失败，新上下文不载入会话: {e}")
+
+        try:
+            await self.context.close()
+        except Exception as e:
+            self.logger.debug(f"关闭旧的浏览器上下文失败: {e}")
+
+        await self._new_context(storage_state)
+        self.session_restored = storage_state is not None
+        self._filename_index = None
+
+    async def _connect_remote(self) -> Optional[Browser]:
+        """
+        连接共享浏览器（配置的 remote_endpoint，或开启 use_shared_server 时本机运行中的共享浏览器）
+
+        ws:// 地址按Playwright浏览器服务连接，其他地址（http://、CDP的ws地址）按CDP连接。
+        连接后只在共享浏览器中新建自己的上下文，关闭时断开连接，不会关闭共享浏览器。
+
+        Returns:
+            已连接的浏览器；没有可用的共享浏览器或连接失败时返回None
+        """
+        endpoint = self.remote_endpoint
+        if not endpoint and self.use_shared_server:
+            endpoint = await asyncio.to_thread(read_server_endpoint)
+        if not endpoint:
+            return None
+
+        try:
+            if endpoint.startswith(("ws://", "wss://")) and "/devtools/" not in endpoint:
+                browser = await self.playwright.chromium.connect(
+                    endpoint, timeout=self.remote_connect_timeout, slow_mo=self.slow_mo
+                )
+            else:
+                browser = await self.playwright.chromium.connect_over_cdp(
+                    endpoint, timeout=self.remote_connect_timeout, slow_mo=self.slow_mo
+                )
+        except Exception as e:
+            self.logger.warning(f"⚠️ 连接共享浏览器失败，改为本地启动: {e}")
+            return None
+
+        self.remote = True
+        self.logger.info(f"✓ 已连接共享浏览器: {endpoint}")
+        return browser
+
+    async def _launch_local(self) -> Browser:
+        """在本地启动浏览器"""
+        # 使用反检测参数启动浏览器
+        launch_options = {
+            "headless": self.headless,
+            "slow_mo": self.slow_mo,
+        }
+
+        # 添加浏览器启动参数
+        if self.browser_args:
+            launch_options["args"] = self.browser_args
+
+        self.logger.debug(f"浏览器启动参数: {launch_options}")
+        self.remote = False
+        return await self.playwright.chromium.launch(**launch_options)
+
     async def close(self) -> None:
         """关闭浏览器"""
         try:
+            for page in self._pool_pages:
+                if not page.is_closed():
+                    await page.close()
+            self._pool_pages = []
+            self._pool_size = 0
+            await self.save_session()
             if self.page:
                 await self.page.close()
             if self.context:
                 await self.context.close()
             if self.browser:
+                # 共享浏览器只断开连接
                 await self.browser.close()
             if self.playwright:
                 await self.playwright.stop()
+            if self.selector_stats:
+                self.selector_stats.save()
 
             self.logger.info("✓ 浏览器已关闭")
         except Exception as e:
             self.logger.error(f"❌ 关闭浏览器时出错: {e}")
 
+    async def save_session(self) -> None:
+        """保存当前会话状态（Cookie 与 localStorage），下次启动时复用"""
+        if not self.persist_session or not self.context:
+            return
+        try:
+            save_storage_state(await self.context.storage_state(), self.SESSION_STATE_PATH)
+            self.logger.debug(f"已保存会话状态: {self.SESSION_STATE_PATH}")
+        except Exception as e:
+            self.logger.debug(f"保存会话状态失败: {e}")
+
+    async def _throttle(self) -> None:
+        """每次对CNKI发起导航或请求前获取令牌"""
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+
+    async def _classify_page(self, page: Page) -> PageState:
+        """识别当前页面是否为限流、验证、登录或付费页面"""
+        try:
+            info = await page.evaluate(PAGE_STATE_SCRIPT)
+        except Exception as e:
+            self.logger.debug(f"页面状态识别失败: {e}")
+            return PageState.NORMAL
+
+        state = classify_page(info.get("text", ""), info.get("url", ""), info.get("title", ""))
+        if state != PageState.NORMAL:
+            self.logger.debug(f"页面状态: {state.value} ({info.get('url', '')})")
+        return state
+
+    def _is_allowed(self, url: str) -> bool:
+        """URL是否匹配放行规则（不区分大小写）"""
+        url = url.lower()
+        return any(fnmatchcase(url, pattern) for pattern in self.allowed_url_patterns)
+
+    def _should_block(self, resource_type: str, url: str, frame_url: str = "") -> bool:
+        """
+        判断请求是否应被拦截（放行规则优先）
+
+        发起请求的页面本身匹配放行规则时（如验证页），该页面的所有资源（包括滑块验证的图片）都放行。
+        """
+        if self._is_allowed(url) or (frame_url and self._is_allowed(frame_url)):
+            return False
+        if resource_type.lower() in self.blocked_resource_types:
+            return True
+        url = url.lower()
+        return any(fnmatchcase(url, pattern) for pattern in self.blocked_url_patterns)
+
+    async def _route_request(self, route: Route) -> None:
+        """上下文级请求拦截处理"""
+        request = route.request
+        try:
+            frame_url = request.frame.url
+        except Exception:
+            # Service Worker 发起的请求没有所属页面
+            frame_url = ""
+        if self._should_block(request.resource_type, request.url, frame_url):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @asynccontextmanager
+    async def lease_page(self) -> AsyncIterator[Page]:
+        """
+        从标签页池租用一个下载标签页，使用完毕后自动归还
+
+        池中标签页按需创建，总数不超过 max_pages；池满时等待其他任务归还。
+
+        Yields:
+            Page对象
+        """
+        page = await self._acquire_page()
+        try:
+            yield page
+        finally:
+            self._release_page(page)
+
+    async def _acquire_page(self) -> Page:
+        """获取一个空闲标签页（池未满时新建）"""
+        if self._page_pool.empty() and self._pool_size < self.max_pages:
+            # 先占位再创建，避免并发任务同时创建导致超出池大小
+            self._pool_size += 1
+            try:
+                page = await self.context.new_page()
+            except Exception:
+                self._pool_size -= 1
+                raise
+            self._pool_pages.append(page)
+            self.logger.debug(f"新建下载标签页 ({self._pool_size}/{self.max_pages})")
+            return page
+
+        page = await self._page_pool.get()
+        if page.is_closed():
+            # 标签页已被关闭（崩溃或被页面脚本关闭），原位替换
+            self._pool_pages.remove(page)
+            try:
+                page = await self.context.new_page()
+            except Exception:
+                self._pool_size -= 1
+                raise
+            self._pool_pages.append(page)
+            self.logger.debug("下载标签页已关闭，已重新创建")
+        return page
+
+    def _release_page(self, page: Page) -> None:
+        """归还标签页到池中"""
+        self._page_pool.put_nowait(page)
+
     async def _wait_for_page_load(self, timeout: int = None):
         """等待页面加载完成（公共方法）"""
         if timeout is None:
@@ -243,79 +746,77 @@ class CNKIBrowser(PlatformBase):
 
     async def _check_and_switch_to_new_page(
             self,
-            old_url: str,
-            initial_pages: dict,
-            initial_page_count: int,
+            action: Callable[[], Awaitable[None]],
             url_keywords: List[str] = None,
-            wait_time: int = None,
+            wait_time: float = None,
             action_description: str = "操作"
     ) -> Optional[Page]:
         """
-        检查并切换到新打开的页面（公共方法）
+        执行操作并切换到其打开的页面（公共方法）
+
+        在执行操作前同时监听"当前页面打开新标签页"和"当前页面URL改变"两个事件，
+        任一事件发生即完成切换，不再固定等待。
+        只接受当前页面打开的标签页（popup），下载任务同时在上下文中新建的标签页不会被误认为目标页面。
 
         Args:
-            old_url: 操作前的页面URL
-            initial_pages: 操作前所有页面的URL字典 {url: page}
-            initial_page_count: 操作前的页面数量
-            url_keywords: 用于查找目标页面的URL关键词列表（如["search", "result"]）
-            wait_time: 等待新页面打开的时间（秒），如果为None则使用配置
+            action: 触发跳转的操作（如点击链接、按回车）
+            url_keywords: 事件均未发生时，用于在已有页面中查找目标页面的URL关键词列表（如["search", "result"]）
+            wait_time: 等待事件的最长时间（秒），如果为None则使用配置
             action_description: 操作描述（用于日志）
 
         Returns:
             找到的目标页面，如果没有找到则返回None
         """
-        # 等待页面响应（可能是跳转或打开新标签页）
         if wait_time is None:
             wait_time = self.config.browser.page_switch_wait_time if self.config and hasattr(self.config, 'browser') else 2
-        await asyncio.sleep(wait_time)
 
-        # 检查所有页面，找到新打开的页面或URL改变的页面
+        old_page = self.page
+        old_url = old_page.url
+        timeout_ms = wait_time * 1000
+
+        # 在操作之前开始监听，避免错过事件（监听当前页面的 popup，而不是上下文的所有新页面）
+        new_page_task = asyncio.create_task(
+            old_page.wait_for_event("popup", timeout=timeout_ms)
+        )
+        navigation_task = asyncio.create_task(
+            old_page.wait_for_url(lambda url: url != old_url, wait_until="commit", timeout=timeout_ms)
+        )
+        pending = {new_page_task, navigation_task}
+
         target_page = None
-        current_pages = list(self.context.pages)
-        current_page_count = len(current_pages)
-
-        # 策略1: 检查是否有新页面打开
-        if current_page_count > initial_page_count:
-            # 有新页面打开，检查所有新页面
-            for page in current_pages:
-                if page.url not in initial_pages:
-                    # 这是一个新页面
-                    target_page = page
-                    self.logger.info(f"✓ 检测到新标签页: {page.url}")
+        try:
+            await action()
+
+            # 两个事件竞争，共用同一个截止时间
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + wait_time
+            while pending and not target_page:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
                     break
-
-            # 如果没有找到新页面，使用最后一个页面
-            if not target_page and current_pages:
-                last_page = current_pages[-1]
-                if last_page.url != old_url:
-                    target_page = last_page
-                    self.logger.info(f"✓ 使用最后一个页面: {last_page.url}")
-
-        # 策略2: 检查当前页面URL是否改变
-        if not target_page:
-            new_url = self.page.url
-            if new_url != old_url:
-                target_page = self.page
-                self.logger.info(f"✓ 当前页面已跳转: {old_url} -> {new_url}")
-
-        # 策略3: 如果提供了URL关键词，检查所有页面找到包含关键词的页面
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                # 新标签页优先于当前页面跳转
+                if new_page_task in done and not new_page_task.exception():
+                    target_page = new_page_task.result()
+                    self.logger.info(f"✓ {action_description}后检测到新标签页: {target_page.url}")
+                elif navigation_task in done and not navigation_task.exception():
+                    target_page = old_page
+                    self.logger.info(f"✓ {action_description}后当前页面已跳转: {old_url} -> {old_page.url}")
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(new_page_task, navigation_task, return_exceptions=True)
+
+        # 事件均未发生：按URL关键词在已有页面中查找
         if not target_page and url_keywords:
-            for page in current_pages:
+            for page in self.context.pages:
+                if page in self._pool_pages:
+                    # 下载任务的标签页
+                    continue
                 page_url = page.url.lower()
-                for keyword in url_keywords:
-                    if keyword in page_url and page.url != old_url:
-                        target_page = page
-                        self.logger.info(f"✓ 找到包含'{keyword}'的页面: {page.url}")
-                        break
-                if target_page:
-                    break
-
-        # 策略4: 检查所有页面，找到URL不同的页面
-        if not target_page:
-            for page in current_pages:
-                if page.url != old_url and page.url != self.page.url:
+                if page.url != old_url and any(keyword in page_url for keyword in url_keywords):
                     target_page = page
-                    self.logger.info(f"✓ 找到URL不同的页面: {page.url}")
+                    self.logger.info(f"✓ 找到包含关键词的页面: {page.url}")
                     break
 
         # 切换到目标页面并等待加载
@@ -323,25 +824,71 @@ class CNKIBrowser(PlatformBase):
             self.page = target_page
             self.logger.info(f"✓ 已切换到目标页面: {self.page.url}")
         elif not target_page:
-            self.logger.warning(f"未找到目标页面，使用当前页面")
-        
-        # 统一等待页面加载
-        await self._wait_for_page_load()
+            self.logger.warning(f"{action_description}后未检测到页面跳转，使用当前页面")
 
-        # 延迟检测：再次检查所有页面
-        if not target_page:
-            await asyncio.sleep(1)
-            for page in self.context.pages:
-                page_url = page.url.lower()
-                if url_keywords and any(k in page_url for k in url_keywords) or not url_keywords:
-                    if page.url != self.page.url:
-                        self.page = page
-                        self.logger.info(f"✓ 延迟检测到目标页面: {self.page.url}")
-                        await self._wait_for_page_load()
-                        return self.page
+        await self._wait_for_page_load()
 
         return target_page
 
+    async def open_results(self, request: DownloadRequest) -> Page:
+        """
+        打开检索结果页
+
+        优先通过直达URL一次导航打开结果页；文献类型不支持直达、已关闭直达或直达失败时，
+        回退到 首页 → 选择文献类型 → 检索 的点击流程。
+
+        Args:
+            request: 下载请求对象
+
+        Returns:
+            Page对象（结果页）
+        """
+        direct_search = self.config.browser.direct_search_url if self.config and hasattr(self.config, 'browser') else True
+        if direct_search and await self.open_search_url(request):
+            await self.save_session()
+            return self.page
+
+        await self.goto_homepage()
+        await self.select_document_type(request.doc_type)
+        page = await self.search(request.keyword)
+        await self.save_session()
+        return page
+
+    async def open_search_url(self, request: DownloadRequest) -> bool:
+        """
+        通过直达URL打开检索结果页
+
+        Args:
+            request: 下载请求对象
+
+        Returns:
+            是否成功打开结果页（出现结果列表或"无结果"提示）
+        """
+        url = build_search_url(request)
+        if not url:
+            self.logger.info(f"文献类型'{request.doc_type}'不支持直达结果页，使用点击流程")
+            return False
+
+        try:
+            self.logger.info(f"正在直达检索结果页: {url}")
+            await self._throttle()
+            await self.page.goto(url, timeout=self.timeout, wait_until="domcontentloaded")
+
+            page_load_timeout = self.config.browser.page_load_timeout if self.config and hasattr(self.config, 'browser') else 15000
+            result = await self._wait_for_results(timeout=page_load_timeout)
+            if result["state"] == "timeout":
+                self.logger.warning("直达结果页未出现结果列表，回退到点击流程")
+                return False
+
+            if result["state"] == "empty":
+                self.logger.warning(f"检索无结果: {result.get('message') or request.keyword}")
+            self.logger.info("✓ 已直达检索结果页")
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"直达结果页失败，回退到点击流程: {e}")
+            return False
+
     async def goto_homepage(self) -> Page:
         """
         导航到CNKI首页
@@ -352,14 +899,17 @@ class CNKIBrowser(PlatformBase):
         try:
             self.logger.info(f"正在访问CNKI首页: {self.CNKI_HOME}")
 
+            # 已恢复会话时无需等待首页的会话协商请求全部结束
+            await self._throttle()
             await self.page.goto(
                 self.CNKI_HOME,
                 timeout=self.timeout,
-                wait_until="networkidle"
+                wait_until="domcontentloaded" if self.session_restored else "networkidle"
             )
 
             # 等待页面加载完成
-            await self.page.wait_for_load_state("networkidle")
+            if not self.session_restored:
+                await self.page.wait_for_load_state("networkidle")
 
             self.logger.info("✓ 已访问CNKI首页")
 
@@ -390,15 +940,18 @@ class CNKIBrowser(PlatformBase):
 
             # 等待页面完全加载
             await self.page.wait_for_load_state("domcontentloaded")
-            content_load_wait = self.config.browser.content_load_wait_time if self.config and hasattr(self.config, 'browser') else 2
-            await asyncio.sleep(content_load_wait)  # 额外等待，确保动态内容加载
 
-            # 等待页面稳定
-            network_idle_timeout = self.config.browser.network_idle_timeout if self.config and hasattr(self.config, 'browser') else 10000
-            try:
-                await self.page.wait_for_load_state("networkidle", timeout=network_idle_timeout)
-            except:
-                pass  # 忽略超时，继续执行
+            # 新会话需要等待首页完成初始化；已恢复会话时跳过预热等待，直接查找元素
+            if not self.session_restored:
+                content_load_wait = self.config.browser.content_load_wait_time if self.config and hasattr(self.config, 'browser') else 2
+                await asyncio.sleep(content_load_wait)  # 额外等待，确保动态内容加载
+
+                # 等待页面稳定
+                network_idle_timeout = self.config.browser.network_idle_timeout if self.config and hasattr(self.config, 'browser') else 10000
+                try:
+                    await self.page.wait_for_load_state("networkidle", timeout=network_idle_timeout)
+                except:
+                    pass  # 忽略超时，继续执行
 
             # 尝试多种选择器策略
             element = None
@@ -411,26 +964,20 @@ class CNKIBrowser(PlatformBase):
                 f"a >> text='{doc_type}'",  # Playwright文本选择器
             ]
 
+            # 所有选择器并行等待，命中后按列表顺序取优先级最高的
             selector_timeout = self.config.browser.selector_timeout if self.config and hasattr(self.config, 'browser') else 8000
-            for sel in selectors_to_try:
+            element, sel = await self._race_selectors(selectors_to_try, selector_timeout, page_type="doc_type")
+            if element:
+                # 验证元素是否真的包含目标文本
                 try:
-                    self.logger.debug(f"尝试选择器: {sel}")
-                    element = await self.page.wait_for_selector(
-                        sel,
-                        timeout=selector_timeout,  # 每个选择器尝试时间
-                        state="visible"  # 确保元素可见
-                    )
-                    if element:
-                        # 验证元素是否真的包含目标文本
-                        element_text = await element.inner_text()
-                        if doc_type in element_text or element_text.strip() == doc_type:
-                            self.logger.info(f"✓ 找到元素，使用选择器: {sel}, 文本: '{element_text}'")
-                            break
-                        else:
-                            element = None  # 文本不匹配，继续尝试
+                    element_text = await element.inner_text()
                 except Exception as e:
-                    self.logger.debug(f"选择器 {sel} 失败: {e}")
-                    continue
+                    self.logger.debug(f"读取元素文本失败: {e}")
+                    element_text = ""
+                if doc_type in element_text or element_text.strip() == doc_type:
+                    self.logger.info(f"✓ 找到元素，使用选择器: {sel}, 文本: '{element_text}'")
+                else:
+                    element = None  # 文本不匹配，走后续的滚动和JavaScript查找
 
             if not element:
                 # 如果所有选择器都失败，尝试滚动页面并再次查找
@@ -555,24 +1102,12 @@ class CNKIBrowser(PlatformBase):
             await asyncio.sleep(0.5)
 
             # 点击链接（可能会打开新标签页，也可能在当前页面跳转）
-            old_url = self.page.url
-            self.logger.debug(f"点击前页面URL: {old_url}")
-
-            # 记录当前所有页面的URL
-            initial_pages = {page.url: page for page in self.context.pages}
-            initial_page_count = len(self.context.pages)
-
-            # 先点击链接
-            await element.click()
-            self.logger.info(f"✓ 已点击'{doc_type}'链接")
+            self.logger.debug(f"点击前页面URL: {self.page.url}")
 
-            # 使用公共方法检查并切换到新页面
+            await self._throttle()
             await self._check_and_switch_to_new_page(
-                old_url=old_url,
-                initial_pages=initial_pages,
-                initial_page_count=initial_page_count,
+                action=element.click,
                 url_keywords=["search"],  # 查找包含"search"的页面
-                wait_time=2,
                 action_description=f"点击'{doc_type}'链接"
             )
 
@@ -604,97 +1139,39 @@ class CNKIBrowser(PlatformBase):
                 raise Exception("无法定位搜索框")
 
             # 清空并输入关键词
-            # 记录搜索前的状态（在按回车之前）
-            old_url = self.page.url
-            self.logger.debug(f"搜索前页面URL: {old_url}")
-            initial_pages = {page.url: page for page in self.context.pages}
-            initial_page_count = len(self.context.pages)
+            self.logger.debug(f"搜索前页面URL: {self.page.url}")
 
             await search_input.fill("")
             await search_input.fill(keyword)
-            await search_input.press("Enter")  # 按回车也可以触发检索
             self.logger.info(f"✓ 已输入关键词: {keyword}")
 
-            # 在按回车后使用公共方法检测新页面（按回车后可能会打开新标签页）
+            # 按回车触发检索（可能会打开新标签页，也可能在当前页面跳转）
+            await self._throttle()
             await self._check_and_switch_to_new_page(
-                old_url=old_url,
-                initial_pages=initial_pages,
-                initial_page_count=initial_page_count,
+                action=lambda: search_input.press("Enter"),
                 url_keywords=["search", "result"],  # 查找包含"search"或"result"的页面
-                wait_time=2,
                 action_description="执行搜索"
             )
 
-            # 等待结果页加载
+            # 等待结果列表出现或"无结果"提示（DOM变化驱动，出现即返回）
             self.logger.info("等待搜索结果页面加载...")
-            await self._wait_for_page_load()
-            await asyncio.sleep(1)  # 额外等待1秒，确保动态内容开始加载
+            result = await self._wait_for_results()
 
-            # 等待结果列表出现（使用多种策略）
-            result_found = False
-            selectors_to_try = [
-                (self.PAPER_ITEM_SELECTOR, "主选择器"),
-                (self.PAPER_ITEM_SELECTOR_ALT, "备用选择器"),
-            ]
+            if result["state"] == "empty":
+                self.logger.warning(f"检索无结果: {result.get('message') or keyword}")
+                return self.page
 
-            # 使用轮询方式等待结果出现（最多等待30秒）
-            max_wait_time = 30
-            check_interval = 1
-            elapsed_time = 0
+            result_found = result["state"] == "results"
 
-            while elapsed_time < max_wait_time and not result_found:
-                for selector, selector_name in selectors_to_try:
-                    try:
-                        # 使用 JavaScript 检查元素是否存在且可见
-                        # 使用 JavaScript 检查元素是否存在且可见
-                        js_check = await self.page.evaluate(f"""
-                            (function() {{
-                                const elements = document.querySelectorAll('{selector}');
-                                if (elements.length > 0) {{
-                                    // 检查至少有一个元素可见
-                                    for (let elem of elements) {{
-                                        const rect = elem.getBoundingClientRect();
-                                        if (rect.width > 0 && rect.height > 0) {{
-                                            return {{ found: true, count: elements.length }};
-                                        }}
-                                    }}
-                                }}
-                                return {{ found: false, count: 0 }};
-                            }})();
-                        """)
-
-                        if js_check and js_check.get('found') and js_check.get('count', 0) > 0:
-                            self.logger.info(f"✓ 使用{selector_name}找到 {js_check.get('count')} 个结果项")
-                            result_found = True
-                            break
-                    except Exception as e:
-                        self.logger.debug(f"{selector_name}检查失败: {e}")
-                        continue
-
-                if not result_found:
-                    await asyncio.sleep(check_interval)
-                    elapsed_time += check_interval
-                    if elapsed_time % 5 == 0:  # 每5秒输出一次日志
-                        self.logger.debug(f"等待搜索结果... ({elapsed_time}/{max_wait_time}秒)")
-
-            # 如果还没找到，尝试滚动页面并再次查找
+            # 如果还没找到，尝试滚动页面并再次等待
             if not result_found:
                 self.logger.info("未找到结果列表，尝试滚动页面...")
                 try:
                     # 滚动到页面中间
                     await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2)")
-                    await asyncio.sleep(2)  # 等待内容加载
-
-                    # 再次尝试主选择器
-                    for selector, selector_name in selectors_to_try[:2]:  # 只尝试前两个
-                        try:
-                            items = await self.page.query_selector_all(selector)
-                            if items and len(items) > 0:
-                                self.logger.info(f"✓ 滚动后使用{selector_name}找到 {len(items)} 个结果项")
-                                result_found = True
-                                break
-                        except:
-                            continue
+                    scroll_wait = self.config.browser.scroll_wait_time if self.config and hasattr(self.config, 'browser') else 1
+                    result = await self._wait_for_results(timeout=scroll_wait * 1000)
+                    result_found = result["state"] == "results"
                 except Exception as e:
                     self.logger.debug(f"滚动操作失败: {e}")
 
@@ -717,7 +1194,7 @@ class CNKIBrowser(PlatformBase):
 
                 # 检查是否有错误提示
                 try:
-                    error_elements = await self.page.query_selector_all(".error, .no-result, .empty")
+                    error_elements = await self.page.query_selector_all(", ".join([".error", ".empty"] + self.NO_RESULT_SELECTORS))
                     if error_elements:
                         for elem in error_elements:
                             text = await elem.inner_text()
@@ -737,52 +1214,221 @@ class CNKIBrowser(PlatformBase):
             self.logger.error(f"❌ 执行检索失败: {e}")
             raise
 
-    async def get_paper_list(self, count: int) -> List[Paper]:
+    def _ordered_selectors(self, page_type: str, selectors: Sequence[str]) -> List[str]:
+        """按历史命中情况排列候选选择器（未启用统计时保持原顺序）"""
+        if not self.selector_stats:
+            return list(selectors)
+        return self.selector_stats.order(page_type, selectors, fallbacks=self.FALLBACK_SELECTORS)
+
+    def _record_selector(
+            self,
+            page_type: str,
+            selectors: Sequence[str],
+            winner: Optional[str],
+            latency_ms: Optional[float] = None
+    ) -> None:
+        """记录一次选择器查找结果"""
+        if self.selector_stats:
+            self.selector_stats.record(page_type, selectors, winner, latency_ms)
+
+    def _paper_item_selectors(self) -> List[str]:
+        """论文列表项选择器（按优先级，最近命中的在前）"""
+        return self._ordered_selectors(
+            "paper_item",
+            [self.PAPER_ITEM_SELECTOR, self.PAPER_ITEM_SELECTOR_ALT, self.PAPER_ITEM_SELECTOR_KNS]
+        )
+
+    def _paper_item_selector_name(self, selector: Optional[str]) -> str:
+        """列表项选择器的日志名称"""
+        if selector == self.PAPER_ITEM_SELECTOR:
+            return "主选择器"
+        if selector == self.PAPER_ITEM_SELECTOR_KNS:
+            return "结果页选择器"
+        return "备用选择器"
+
+    async def _wait_for_results(self, timeout: int = None) -> dict:
+        """
+        等待结果列表出现或"无结果"提示（公共方法）
+
+        在页面内使用 MutationObserver 监听DOM变化，主/备用列表选择器任一出现可见行即返回；
+        出现"无结果"提示且持续 RESULT_EMPTY_SETTLE_TIME 毫秒无加载状态时判定为空结果。
+
+        Args:
+            timeout: 最长等待时间（毫秒），默认 RESULT_WAIT_TIMEOUT
+
+        Returns:
+            {"state": "results" | "empty" | "timeout", "selector": ..., "count": ..., "message": ...}
+        """
+        if timeout is None:
+            timeout = self.RESULT_WAIT_TIMEOUT
+
+        row_selectors = self._paper_item_selectors()
+        started = asyncio.get_running_loop().time()
+        args = {
+            "rowSelectors": row_selectors,
+            "emptySelectors": self.NO_RESULT_SELECTORS,
+            "loadingSelectors": self.LOADING_SELECTORS,
+            "timeout": timeout,
+            "settle": self.RESULT_EMPTY_SETTLE_TIME,
+        }
+
+        # 等待期间页面可能再次跳转导致执行上下文销毁，此时等待新文档后重试一次
+        for attempt in range(2):
+            try:
+                result = await self.page.evaluate(self.WAIT_FOR_RESULTS_SCRIPT, args)
+                break
+            except Exception as e:
+                self.logger.debug(f"等待结果列表时页面发生变化: {e}")
+                if attempt:
+                    return {"state": "timeout"}
+                await self.page.wait_for_load_state("domcontentloaded")
+
+        if result["state"] == "results":
+            self._record_selector(
+                "paper_item", row_selectors, result["selector"],
+                (asyncio.get_running_loop().time() - started) * 1000
+            )
+            selector_name = self._paper_item_selector_name(result["selector"])
+            self.logger.info(f"✓ 使用{selector_name}找到 {result['count']} 个结果项")
+        elif result["state"] == "timeout":
+            self.logger.debug(f"等待搜索结果超时（{timeout}毫秒）")
+        return result
+
+    async def get_paper_list(self, count: int, request: DownloadRequest = None) -> List[Paper]:
         """
         获取论文列表
 
         Args:
             count: 需要获取的论文数量
+            request: 下载请求（提供时优先使用结果页缓存，见 iter_papers）
 
         Returns:
             论文列表
         """
         try:
-            self.logger.info(f"正在获取前 {count} 篇论文信息...")
-
-            papers = []
-            page_num = 1
+            papers = [paper async for paper in self.iter_papers(count, request=request)]
+            self.logger.info(f"✓ 共获取 {len(papers)} 篇论文信息")
+            return papers
 
-            while len(papers) < count:
-                self.logger.info(f"正在获取第 {page_num} 页...")
+        except Exception as e:
+            self.logger.error(f"❌ 获取论文列表失败: {e}")
+            raise
 
-                # 获取当前页的论文列表
-                page_papers = await self.get_papers_from_current_page()
+    async def iter_papers(self, count: int, request: DownloadRequest = None) -> AsyncIterator[Paper]:
+        """
+        逐页获取论文（异步生成器）
 
-                if not page_papers:
-                    self.logger.warning("当前页没有找到论文，停止获取")
-                    break
+        每解析完一页即产出该页论文，调用方可以在后续页面仍在翻页解析时开始下载。
+        提供 request 时优先使用结果页缓存，只有缓存中没有的页才打开检索结果页（按需翻到该页）。
 
-                papers.extend(page_papers)
-                self.logger.info(f"✓ 已获取 {len(page_papers)} 篇论文")
+        Args:
+            count: 需要获取的论文数量
+            request: 下载请求；为None时从当前已打开的结果页开始获取，不使用缓存
 
-                # 如果已获取足够的论文，停止
-                if len(papers) >= count:
-                    papers = papers[:count]  # 截取需要的数量
+        Yields:
+            Paper对象
+        """
+        self.logger.info(f"正在获取前 {count} 篇论文信息...")
+
+        cache = self.results_cache if request else None
+        yielded = 0
+        page_num = 1
+        # 浏览器当前所在的结果页（0 表示尚未打开检索结果页）
+        browser_page = 0 if request else 1
+        # 是否已访问过CNKI（恢复的会话或已打开的页面）
+        warmed = self.session_restored or browser_page > 0
+        self._cached_sources.clear()
+
+        while yielded < count:
+            cached = cache.get(request, page_num) if cache else None
+            if cached:
+                self.logger.info(f"✓ 第 {page_num} 页使用缓存的检索结果")
+                page_papers, has_next = cached.papers, cached.has_next
+                for paper in page_papers:
+                    self._cached_sources[id(paper)] = (paper, request, page_num)
+                # 不打开检索结果页时，新会话需先访问首页建立Cookie
+                if not warmed:
+                    warmed = True
+                    try:
+                        await self.goto_homepage()
+                    except Exception as e:
+                        self.logger.warning(f"⚠️ 预热会话失败，继续使用缓存的检索结果: {e}")
+            else:
+                if browser_page == 0:
+                    await self.open_results(request)
+                    browser_page = 1
+                    warmed = True
+                while browser_page < page_num:
+                    if not await self.goto_next_page():
+                        if cache:
+                            cache.mark_last_page(request, browser_page)
+                        break
+                    browser_page += 1
+                if browser_page < page_num:
                     break
 
+                self.logger.info(f"正在获取第 {page_num} 页...")
+
+                # 获取当前页的论文列表
+                page_papers = await self.get_papers_from_current_page()
+                has_next = None
+                cacheable = self._cacheable_papers(page_papers) if page_papers and cache else None
+                if cacheable:
+                    cache.put(request, page_num, cacheable)
+
+            if not page_papers:
+                self.logger.warning("当前页没有找到论文，停止获取")
+                break
+
+            # 只产出还需要的数量
+            page_papers = page_papers[:count - yielded]
+            self.logger.info(f"✓ 已获取 {len(page_papers)} 篇论文")
+            for paper in page_papers:
+                yield paper
+                yielded += 1
+
+            # 如果已获取足够的论文，停止
+            if yielded >= count:
+                break
+
+            if has_next is False:
+                break
+            if request is None:
                 # 尝试翻页
                 if not await self.goto_next_page():
                     break
-                page_num += 1
+                browser_page += 1
+            page_num += 1
 
-            self.logger.info(f"✓ 共获取 {len(papers)} 篇论文信息")
+    def _cacheable_papers(self, papers: List[Paper]) -> Optional[List[Paper]]:
+        """
+        生成可写入结果页缓存的论文副本：详情页链接换成不随会话变化的地址，去掉下载链接
 
-            return papers
+        kcms2 详情页链接和下载链接带有当前会话的 v 参数，换一个会话后无法使用。
 
-        except Exception as e:
-            self.logger.error(f"❌ 获取论文列表失败: {e}")
-            raise
+        Returns:
+            论文副本；有论文无法得到稳定的详情页地址时返回None（该页不缓存）
+        """
+        cacheable = []
+        for paper in papers:
+            url = build_detail_url(paper.db_name, paper.paper_id)
+            if not url and paper.url:
+                query = {name.lower() for name in parse_qs(urlparse(paper.url).query)}
+                if "filename" in query:
+                    url = self._normalize_url(paper.url)
+            if not url:
+                return None
+            cacheable.append(dataclasses.replace(paper, url=url, download_url=None))
+        return cacheable
+
+    def _invalidate_cached_page(self, paper: Paper) -> None:
+        """论文来自结果页缓存且详情页下载失败时，删除该缓存页（下次重新检索）"""
+        source = self._cached_sources.pop(id(paper), None)
+        if not source or source[0] is not paper or not self.results_cache:
+            return
+        _, request, page_num = source
+        self.results_cache.invalidate(request, page_num)
+        self.logger.info(f"缓存的第 {page_num} 页检索结果中的论文下载失败，已删除该页缓存")
 
     async def get_papers_from_current_page(self) -> List[Paper]:
         """
@@ -797,64 +1443,67 @@ class CNKIBrowser(PlatformBase):
         self.logger.debug(f"当前页面URL: {self.page.url}")
 
         try:
-            # 尝试主选择器
-            self.logger.debug(f"尝试使用主选择器: {self.PAPER_ITEM_SELECTOR}")
-            items = await self.page.query_selector_all(self.PAPER_ITEM_SELECTOR)
-            self.logger.info(f"主选择器找到 {len(items)} 个项目")
-
-            # 如果主选择器失败，尝试备用选择器
-            if not items:
-                self.logger.debug(f"主选择器未找到项目，尝试备用选择器: {self.PAPER_ITEM_SELECTOR_ALT}")
-                items = await self.page.query_selector_all(self.PAPER_ITEM_SELECTOR_ALT)
-                self.logger.info(f"备用选择器找到 {len(items)} 个项目")
-
-            if not items:
+            # 单次 evaluate 提取所有行（主选择器无结果时使用备用选择器）
+            row_selectors = self._paper_item_selectors()
+            title_selectors = self._ordered_selectors("title", self.TITLE_SELECTORS)
+            extracted = await self.page.evaluate(self.EXTRACT_ROWS_SCRIPT, {
+                "rowSelectors": row_selectors,
+                "titleSelectors": title_selectors,
+                "fields": {
+                    "authors": {"selectors": self.AUTHOR_SELECTORS, "numeric": False},
+                    "source": {"selectors": self.SOURCE_SELECTORS, "numeric": False},
+                    "year": {"selectors": self.YEAR_SELECTORS, "numeric": False},
+                    "cite_count": {"selectors": self.CITE_COUNT_SELECTORS, "numeric": True},
+                    "download_count": {"selectors": self.DOWNLOAD_COUNT_SELECTORS, "numeric": True},
+                    "download_url": {"selectors": self.DOWNLOAD_LINK_SELECTORS, "numeric": False, "attr": "href"},
+                },
+            })
+
+            rows = extracted.get("rows") or []
+            self._record_selector("paper_item", row_selectors, extracted.get("rowSelector"))
+            if not rows:
                 self.logger.warning("未找到任何论文项目")
                 return papers
 
-            self.logger.info(f"共找到 {len(items)} 个论文项目，开始提取信息...")
+            # 以多数行命中的标题选择器作为本页结果
+            title_hits = [row["titleSelector"] for row in rows if row and row.get("titleSelector")]
+            self._record_selector(
+                "title", title_selectors, max(set(title_hits), key=title_hits.count) if title_hits else None
+            )
 
-            for index, item in enumerate(items, 1):
-                try:
-                    self.logger.debug(f"--- 处理第 {index}/{len(items)} 个项目 ---")
-
-                    # 提取标题
-                    title_elem = None
-                    for selector in self.TITLE_SELECTORS:
-                        title_elem = await item.query_selector(selector)
-                        if title_elem:
-                            break
-                    
-                    if not title_elem:
-                        self.logger.warning(f"  第 {index} 个项目: 未找到标题元素，跳过")
-                        continue
-                    
-                    title = (await title_elem.inner_text()).strip()
-                    if not title:
-                        self.logger.warning(f"  第 {index} 个项目: 标题为空，跳过")
-                        continue
-                    
-                    self.logger.debug(f"  提取到标题: {title[:50]}{'...' if len(title) > 50 else ''}")
-                    
-                    # 创建论文对象
-                    paper = Paper(title=title)
+            selector_name = self._paper_item_selector_name(extracted.get("rowSelector"))
+            self.logger.info(f"{selector_name}找到 {len(rows)} 个论文项目，开始提取信息...")
 
-                    # 提取可选字段（作者、来源、年份）
-                    paper.authors = await self._extract_field(item, "author", [".author", "td:nth-child(2)", "[class*='author']"])
-                    paper.source = await self._extract_field(item, "source", [".source", "td:nth-child(3)", "[class*='source']"])
-                    paper.year = await self._extract_field(item, "year", [".date", "td:nth-child(4)", "[class*='date'], [class*='year']"])
+            for index, row in enumerate(rows, 1):
+                if not row:
+                    self.logger.warning(f"  第 {index} 个项目: 未找到标题元素，跳过")
+                    continue
 
-                    # 提取详情页URL
-                    paper.url = await title_elem.get_attribute("href") if title_elem else None
-                    if paper.url:
-                        self.logger.debug(f"  提取到URL: {paper.url}")
+                title = (row.get("title") or "").strip()
+                if not title:
+                    self.logger.warning(f"  第 {index} 个项目: 标题为空，跳过")
+                    continue
 
-                    papers.append(paper)
-                    self.logger.info(f"  ✓ 第 {index} 篇论文提取成功: {title[:50]}...")
+                paper = Paper(
+                    title=title,
+                    authors=row.get("authors"),
+                    source=row.get("source"),
+                    year=row.get("year"),
+                    url=row.get("href"),
+                    cite_count=row.get("cite_count"),
+                    download_count=row.get("download_count"),
+                    download_url=row.get("download_url"),
+                    paper_id=row.get("paperId"),
+                    db_name=row.get("dbName"),
+                )
+                self.logger.debug(
+                    f"  第 {index} 个项目: 作者={paper.authors}, 来源={paper.source}, "
+                    f"年份={paper.year}, 被引={paper.cite_count}, 下载={paper.download_count}, "
+                    f"编号={paper.paper_id}, URL={paper.url}"
+                )
 
-                except Exception as e:
-                    self.logger.warning(f"  第 {index} 个项目提取论文信息时出错: {e}", exc_info=True)
-                    continue
+                papers.append(paper)
+                self.logger.info(f"  ✓ 第 {index} 篇论文提取成功: {title[:50]}...")
 
         except Exception as e:
             self.logger.error(f"解析论文列表时出错: {e}", exc_info=True)
@@ -864,6 +1513,21 @@ class CNKIBrowser(PlatformBase):
         return papers
 
     async def download_paper(self, paper: Paper) -> DownloadResult:
+        """
+        下载单篇论文（来自结果页缓存的论文下载失败时删除对应的缓存页）
+
+        Args:
+            paper: 论文对象
+
+        Returns:
+            DownloadResult对象
+        """
+        result = await self._download_paper(paper)
+        if result.status == DownloadStatus.FAILED:
+            self._invalidate_cached_page(paper)
+        return result
+
+    async def _download_paper(self, paper: Paper) -> DownloadResult:
         """
         下载单篇论文
 
@@ -883,9 +1547,21 @@ class CNKIBrowser(PlatformBase):
                 # 尝试在当前页找到对应的下载按钮
                 return await self._download_from_list_page(paper)
 
-            # 如果有详情页URL，先进入详情页
-            else:
-                return await self._download_from_detail_page(paper)
+            paper.url = self._normalize_url(paper.url)
+
+            # 快速路径：直接通过HTTP请求下载，无需渲染详情页
+            if self.direct_download:
+                result = await self._download_via_request(paper)
+                if result:
+                    return result
+
+            # 在独立的标签页中进入详情页，点击下载按钮
+            async with self.lease_page() as page:
+                return await self._download_from_detail_page(paper, page)
+
+        except CNKIBlockedError:
+            # 限流或验证页面交由调度器处理（暂停所有下载并重新排队）
+            raise
 
         except Exception as e:
             # 下载失败
@@ -935,55 +1611,125 @@ class CNKIBrowser(PlatformBase):
                 download_time=elapsed
             )
 
-    async def _find_download_button(self, button_text: str):
-        """查找下载按钮（公共方法）"""
-        selectors = [
-            f"button:has-text('{button_text}')",
-            f"button:has(.n-button__content:text-is('{button_text}'))",
-            f"a:has-text('{button_text}')",
-        ]
-        for selector in selectors:
-            try:
-                download_button_timeout = self.config.browser.download_button_timeout if self.config and hasattr(self.config, 'browser') else 3000
-                button = await self.page.wait_for_selector(selector, timeout=download_button_timeout, state="visible")
-                if button:
-                    self.logger.info(f"✓ 找到{button_text}按钮")
-                    return button
-            except:
-                continue
-        return None
-
-    async def _find_element_by_selectors(self, selectors: List[str], timeout: int = None, description: str = "元素"):
-        """通过多个选择器查找元素（公共方法）"""
+    async def _race_selectors(
+            self,
+            selectors: Sequence[str],
+            timeout: int,
+            page: Optional[Page] = None,
+            page_type: Optional[str] = None
+    ) -> Tuple[Optional[ElementHandle], Optional[str]]:
+        """
+        并行等待多个候选选择器，在同一个截止时间内返回优先级最高的可见元素
+
+        任一选择器命中后，再立即检查排在它前面的选择器当前是否可见，
+        保证同时出现时按列表顺序优先，而不是按出现先后。
+
+        Args:
+            selectors: 候选选择器（按优先级排列，支持CSS、Playwright文本选择器和XPath）
+            timeout: 总等待时间（毫秒）
+            page: 页面对象（默认使用主页面）
+            page_type: 元素类型；提供时按历史命中情况调整优先级并记录本次结果
+
+        Returns:
+            (元素, 命中的选择器)，全部超时时返回 (None, None)
+        """
+        page = page or self.page
+        if not selectors:
+            return None, None
+
+        if page_type:
+            selectors = self._ordered_selectors(page_type, selectors)
+        started = asyncio.get_running_loop().time()
+
+        tasks = {
+            asyncio.create_task(page.wait_for_selector(selector, timeout=timeout, state="visible")): index
+            for index, selector in enumerate(selectors)
+        }
+        found = {}
+        try:
+            pending = set(tasks)
+            while pending and not found:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None and task.result():
+                        found[tasks[task]] = task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        latency_ms = (asyncio.get_running_loop().time() - started) * 1000
+        element, selector = None, None
+        if found:
+            winner = min(found)
+            element, selector = found[winner], selectors[winner]
+            for index in range(winner):
+                try:
+                    candidate = await page.query_selector(selectors[index])
+                    if candidate and await candidate.is_visible():
+                        element, selector = candidate, selectors[index]
+                        break
+                except Exception:
+                    continue
+
+        if page_type:
+            self._record_selector(page_type, selectors, selector, latency_ms if selector else None)
+        return element, selector
+
+    async def _find_download_button(
+            self,
+            button_texts: Union[str, Sequence[str]] = ("PDF下载", "CAJ下载"),
+            page: Optional[Page] = None
+    ):
+        """查找下载按钮（公共方法，多个按钮文本按顺序优先，所有候选并行等待）"""
+        if isinstance(button_texts, str):
+            button_texts = [button_texts]
+
+        # 按钮文本之间保持给定顺序（PDF优先），同一文本的选择器按历史命中情况排列
+        groups = {
+            button_text: self._ordered_selectors("download_button", [
+                f"button:has-text('{button_text}')",
+                f"button:has(.n-button__content:text-is('{button_text}'))",
+                f"a:has-text('{button_text}')",
+            ])
+            for button_text in button_texts
+        }
+        selectors = [selector for group in groups.values() for selector in group]
+
+        download_button_timeout = self.config.browser.download_button_timeout if self.config and hasattr(self.config, 'browser') else 3000
+        started = asyncio.get_running_loop().time()
+        button, selector = await self._race_selectors(selectors, download_button_timeout, page)
+        latency_ms = (asyncio.get_running_loop().time() - started) * 1000
+
+        for button_text, group in groups.items():
+            if selector in group:
+                self.logger.info(f"✓ 找到{button_text}按钮")
+                self._record_selector("download_button", group, selector, latency_ms)
+                break
+        else:
+            self._record_selector("download_button", selectors, None)
+        return button
+
+    async def _find_element_by_selectors(
+            self,
+            selectors: List[str],
+            timeout: int = None,
+            description: str = "元素",
+            page_type: Optional[str] = None
+    ):
+        """通过多个选择器查找元素（公共方法，提供 page_type 时学习选择器优先级）"""
         if timeout is None:
             timeout = self.config.browser.element_find_timeout if self.config and hasattr(self.config, 'browser') else 5000
-        for selector in selectors:
-            try:
-                elem = await self.page.wait_for_selector(selector, timeout=timeout, state="visible")
-                if elem and await elem.is_visible():
-                    self.logger.debug(f"✓ 找到{description}，使用选择器: {selector}")
-                    return elem
-            except:
-                continue
-        return None
+        elem, selector = await self._race_selectors(selectors, timeout, page_type=page_type)
+        if elem:
+            self.logger.debug(f"✓ 找到{description}，使用选择器: {selector}")
+        return elem
 
     async def _find_search_input(self):
         """查找搜索框（公共方法）"""
-        element_find_timeout = self.config.browser.element_find_timeout if self.config and hasattr(self.config, 'browser') else 5000
-        for selector in self.SEARCH_INPUT_SELECTORS:
-            try:
-                if selector == "input[class*='n-input__input']":
-                    await self.page.wait_for_selector(selector, timeout=element_find_timeout, state="visible")
-                    all_inputs = await self.page.query_selector_all(selector)
-                    if all_inputs:
-                        return all_inputs[0]
-                else:
-                    input_elem = await self.page.wait_for_selector(selector, timeout=element_find_timeout, state="visible")
-                    if input_elem and await input_elem.is_visible():
-                        return input_elem
-            except:
-                continue
-        return None
+        return await self._find_element_by_selectors(
+            self.SEARCH_INPUT_SELECTORS, description="搜索框", page_type="search_input"
+        )
 
     async def goto_next_page(self) -> bool:
         """
@@ -992,21 +1738,40 @@ class CNKIBrowser(PlatformBase):
         Returns:
             是否成功翻页
         """
+        row_selectors = self._paper_item_selectors()
         try:
             # 查找"下一页"按钮
-            next_button = self.page.locator("a:has-text('下一页'), a.next, button:has-text('下一页')").first
-            if await next_button.is_visible():
-                await next_button.click()
-                await self.page.wait_for_load_state("networkidle")
-                self.logger.info("✓ 已翻到下一页")
-                return True
-            else:
+            next_button = self.page.locator(self.NEXT_PAGE_SELECTOR).first
+            if not await next_button.is_visible():
                 self.logger.info("没有更多页面了")
                 return False
+
+            previous = await self.page.evaluate(self.ROWS_SIGNATURE_SCRIPT, row_selectors)
+            await self._throttle()
+            await next_button.click()
         except Exception as e:
             self.logger.info(f"无法找到下一页按钮: {e}")
             return False
 
+        # kns8s 结果页原地刷新列表，旧版结果页会跳转：两种情况都以列表内容变化为准
+        page_load_timeout = self.config.browser.page_load_timeout if self.config and hasattr(self.config, 'browser') else 15000
+        try:
+            await self.page.wait_for_function(
+                self.ROWS_CHANGED_SCRIPT,
+                arg={"rowSelectors": row_selectors, "previous": previous},
+                timeout=page_load_timeout
+            )
+        except Exception as e:
+            self.logger.debug(f"等待翻页后的列表刷新: {e}")
+            result = await self._wait_for_results(timeout=page_load_timeout)
+            current = await self.page.evaluate(self.ROWS_SIGNATURE_SCRIPT, row_selectors)
+            if result["state"] != "results" or current == previous:
+                self.logger.warning("翻页后结果列表没有变化，停止翻页")
+                return False
+
+        self.logger.info("✓ 已翻到下一页")
+        return True
+
     def _normalize_url(self, url: str) -> str:
         """规范化URL（公共方法）"""
         if not url:
@@ -1016,26 +1781,144 @@ class CNKIBrowser(PlatformBase):
         if url.startswith(('http://', 'https://')):
             return url
         
-        base_url = "https://kc.cnki.net" if 'kc.cnki.net' in self.page.url else "https://kns.cnki.net"
-        return base_url + (url if url.startswith('/') else '/' + url.lstrip('/'))
-
-    async def _extract_field(self, item, field_name: str, selectors: List[str]) -> Optional[str]:
-        """提取字段的公共方法"""
-        for selector in selectors:
-            elem = await item.query_selector(selector)
-            if elem:
-                text = (await elem.inner_text()).strip()
-                if text:
-                    self.logger.debug(f"  提取到{field_name}: {text}")
-                    return text
-        return None
-
-    async def _download_from_detail_page(self, paper: Paper) -> DownloadResult:
+        # 相对地址按当前结果页解析（kns8s 或旧版 kc），浏览器还没打开CNKI页面时按 kns8s 结果页解析
+        base_url = self.page.url if self.page and self.page.url.startswith(('http://', 'https://')) else CNKI_SEARCH_RESULT_URL
+        return urljoin(base_url, url if url.startswith('/') else '/' + url)
+
+    def _build_save_path(self, suggested_filename: str) -> Path:
+        """根据建议文件名生成保存路径（清理文件名并处理重名）"""
+        # 转换为PDF格式（如果是CAJ）
+        if suggested_filename.endswith('.caj'):
+            suggested_filename = suggested_filename[:-4] + '.pdf'
+
+        # 清理文件名
+        clean_filename = sanitize_filename(
+            suggested_filename.replace('.pdf', '')
+        ) + '.pdf'
+
+        # 处理重名（与同一目录的其他使用者共用文件名索引，下载目录变化时重新获取）
+        directory = self.download_dir.resolve()
+        if self._filename_index is None or self._filename_index.directory != directory:
+            self._filename_index = FilenameIndex.shared(directory, ".pdf")
+        final_filename = self._filename_index.reserve(clean_filename)
+
+        return self.download_dir / final_filename
+
+    def _build_request_headers(self, referer: Optional[str] = None) -> dict:
+        """
+        构造浏览器外部请求的请求头
+
+        Cookie 不放在请求头中（urllib 重定向时会把请求头原样带到任意主机），
+        而是通过 cookie_jar_from 按每一跳的域名携带。
+        """
+        headers = {
+            "User-Agent": self.user_agent or "Mozilla/5.0",
+            "Accept": "*/*",
+            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+        }
+        if referer:
+            headers["Referer"] = referer
+        return headers
+
+    async def _download_via_request(self, paper: Paper) -> Optional[DownloadResult]:
+        """
+        直接下载，无需渲染页面
+
+        下载链接优先取自列表行，其次从通过上下文 APIRequestContext 获取的详情页HTML中解析；
+        文件携带上下文Cookie分块流式写入 .part 文件，支持断点续传，完成后原子重命名。
+
+        Args:
+            paper: 论文对象（包含URL）
+
+        Returns:
+            成功时返回DownloadResult；无法直接下载时返回None，由调用方回退到点击下载
+        """
+        start_time = datetime.now()
+
+        try:
+            links = [self._normalize_url(paper.download_url)] if paper.download_url else []
+            if not links:
+                await self._throttle()
+                response = await self.context.request.get(paper.url, timeout=self.timeout)
+                page_html = await response.text()
+                state = classify_page(html_to_text(page_html), response.url, status=response.status)
+                if state.is_blocked:
+                    raise CNKIBlockedError(state, paper.url)
+                if not response.ok:
+                    self.logger.debug(f"获取详情页HTML失败: HTTP {response.status}")
+                    return None
+                links = [urljoin(paper.url, link) for link in extract_download_links(page_html)]
+
+            if not links:
+                self.logger.debug("详情页HTML中未找到下载链接，回退到页面点击下载")
+                return None
+
+            headers = self._build_request_headers(referer=paper.url)
+            cookies = await self.context.cookies()
+            loop = asyncio.get_running_loop()
+
+            def throttle_from_thread() -> None:
+                # 在下载线程中等待事件循环上的令牌，首次请求和每次续传都限速
+                asyncio.run_coroutine_threadsafe(self._throttle(), loop).result()
+
+            for url in links:
+                self.logger.debug(f"尝试直接下载: {url}")
+                # 按下载URL区分 .part 文件，同一URL中断后下次可继续续传
+                part_path = part_path_for_url(self.download_dir, url)
+                try:
+                    stream_result = await asyncio.to_thread(
+                        stream_download,
+                        url,
+                        part_path,
+                        headers,
+                        self.chunk_size,
+                        self.timeout / 1000,
+                        cookie_jar=cookie_jar_from(cookies),
+                        before_request=throttle_from_thread
+                    )
+                except NotAFileError as e:
+                    # 返回HTML通常是登录页、付费页或验证页，而不是文件
+                    self.logger.debug(f"直接下载未返回文件: {e}")
+                    continue
+                except Exception as e:
+                    self.logger.debug(f"直接下载中断: {e}")
+                    continue
+
+                suggested_filename = (
+                    parse_content_disposition(stream_result.headers.get("content-disposition"))
+                    or paper.get_filename()
+                )
+                save_path = finalize_download(stream_result.path, self._build_save_path(suggested_filename))
+
+                paper.download_url = url
+                elapsed = (datetime.now() - start_time).total_seconds()
+                resumed = f"，续传 {stream_result.resumed} 次" if stream_result.resumed else ""
+                self.logger.info(f"✓ 直接下载成功: {save_path.name} ({format_file_size(stream_result.size)}{resumed})")
+
+                return DownloadResult(
+                    paper=paper,
+                    status=DownloadStatus.SUCCESS,
+                    file_path=save_path,
+                    download_time=elapsed,
+                    sha256=stream_result.sha256
+                )
+
+            return None
+
+        except CNKIBlockedError:
+            raise
+
+        except Exception as e:
+            self.logger.debug(f"直接下载失败，回退到页面点击下载: {e}")
+            return None
+
+    async def _download_from_detail_page(self, paper: Paper, page: Page) -> DownloadResult:
         """
         从详情页下载论文
 
         Args:
             paper: 论文对象（包含URL）
+            page: 租用的下载标签页
 
         Returns:
             DownloadResult对象
@@ -1047,47 +1930,56 @@ class CNKIBrowser(PlatformBase):
             self.logger.info(f"正在进入详情页: {paper.title[:50]}...")
             self.logger.debug(f"原始URL: {paper.url}")
 
-            # 规范化URL
-            paper.url = self._normalize_url(paper.url)
             self.logger.info(f"访问URL: {paper.url}")
-            await self.page.goto(paper.url, timeout=self.timeout)
-            await self.page.wait_for_load_state("networkidle")
+            await self._throttle()
+            await page.goto(paper.url, timeout=self.timeout)
+            await page.wait_for_load_state("networkidle")
+
+            # 先识别页面状态：限流/验证页面上不会有下载按钮，无需逐个等待选择器超时
+            state = await self._classify_page(page)
+            if state.is_blocked:
+                raise CNKIBlockedError(state, paper.url)
+
+            # 登录页、付费页上没有立即可见的下载按钮时直接跳过，不再等待按钮选择器超时
+            download_button = None
+            if state in (PageState.LOGIN_WALL, PageState.PAYWALL):
+                visible_button = page.locator(f"{self.PDF_DOWNLOAD_SELECTOR}, {self.CAJ_DOWNLOAD_SELECTOR}").first
+                if await visible_button.is_visible():
+                    download_button = visible_button
+                else:
+                    self.logger.warning(f"⚠️ 论文{state.value}: {paper.title[:50]}...")
+                    return DownloadResult(
+                        paper=paper,
+                        status=DownloadStatus.SKIPPED,
+                        error_message=state.value,
+                        download_time=(datetime.now() - start_time).total_seconds(),
+                        paywalled=state == PageState.PAYWALL
+                    )
 
             # 查找下载按钮（PDF优先，CAJ备用）
-            download_button = await self._find_download_button("PDF下载") or await self._find_download_button("CAJ下载")
+            if download_button is None:
+                download_button = await self._find_download_button(("PDF下载", "CAJ下载"), page)
             if not download_button:
                 raise Exception("未找到下载按钮（PDF或CAJ）")
 
             # 点击下载
             self.logger.info("正在点击下载按钮...")
 
-            async with self.page.expect_download(timeout=self.timeout) as download_info:
+            await self._throttle()
+            async with page.expect_download(timeout=self.timeout) as download_info:
                 await download_button.click()
 
             download: Download = await download_info.value
 
-            # 确定保存文件名
-            suggested_filename = download.suggested_filename
-            # 转换为PDF格式（如果是CAJ）
-            if suggested_filename.endswith('.caj'):
-                suggested_filename = suggested_filename[:-4] + '.pdf'
-
-            # 清理文件名
-            clean_filename = sanitize_filename(
-                suggested_filename.replace('.pdf', '')
-            ) + '.pdf'
-
-            # 检查文件是否已存在
-            existing_files = list(self.download_dir.glob("*.pdf"))
-            final_filename = generate_unique_filename(clean_filename, existing_files)
-
-            # 保存文件
-            save_path = self.download_dir / final_filename
-            await download.save_as(save_path)
+            # 保存文件（先写入 .part，完成后原子重命名）
+            save_path = self._build_save_path(download.suggested_filename)
+            part_path = part_path_for(save_path)
+            await download.save_as(part_path)
+            finalize_download(part_path, save_path)
 
             elapsed = (datetime.now() - start_time).total_seconds()
 
-            self.logger.info(f"✓ 下载成功: {final_filename}")
+            self.logger.info(f"✓ 下载成功: {save_path.name}")
 
             return DownloadResult(
                 paper=paper,
@@ -1096,6 +1988,9 @@ class CNKIBrowser(PlatformBase):
                 download_time=elapsed
             )
 
+        except CNKIBlockedError:
+            raise
+
         except Exception as e:
             elapsed = (datetime.now() - start_time).total_seconds()
 
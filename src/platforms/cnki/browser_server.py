@@ -0,0 +1,85 @@
+"""
+CNKI论文下载器 - 本机共享浏览器
+启动一个常驻的Chromium并开放CDP调试端口，同一台机器上的多个下载进程连接它，而不是各自启动浏览器
+"""
+
+import asyncio
+import signal
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+from src.core.config import ConfigManager
+from src.platforms.cnki.server_info import (
+    SERVER_INFO_PATH, find_free_port, is_port_in_use, probe_endpoint, read_server_endpoint, write_server_info
+)
+from src.utils import setup_logging
+
+# 常驻浏览器不使用的启动参数：关闭沙箱和同源策略会让其中所有任务的页面暴露给恶意页面
+UNSAFE_SERVER_ARGS = frozenset(["--no-sandbox", "--disable-setuid-sandbox", "--disable-web-security"])
+
+
+async def serve_browser(config, logger, path: Path = SERVER_INFO_PATH) -> None:
+    """
+    启动共享浏览器并保持运行，直到收到 SIGINT/SIGTERM 或浏览器退出
+
+    调试端口只监听 127.0.0.1；remote_server_port 为0时自动选择空闲端口，指定的端口已被占用时不启动。
+    下载进程只有在开启 use_shared_server 时才会连接它。浏览器参数中关闭沙箱、同源策略的参数不会使用。
+
+    Args:
+        config: 配置对象
+        logger: 日志对象
+        path: 连接信息文件路径
+    """
+    settings = config.browser
+
+    running = await asyncio.to_thread(read_server_endpoint, path)
+    if running:
+        logger.info(f"共享浏览器已在运行: {running}")
+        return
+
+    port = settings.remote_server_port
+    if not port:
+        port = find_free_port()
+    elif await asyncio.to_thread(is_port_in_use, port):
+        logger.error(f"❌ 端口 {port} 已被其他程序占用，请修改 BROWSER_REMOTE_SERVER_PORT（设为0自动选择）")
+        return
+    endpoint = f"http://127.0.0.1:{port}"
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(
+            headless=settings.headless,
+            args=[arg for arg in settings.args if arg not in UNSAFE_SERVER_ARGS] + [
+                f"--remote-debugging-port={port}",
+                "--remote-debugging-address=127.0.0.1",
+            ]
+        )
+        browser.on("disconnected", lambda _: stop.set())
+        version = await asyncio.to_thread(probe_endpoint, endpoint)
+        if version is None:
+            logger.error(f"❌ 无法访问共享浏览器的调试端口: {endpoint}")
+            await browser.close()
+            return
+        write_server_info(endpoint, path, browser_url=version.get("webSocketDebuggerUrl"))
+        logger.info(f"✓ 共享浏览器已启动: {endpoint}")
+
+        try:
+            await stop.wait()
+        finally:
+            path.unlink(missing_ok=True)
+            if browser.is_connected():
+                await browser.close()
+            logger.info("✓ 共享浏览器已关闭")
+
+
+if __name__ == "__main__":
+    _config = ConfigManager().get()
+    asyncio.run(serve_browser(_config, setup_logging(_config.logging.log_dir, _config.logging.level)))
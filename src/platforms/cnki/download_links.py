@@ -0,0 +1,81 @@
+"""
+CNKI论文下载器 - 下载链接解析
+从详情页HTML和响应头中提取下载信息，无需渲染页面
+"""
+
+import html
+import re
+from typing import List, Optional
+from urllib.parse import unquote
+
+
+# 匹配 <a ... href="..." ...>内容</a>
+_ANCHOR_PATTERN = re.compile(
+    r"<a\b(?P<attrs>[^>]*?)href\s*=\s*[\"'](?P<href>[^\"']+)[\"'](?P<rest>[^>]*)>(?P<text>.*?)</a>",
+    re.IGNORECASE | re.DOTALL
+)
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+# 下载链接标识（链接文本或id），按优先级排列：PDF优先，CAJ备用
+DOWNLOAD_LINK_MARKERS = [
+    ("PDF下载", "pdfdown"),
+    ("CAJ下载", "cajdown"),
+]
+
+
+def extract_download_links(page_html: str) -> List[str]:
+    """
+    从详情页HTML中提取下载链接
+
+    Args:
+        page_html: 详情页HTML
+
+    Returns:
+        下载链接列表（PDF在前，CAJ在后），未找到时返回空列表
+    """
+    candidates = {}
+    for match in _ANCHOR_PATTERN.finditer(page_html):
+        href = html.unescape(match.group("href")).strip()
+        if not href or href.lower().startswith(("javascript:", "#")):
+            continue
+
+        attrs = (match.group("attrs") + match.group("rest")).lower()
+        text = _TAG_PATTERN.sub("", match.group("text"))
+
+        for priority, (label, element_id) in enumerate(DOWNLOAD_LINK_MARKERS):
+            if label in text or element_id in attrs:
+                candidates.setdefault(priority, href)
+                break
+
+    return [candidates[priority] for priority in sorted(candidates)]
+
+
+def parse_content_disposition(header: Optional[str]) -> Optional[str]:
+    """
+    从 Content-Disposition 响应头中解析文件名
+
+    Args:
+        header: Content-Disposition 头的值
+
+    Returns:
+        文件名，无法解析时返回None
+    """
+    if not header:
+        return None
+
+    # RFC 5987: filename*=UTF-8''%E6%96%87%E4%BB%B6.pdf
+    match = re.search(r"filename\*\s*=\s*([^']*)'[^']*'([^;]+)", header, re.IGNORECASE)
+    if match:
+        encoding = match.group(1) or "utf-8"
+        try:
+            return unquote(match.group(2).strip().strip('"'), encoding=encoding)
+        except LookupError:
+            return unquote(match.group(2).strip().strip('"'))
+
+    match = re.search(r"filename\s*=\s*\"?([^\";]+)\"?", header, re.IGNORECASE)
+    if match:
+        filename = match.group(1).strip()
+        # 部分服务器直接返回URL编码的文件名
+        return unquote(filename) if "%" in filename else filename
+
+    return None
@@ -0,0 +1,94 @@
+"""
+CNKI论文下载器 - 页面状态识别
+识别限流页、滑块验证页、登录页和付费页，避免在这些页面上空等下载按钮
+"""
+
+import re
+from enum import Enum
+
+
+class PageState(Enum):
+    """页面状态"""
+    NORMAL = "正常"
+    THROTTLE = "访问频繁限流"
+    CAPTCHA = "安全验证"
+    LOGIN_WALL = "需要登录"
+    PAYWALL = "需要付费权限"
+
+    @property
+    def is_blocked(self) -> bool:
+        """是否为被CNKI拦截的状态（限流或验证），需要暂停所有下载"""
+        return self in (PageState.THROTTLE, PageState.CAPTCHA)
+
+
+class CNKIBlockedError(Exception):
+    """CNKI返回了限流页或验证页"""
+
+    def __init__(self, state: PageState, url: str = ""):
+        self.state = state
+        self.url = url
+        super().__init__(f"CNKI返回{state.value}页面")
+
+
+# 页面特征，按优先级排列：验证 > 限流 > 登录 > 付费
+# 登录和付费特征只使用整句提示，避免把页头的"登录"链接误判为登录页
+PAGE_STATE_MARKERS = [
+    (PageState.CAPTCHA, ["滑动验证", "拖动下方拼图", "向右滑动", "请完成安全验证", "请完成验证"]),
+    (PageState.THROTTLE, ["访问过于频繁", "请求过于频繁", "操作过于频繁", "操作太频繁", "访问频率过高", "Too Many Requests"]),
+    (PageState.LOGIN_WALL, ["请先登录", "登录后下载", "登录后才能下载", "请登录后"]),
+    (PageState.PAYWALL, ["余额不足", "购买全文", "请充值", "付费下载", "购买后下载"]),
+]
+
+# URL特征（验证页和登录页通常会跳转到独立地址）
+PAGE_STATE_URL_MARKERS = [
+    (PageState.CAPTCHA, ["/verify", "captcha"]),
+    (PageState.LOGIN_WALL, ["login.cnki.net", "/login"]),
+]
+
+_TAG_PATTERN = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+
+# 页面正文只取前部，验证和限流提示都在页面顶部
+PAGE_TEXT_LIMIT = 5000
+
+# 在浏览器中提取页面状态识别所需的信息
+PAGE_STATE_SCRIPT = f"""
+() => ({{
+    url: location.href,
+    title: document.title || '',
+    text: document.body ? document.body.innerText.slice(0, {PAGE_TEXT_LIMIT}) : ''
+}})
+"""
+
+
+def classify_page(text: str, url: str = "", title: str = "", status: int = 200) -> PageState:
+    """
+    根据页面文本、URL和HTTP状态码识别页面状态
+
+    Args:
+        text: 页面可见文本（HTML需先经 html_to_text 处理）
+        url: 页面URL
+        title: 页面标题
+        status: HTTP状态码
+
+    Returns:
+        PageState
+    """
+    if status == 429:
+        return PageState.THROTTLE
+
+    url = (url or "").lower()
+    for state, markers in PAGE_STATE_URL_MARKERS:
+        if any(marker in url for marker in markers):
+            return state
+
+    content = f"{title}\n{(text or '')[:PAGE_TEXT_LIMIT]}"
+    for state, markers in PAGE_STATE_MARKERS:
+        if any(marker in content for marker in markers):
+            return state
+
+    return PageState.NORMAL
+
+
+def html_to_text(page_html: str) -> str:
+    """去除HTML标签、脚本和样式，得到近似的页面可见文本"""
+    return _TAG_PATTERN.sub(" ", page_html or "")
@@ -0,0 +1,173 @@
+"""
+CNKI论文下载器 - 检索结果页缓存
+按 (关键词, 文献类型, 语言, 页码) 在本地缓存提取出的论文列表，短时间内重复检索时不必再打开结果页
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from src.core.models import DownloadRequest, Paper
+
+
+@dataclass
+class CachedPage:
+    """缓存的一页检索结果"""
+    papers: List[Paper]                 # 该页的论文
+    has_next: Optional[bool] = None     # 是否还有下一页（None 表示未知）
+
+
+class ResultsCache:
+    """
+    检索结果页缓存
+
+    每页结果保存为一个JSON文件：
+    - 超过 ttl 秒的缓存视为过期，读取时删除
+    - 缓存目录总大小超过 max_bytes 时，按最近写入时间从旧到新删除
+
+    只应缓存不随会话变化的信息：详情页链接使用按文献编号构造的地址，不保存下载链接
+    （检索结果中的 kcms2 链接和下载链接带有当前会话的 v 参数，换一个会话后失效）。
+    """
+
+    def __init__(self, root: Path, ttl: float = 3600, max_bytes: int = 50 * 1024 * 1024, logger=None):
+        """
+        初始化结果页缓存
+
+        Args:
+            root: 缓存目录
+            ttl: 缓存有效期（秒）
+            max_bytes: 缓存目录的最大总大小（字节）
+            logger: 日志对象
+        """
+        self.root = Path(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.logger = logger
+
+    @staticmethod
+    def _key(request: DownloadRequest, page_num: int) -> dict:
+        """缓存键"""
+        return {
+            "keyword": request.keyword.strip(),
+            "doc_type": request.doc_type,
+            "language": request.language,
+            "page": page_num,
+        }
+
+    def _path(self, key: dict) -> Path:
+        """缓存键对应的文件路径"""
+        digest = hashlib.sha1(json.dumps(key, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        return self.root / f"{digest}.json"
+
+    def _read(self, key: dict) -> Optional[dict]:
+        """读取未过期的缓存条目"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("key") != key or time.time() - entry.get("saved_at", 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def _write(self, key: dict, entry: dict) -> None:
+        """写入缓存条目（先写临时文件再原子替换）"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def get(self, request: DownloadRequest, page_num: int) -> Optional[CachedPage]:
+        """
+        读取一页缓存的检索结果
+
+        Args:
+            request: 下载请求
+            page_num: 页码（从1开始）
+
+        Returns:
+            缓存的结果页，没有或已过期时返回None
+        """
+        entry = self._read(self._key(request, page_num))
+        if not entry:
+            return None
+        try:
+            papers = [Paper(**paper) for paper in entry["papers"]]
+        except (KeyError, TypeError) as e:
+            if self.logger:
+                self.logger.debug(f"结果页缓存格式无效: {e}")
+            return None
+        return CachedPage(papers=papers, has_next=entry.get("has_next"))
+
+    def put(self, request: DownloadRequest, page_num: int, papers: List[Paper]) -> None:
+        """
+        缓存一页检索结果
+
+        Args:
+            request: 下载请求
+            page_num: 页码（从1开始）
+            papers: 该页的论文（详情页URL应为不随会话变化的绝对地址，不含下载链接）
+        """
+        key = self._key(request, page_num)
+        try:
+            self._write(key, {
+                "key": key,
+                "saved_at": time.time(),
+                "has_next": None,
+                "papers": [asdict(paper) for paper in papers],
+            })
+            self._evict()
+        except OSError as e:
+            if self.logger:
+                self.logger.debug(f"写入结果页缓存失败: {e}")
+
+    def mark_last_page(self, request: DownloadRequest, page_num: int) -> None:
+        """记录该页是最后一页（之后从缓存读取时不再尝试翻页）"""
+        key = self._key(request, page_num)
+        entry = self._read(key)
+        if not entry:
+            return
+        entry["has_next"] = False
+        try:
+            self._write(key, entry)
+        except OSError as e:
+            if self.logger:
+                self.logger.debug(f"更新结果页缓存失败: {e}")
+
+    def invalidate(self, request: DownloadRequest, page_num: int) -> None:
+        """删除一页缓存（其中的论文详情页无法打开时调用，下次重新检索）"""
+        try:
+            self._path(self._key(request, page_num)).unlink(missing_ok=True)
+        except OSError as e:
+            if self.logger:
+                self.logger.debug(f"删除结果页缓存失败: {e}")
+
+    def _evict(self) -> None:
+        """删除过期缓存，总大小超过上限时从最旧的开始删除"""
+        now = time.time()
+        entries = []
+        for path in self.root.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
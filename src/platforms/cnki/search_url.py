@@ -0,0 +1,75 @@
+"""
+CNKI论文下载器 - 检索结果页URL构造
+根据下载请求直接生成结果页URL，跳过首页和文献类型点击
+"""
+
+from typing import Optional
+from urllib.parse import urlencode
+
+from src.core.models import DownloadRequest
+
+
+# 检索结果页地址
+CNKI_SEARCH_RESULT_URL = "https://kns.cnki.net/kns8s/defaultresult/index"
+
+# 详情页地址（按数据库代码和文献编号访问，不随会话变化；kcms2 链接中的 v 参数只在当前会话有效）
+CNKI_DETAIL_URL = "https://kns.cnki.net/kcms/detail/detail.aspx"
+
+# 文献类型 -> 检索库代码（多个代码用逗号分隔）
+# 未列出的文献类型没有可靠的直达地址，需走首页点击流程
+DOC_TYPE_DB_CODES = {
+    "学术期刊": "YSTT4HG0",
+    "学位论文": "LSTPFY1C,JUP3MUPD",
+    "会议": "MPMFIG1A",
+    "报纸": "WQ0UVIAA",
+}
+
+# 检索字段：SU=主题
+SEARCH_FIELD = "SU"
+
+
+def build_search_url(request: DownloadRequest) -> Optional[str]:
+    """
+    构造检索结果页URL
+
+    Args:
+        request: 下载请求对象（使用 keyword、doc_type、language、uniplatform）
+
+    Returns:
+        结果页URL；文献类型不支持直达或关键词为空时返回None
+    """
+    db_codes = DOC_TYPE_DB_CODES.get(request.doc_type)
+    keyword = request.keyword.strip()
+    if not db_codes or not keyword:
+        return None
+
+    params = {
+        "classid": db_codes.split(",")[0],
+        "crossids": db_codes,
+        "korder": SEARCH_FIELD,
+        "kw": keyword,
+        "language": request.language,
+        "uniplatform": request.uniplatform,
+    }
+    return f"{CNKI_SEARCH_RESULT_URL}?{urlencode(params)}"
+
+
+def build_detail_url(db_name: Optional[str], paper_id: Optional[str]) -> Optional[str]:
+    """
+    根据数据库代码和文献编号构造详情页URL
+
+    Args:
+        db_name: 数据库代码（如 CJFDLAST2023）
+        paper_id: 文献编号（FileName）
+
+    Returns:
+        详情页URL；缺少任一参数时返回None
+    """
+    if not db_name or not paper_id:
+        return None
+    params = {
+        "dbcode": db_name[:4].upper(),
+        "dbname": db_name,
+        "filename": paper_id,
+    }
+    return f"{CNKI_DETAIL_URL}?{urlencode(params)}"
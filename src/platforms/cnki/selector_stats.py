@@ -0,0 +1,161 @@
+"""
+CNKI论文下载器 - 选择器命中统计
+记录各类页面元素实际命中的选择器，跨运行持久化，下次优先尝试最近命中的选择器
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Collection, Dict, List, Optional, Sequence
+
+
+class SelectorStats:
+    """
+    选择器命中统计
+
+    按页面元素类型（如 search_input、paper_item）分别记录每个选择器的命中率、平均命中耗时和最近命中时间：
+    - 每次查找后，该类型下所有计数先乘以 decay 再累加，旧的命中记录逐渐失去权重
+    - 超过 max_age_days 天未命中的记录在加载时丢弃（CNKI改版后旧选择器自然淘汰）
+    - order() 把最近一次命中的选择器排在最前，其余按命中率降序，未命中过的保持原有顺序；
+      宽泛的兜底选择器（如 "a"、"td a"）固定在最后，即使曾经命中也不会提前，
+      否则会在后续页面上抢先匹配到错误的元素
+    """
+
+    def __init__(self, path: Path, decay: float = 0.9, max_age_days: float = 30, logger=None):
+        """
+        初始化选择器统计
+
+        Args:
+            path: 统计文件路径（JSON）
+            decay: 每次查找时旧计数的衰减系数
+            max_age_days: 记录的最长保留天数
+            logger: 日志对象
+        """
+        self.path = Path(path)
+        self.decay = decay
+        self.max_age = max_age_days * 86400
+        self.logger = logger
+
+        # {page_type: {"last": selector, "selectors": {selector: {"hits", "tries", "latency", "last_hit"}}}}
+        self._data: Dict[str, dict] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        """从文件加载统计，丢弃过期记录"""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            if self.logger:
+                self.logger.debug(f"读取选择器统计失败，重新统计: {e}")
+            return
+
+        expire_before = time.time() - self.max_age
+        for page_type, entry in data.items():
+            selectors = {
+                selector: stats
+                for selector, stats in entry.get("selectors", {}).items()
+                if stats.get("last_hit", 0) >= expire_before
+            }
+            if selectors:
+                last = entry.get("last")
+                self._data[page_type] = {"last": last if last in selectors else None, "selectors": selectors}
+
+    def save(self) -> None:
+        """保存统计到文件（先写临时文件再原子替换）"""
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            if self.logger:
+                self.logger.debug(f"保存选择器统计失败: {e}")
+
+    def order(self, page_type: str, selectors: Sequence[str], fallbacks: Collection[str] = ()) -> List[str]:
+        """
+        按历史命中情况重新排列候选选择器
+
+        Args:
+            page_type: 页面元素类型
+            selectors: 默认顺序的候选选择器
+            fallbacks: 宽泛的兜底选择器，保持原有相对顺序并固定排在最后
+
+        Returns:
+            重新排列后的选择器列表（只调整顺序，不增删）
+        """
+        specific = [selector for selector in selectors if selector not in fallbacks]
+        pinned = [selector for selector in selectors if selector in fallbacks]
+
+        entry = self._data.get(page_type)
+        if not entry:
+            return specific + pinned
+
+        stats = entry["selectors"]
+        last = entry.get("last")
+
+        def rank(item):
+            index, selector = item
+            if selector == last:
+                return (0, 0.0, index)
+            selector_stats = stats.get(selector)
+            if selector_stats and selector_stats["hits"] > 0:
+                hit_rate = selector_stats["hits"] / max(selector_stats["tries"], 1e-9)
+                return (1, -hit_rate, index)
+            return (2, 0.0, index)
+
+        return [selector for _, selector in sorted(enumerate(specific), key=rank)] + pinned
+
+    def record(
+            self,
+            page_type: str,
+            selectors: Sequence[str],
+            winner: Optional[str],
+            latency_ms: Optional[float] = None
+    ) -> None:
+        """
+        记录一次查找结果
+
+        Args:
+            page_type: 页面元素类型
+            selectors: 本次参与查找的候选选择器
+            winner: 命中的选择器（全部未命中时为None）
+            latency_ms: 命中耗时（毫秒）
+        """
+        entry = self._data.setdefault(page_type, {"last": None, "selectors": {}})
+        stats = entry["selectors"]
+
+        for selector_stats in stats.values():
+            selector_stats["hits"] *= self.decay
+            selector_stats["tries"] *= self.decay
+
+        for selector in selectors:
+            selector_stats = stats.get(selector)
+            if selector_stats:
+                selector_stats["tries"] += 1
+
+        if winner:
+            selector_stats = stats.setdefault(
+                winner, {"hits": 0.0, "tries": 1.0, "latency": None, "last_hit": 0}
+            )
+            selector_stats["hits"] += 1
+            selector_stats["last_hit"] = time.time()
+            if latency_ms is not None:
+                previous = selector_stats["latency"]
+                selector_stats["latency"] = latency_ms if previous is None else previous * 0.7 + latency_ms * 0.3
+            if entry["last"] != winner and self.logger:
+                self.logger.debug(f"选择器优先级更新 [{page_type}]: {winner}")
+            entry["last"] = winner
+        elif entry["last"] in selectors:
+            # 上次命中的选择器这次未命中，页面结构可能已变化
+            entry["last"] = None
+
+        self._dirty = True
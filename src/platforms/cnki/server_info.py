@@ -0,0 +1,118 @@
+"""
+CNKI论文下载器 - 共享浏览器连接信息
+本机共享浏览器启动后写入连接地址，下载进程据此连接，而不是各自启动浏览器
+"""
+
+import json
+import os
+import socket
+import urllib.request
+from http.client import HTTPException
+from pathlib import Path
+from typing import Optional
+
+from src.core.config import CONFIG_DIR
+
+# 共享浏览器的连接信息（启动后写入，退出时删除）
+SERVER_INFO_PATH = CONFIG_DIR / "browser_server.json"
+
+# 探测共享浏览器是否存活的超时时间（秒）
+PROBE_TIMEOUT = 1.0
+
+
+def probe_endpoint(endpoint: str, timeout: float = PROBE_TIMEOUT) -> Optional[dict]:
+    """
+    请求CDP端口的 /json/version，确认共享浏览器仍在运行
+
+    用连接探测代替按进程号检查：进程号在崩溃后可能被其他进程复用，
+    且 Windows 上 os.kill(pid, 0) 会直接结束目标进程。
+
+    Args:
+        endpoint: CDP连接地址（http://127.0.0.1:端口）
+        timeout: 超时时间（秒）
+
+    Returns:
+        浏览器版本信息（包含 webSocketDebuggerUrl）；无法连接时返回None
+    """
+    # 本机地址不经过环境变量中配置的代理
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+    try:
+        with opener.open(endpoint.rstrip("/") + "/json/version", timeout=timeout) as response:
+            info = json.load(response)
+    except (OSError, ValueError, HTTPException):
+        return None
+    return info if isinstance(info, dict) else None
+
+
+def read_server_endpoint(path: Path = SERVER_INFO_PATH) -> Optional[str]:
+    """
+    读取本机共享浏览器的连接地址（同步函数，会探测端口，异步代码中应放到线程中执行）
+
+    端口上运行的必须是写入连接信息的同一个浏览器（webSocketDebuggerUrl 每次启动都不同），
+    共享浏览器崩溃后端口被其他程序或新启动的浏览器占用时不会误连。
+    连接信息文件必须属于当前用户且其他用户不可读写（POSIX），否则不连接。
+
+    Args:
+        path: 连接信息文件路径
+
+    Returns:
+        CDP连接地址；共享浏览器未运行时返回None
+    """
+    if not _owned_by_current_user(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            info = json.load(f)
+        endpoint = info["endpoint"]
+        browser_url = info.get("browser_url")
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    version = probe_endpoint(endpoint)
+    if version is None:
+        return None
+    if browser_url and version.get("webSocketDebuggerUrl") != browser_url:
+        return None
+    return endpoint
+
+
+def _owned_by_current_user(path: Path) -> bool:
+    """文件是否属于当前用户且只有当前用户可读写（Windows 上不检查）"""
+    if not hasattr(os, "getuid"):
+        return Path(path).is_file()
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o077
+
+
+def find_free_port() -> int:
+    """获取 127.0.0.1 上一个当前空闲的端口"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def is_port_in_use(port: int) -> bool:
+    """127.0.0.1 上的端口是否已被占用"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(PROBE_TIMEOUT)
+        return sock.connect_ex(("127.0.0.1", port)) == 0
+
+
+def write_server_info(endpoint: str, path: Path, browser_url: Optional[str] = None) -> None:
+    """
+    写入连接信息（先写临时文件再原子替换，仅当前用户可读）
+
+    Args:
+        endpoint: CDP连接地址
+        path: 连接信息文件路径
+        browser_url: 浏览器的 webSocketDebuggerUrl，用于确认端口上仍是同一个浏览器
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"endpoint": endpoint, "pid": os.getpid(), "browser_url": browser_url}, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,80 @@
+"""
+CNKI论文下载器 - 会话状态持久化
+保存和加载 Playwright storage_state（Cookie 与 localStorage），跨运行复用CNKI会话
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+# 会话Cookie所属的域名
+CNKI_COOKIE_DOMAIN = "cnki.net"
+
+
+def load_storage_state(path: Path, max_age: float, logger=None) -> Optional[dict]:
+    """
+    加载并快速校验保存的会话状态（只检查本地文件，不发起网络请求）
+
+    以下情况视为无效：文件不存在或无法解析、保存时间超过 max_age 秒、
+    没有CNKI域名下的Cookie、CNKI的持久Cookie已全部过期。
+
+    Args:
+        path: storage_state 文件路径
+        max_age: 最长复用时间（秒）
+        logger: 日志对象
+
+    Returns:
+        可直接传给 browser.new_context(storage_state=...) 的字典，无效时返回None
+    """
+    if not path.exists():
+        return None
+
+    age = time.time() - path.stat().st_mtime
+    if age > max_age:
+        if logger:
+            logger.debug(f"会话状态已保存 {age / 3600:.1f} 小时，超过有效期，重新建立会话")
+        return None
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        if logger:
+            logger.debug(f"读取会话状态失败: {e}")
+        return None
+
+    now = time.time()
+    cookies = [
+        cookie for cookie in state.get("cookies", [])
+        if cookie.get("domain", "").lstrip(".").endswith(CNKI_COOKIE_DOMAIN)
+    ]
+    # expires 为 -1 表示会话Cookie，浏览器关闭即失效，不能说明会话仍然有效
+    persistent = [cookie for cookie in cookies if cookie.get("expires", -1) > 0]
+    if not cookies or (persistent and all(cookie["expires"] <= now for cookie in persistent)):
+        if logger:
+            logger.debug("会话状态中没有有效的CNKI Cookie")
+        return None
+
+    state["cookies"] = [
+        cookie for cookie in state.get("cookies", [])
+        if cookie.get("expires", -1) <= 0 or cookie["expires"] > now
+    ]
+    return state
+
+
+def save_storage_state(state: dict, path: Path) -> None:
+    """
+    保存会话状态（先写临时文件再原子替换，文件权限仅限当前用户）
+
+    Args:
+        state: context.storage_state() 的返回值
+        path: storage_state 文件路径
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
@@ -5,6 +5,7 @@
 from src.utils.file_utils import (
     sanitize_filename,
     generate_unique_filename,
+    FilenameIndex,
     ensure_directory,
     is_valid_download_directory
 )
@@ -17,12 +18,24 @@ from src.utils.format_utils import (
     format_duration,
     generate_download_report
 )
+from src.utils.download_utils import (
+    stream_download,
+    part_path_for,
+    part_path_for_url,
+    cookie_jar_from,
+    finalize_download,
+    file_sha256,
+    StreamResult,
+    NotAFileError
+)
+from src.utils.rate_limiter import TokenBucket, SharedTokenBucket
 from src.utils.text_utils import extract_paper_info_from_text
 from src.utils.system_utils import disk_usage
 
 __all__ = [
     "sanitize_filename",
     "generate_unique_filename",
+    "FilenameIndex",
     "ensure_directory",
     "is_valid_download_directory",
     "setup_logging",
@@ -30,6 +43,16 @@ __all__ = [
     "format_file_size",
     "format_duration",
     "generate_download_report",
+    "stream_download",
+    "part_path_for",
+    "part_path_for_url",
+    "cookie_jar_from",
+    "finalize_download",
+    "file_sha256",
+    "StreamResult",
+    "NotAFileError",
+    "TokenBucket",
+    "SharedTokenBucket",
     "extract_paper_info_from_text",
     "disk_usage",
 ]
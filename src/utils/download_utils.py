@@ -0,0 +1,337 @@
+"""
+下载工具函数
+分块流式写入（同时计算SHA-256）、断点续传与原子重命名
+"""
+
+import hashlib
+import http.cookiejar
+import json
+import os
+import re
+import socket
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from http.client import HTTPException
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+
+# 可以通过续传恢复的网络错误
+RESUMABLE_ERRORS = (urllib.error.URLError, socket.timeout, ConnectionError, HTTPException, TimeoutError)
+
+
+class NotAFileError(Exception):
+    """响应不是文件（如登录页、付费页、验证页）"""
+
+
+@dataclass
+class StreamResult:
+    """流式下载结果"""
+    path: Path                              # 最终文件路径
+    size: int                               # 文件大小（字节）
+    resumed: int = 0                        # 续传次数
+    headers: Dict[str, str] = field(default_factory=dict)  # 首个响应的响应头（小写键）
+    sha256: Optional[str] = None            # 文件SHA-256（十六进制）
+
+
+def part_path_for(path: Path) -> Path:
+    """获取下载中临时文件（.part）的路径"""
+    return path.with_name(path.name + ".part")
+
+
+def part_path_for_url(directory: Path, url: str) -> Path:
+    """
+    获取直接下载的临时文件路径（按下载URL区分）
+
+    同一URL的中断下载才会续传；PDF和CAJ链接、标题相同的不同论文使用各自的 .part 文件。
+
+    Args:
+        directory: 下载目录
+        url: 文件URL
+
+    Returns:
+        临时文件路径
+    """
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:20]
+    return Path(directory) / f".{digest}.part"
+
+
+def _meta_path(part_path: Path) -> Path:
+    """续传校验信息（URL、ETag、Last-Modified、总大小）的保存路径"""
+    return part_path.with_name(part_path.name + ".meta")
+
+
+def _read_meta(part_path: Path) -> Optional[dict]:
+    """读取 .part 文件的续传校验信息"""
+    try:
+        with open(_meta_path(part_path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(part_path: Path, meta: dict) -> None:
+    """保存 .part 文件的续传校验信息"""
+    with open(_meta_path(part_path), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def _discard_part(part_path: Path) -> None:
+    """删除无法续传的 .part 文件及其校验信息"""
+    part_path.unlink(missing_ok=True)
+    _meta_path(part_path).unlink(missing_ok=True)
+
+
+def _if_range_value(meta: dict) -> Optional[str]:
+    """If-Range 的取值：优先强ETag（弱ETag不能用于 If-Range），其次 Last-Modified"""
+    etag = meta.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return meta.get("last_modified")
+
+
+def cookie_jar_from(cookies: Iterable[dict]) -> http.cookiejar.CookieJar:
+    """
+    把浏览器上下文的Cookie（Playwright 格式）转换为 CookieJar
+
+    请求和每一跳重定向都只携带与目标域名、路径匹配的Cookie，重定向响应中的 Set-Cookie 也会保留。
+
+    Args:
+        cookies: Cookie列表（name、value、domain、path、expires、secure）
+
+    Returns:
+        CookieJar
+    """
+    jar = http.cookiejar.CookieJar()
+    for cookie in cookies:
+        domain = cookie.get("domain") or ""
+        expires = cookie.get("expires")
+        expires = int(expires) if expires and expires > 0 else None
+        jar.set_cookie(http.cookiejar.Cookie(
+            version=0,
+            name=cookie["name"],
+            value=cookie["value"],
+            port=None,
+            port_specified=False,
+            domain=domain,
+            domain_specified=domain.startswith("."),
+            domain_initial_dot=domain.startswith("."),
+            path=cookie.get("path") or "/",
+            path_specified=True,
+            secure=bool(cookie.get("secure")),
+            expires=expires,
+            discard=expires is None,
+            comment=None,
+            comment_url=None,
+            rest={},
+        ))
+    return jar
+
+
+def _parse_total_size(status: int, headers: Dict[str, str], offset: int) -> Optional[int]:
+    """根据响应头计算文件总大小"""
+    if status == 206:
+        # Content-Range: bytes 100-999/1000
+        match = re.match(r"bytes\s+\d+-\d+/(\d+)", headers.get("content-range", ""))
+        if match:
+            return int(match.group(1))
+    length = headers.get("content-length")
+    if length and length.isdigit():
+        return int(length) + (offset if status == 206 else 0)
+    return None
+
+
+def _range_matches(headers: Dict[str, str], offset: int, meta: Optional[dict]) -> bool:
+    """206 响应的起始位置、总大小和ETag是否与已下载的 .part 一致"""
+    match = re.match(r"bytes\s+(\d+)-\d+/(\d+|\*)", headers.get("content-range", ""))
+    if not match or int(match.group(1)) != offset:
+        return False
+    if meta:
+        total = meta.get("total")
+        if total is not None and match.group(2) != "*" and int(match.group(2)) != total:
+            return False
+        etag = headers.get("etag")
+        if etag and meta.get("etag") and etag != meta["etag"]:
+            return False
+    return True
+
+
+def _hash_prefix(path: Path, length: int, chunk_size: int):
+    """计算文件前 length 个字节的SHA-256（返回可继续更新的摘要对象）"""
+    digest = hashlib.sha256()
+    if length <= 0:
+        return digest
+    with open(path, "rb") as f:
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest
+
+
+def stream_download(
+    url: str,
+    part_path: Path,
+    headers: Optional[Dict[str, str]] = None,
+    chunk_size: int = 65536,
+    timeout: float = 30.0,
+    max_resumes: int = 3,
+    cookie_jar: Optional[http.cookiejar.CookieJar] = None,
+    before_request: Optional[Callable[[], None]] = None
+) -> StreamResult:
+    """
+    分块流式下载到 .part 文件，中断后使用 HTTP Range 续传（同步函数，调用方应放到线程中执行）
+
+    已存在的 .part 文件只有在其校验信息（.part.meta）中的URL相同、且保存了ETag或Last-Modified时才续传：
+    续传请求携带 If-Range，服务器返回的范围、总大小或ETag与保存的不一致时丢弃 .part 从头下载；
+    服务器不支持 Range 或文件已变化（返回200）时从头重新下载。
+    写入的同时计算SHA-256，不需要下载完成后再读一遍文件。
+
+    Args:
+        url: 文件URL
+        part_path: 临时文件路径（通常由 part_path_for_url 生成）
+        headers: 请求头（User-Agent、Referer 等，不应包含 Cookie）
+        chunk_size: 每次读取写入的字节数
+        timeout: 网络超时时间（秒）
+        max_resumes: 最大续传次数
+        cookie_jar: Cookie（见 cookie_jar_from），按每一跳的域名携带
+        before_request: 每次发起请求（包括续传）前调用的阻塞函数，用于限速
+
+    Returns:
+        StreamResult（path 为 .part 文件路径，完成后由调用方原子重命名）
+
+    Raises:
+        NotAFileError: 响应为HTML页面
+        RESUMABLE_ERRORS: 续传次数用尽后仍然失败
+    """
+    part_path.parent.mkdir(parents=True, exist_ok=True)
+    chunk_size = max(1, chunk_size)
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookie_jar or http.cookiejar.CookieJar()))
+    first_headers: Dict[str, str] = {}
+    resumes = 0
+    digest = hashlib.sha256()
+    hashed = 0
+
+    while True:
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        meta = _read_meta(part_path) if offset else None
+        # 无法确认 .part 属于同一个文件时不续传
+        if offset and not (meta and meta.get("url") == url and _if_range_value(meta)):
+            _discard_part(part_path)
+            offset, meta = 0, None
+
+        request_headers = dict(headers or {})
+        if offset:
+            request_headers["Range"] = f"bytes={offset}-"
+            request_headers["If-Range"] = _if_range_value(meta)
+
+        try:
+            if before_request:
+                before_request()
+            request = urllib.request.Request(url, headers=request_headers)
+            with opener.open(request, timeout=timeout) as response:
+                status = response.status
+                response_headers = {k.lower(): v for k, v in response.headers.items()}
+                if not first_headers:
+                    first_headers = response_headers
+
+                if "text/html" in response_headers.get("content-type", "").lower():
+                    raise NotAFileError(f"响应不是文件: {response_headers.get('content-type')}")
+
+                # 服务器忽略了 Range 或文件已变化（If-Range 不匹配），从头开始写
+                if status != 206:
+                    offset = 0
+                elif not _range_matches(response_headers, offset, meta):
+                    _discard_part(part_path)
+                    resumes += 1
+                    if resumes > max_resumes:
+                        raise ConnectionError("续传的文件与已下载部分不一致")
+                    continue
+                total = _parse_total_size(status, response_headers, offset)
+
+                if offset == 0:
+                    _write_meta(part_path, {
+                        "url": url,
+                        "etag": response_headers.get("etag"),
+                        "last_modified": response_headers.get("last-modified"),
+                        "total": total,
+                    })
+
+                # 摘要需与 .part 已有内容一致（上次运行留下的 .part 或从头重写时重新计算）
+                if hashed != offset:
+                    digest, hashed = _hash_prefix(part_path, offset, chunk_size), offset
+
+                with open(part_path, "ab" if offset else "wb") as f:
+                    while True:
+                        chunk = response.read(chunk_size)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        digest.update(chunk)
+                        hashed += len(chunk)
+
+            size = part_path.stat().st_size
+            if total is not None and size < total:
+                raise ConnectionError(f"下载不完整: {size}/{total} 字节")
+            if size == 0:
+                raise NotAFileError("响应内容为空")
+
+            _meta_path(part_path).unlink(missing_ok=True)
+            return StreamResult(
+                path=part_path, size=size, resumed=resumes, headers=first_headers, sha256=digest.hexdigest()
+            )
+
+        except urllib.error.HTTPError as e:
+            # 416: 请求范围无效，说明 .part 已是完整文件或已失效
+            if e.code == 416 and offset:
+                _discard_part(part_path)
+            if e.code < 500 and e.code != 416:
+                raise
+            if resumes >= max_resumes:
+                raise
+            resumes += 1
+
+        except RESUMABLE_ERRORS:
+            if resumes >= max_resumes:
+                raise
+            resumes += 1
+
+
+def finalize_download(part_path: Path, path: Path) -> Path:
+    """
+    将下载完成的 .part 文件原子重命名为最终文件
+
+    Args:
+        part_path: 临时文件路径
+        path: 最终文件路径
+
+    Returns:
+        最终文件路径
+    """
+    os.replace(part_path, path)
+    return path
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """
+    分块计算文件的SHA-256
+
+    Args:
+        path: 文件路径
+        chunk_size: 每次读取的字节数
+
+    Returns:
+        十六进制摘要
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
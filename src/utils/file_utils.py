@@ -2,9 +2,12 @@
 文件操作工具函数
 """
 
+import os
 import re
+import threading
+import weakref
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Set
 from datetime import datetime
 
 
@@ -42,7 +45,7 @@ def generate_unique_filename(filename: str, existing_files: List[Path]) -> str:
     """生成唯一文件名（处理重名）"""
     name = Path(filename).stem
     ext = Path(filename).suffix
-    existing_names = [f.stem for f in existing_files]
+    existing_names = {f.stem for f in existing_files}
 
     if name not in existing_names:
         return filename
@@ -59,6 +62,110 @@ def generate_unique_filename(filename: str, existing_files: List[Path]) -> str:
             return f"{name}_{timestamp}{ext}"
 
 
+class FilenameIndex:
+    """
+    目录文件名索引
+
+    首次使用时扫描一次目录，记录已有文件名（按扩展名过滤），之后每次分配文件名都在内存中完成：
+    - 已占用的文件名保存在集合中，冲突判断 O(1)
+    - 每个文件名记住下一个可用的序号，重名时从该序号继续，不必每次从 _1 开始逐个尝试
+    - 分配的文件名立即登记，并发的下载任务不会拿到同一个文件名（线程安全）
+    - 分配前再检查一次磁盘，其他进程写入的同名文件也不会被覆盖
+
+    同一进程内应通过 shared() 获取索引，同一目录的所有使用者共用一份登记，
+    否则各自分配的文件名可能相同，后写入的文件会覆盖先写入的。
+    """
+
+    # 正在使用的索引：{(解析后的目录, 扩展名): 索引}，不再被引用时自动移除
+    _registry: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+    _registry_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, directory: Path, suffix: str = ".pdf") -> "FilenameIndex":
+        """
+        获取目录的共享文件名索引（按解析后的绝对路径区分目录）
+
+        Args:
+            directory: 目录
+            suffix: 参与索引的文件扩展名
+
+        Returns:
+            文件名索引
+        """
+        directory = Path(directory).resolve()
+        key = (str(directory), suffix.lower())
+        with cls._registry_lock:
+            index = cls._registry.get(key)
+            if index is None:
+                index = cls(directory, suffix)
+                cls._registry[key] = index
+            return index
+
+    def __init__(self, directory: Path, suffix: str = ".pdf"):
+        """
+        初始化文件名索引
+
+        Args:
+            directory: 目录
+            suffix: 参与索引的文件扩展名
+        """
+        self.directory = Path(directory)
+        self.suffix = suffix.lower()
+        self._stems: Set[str] = set()
+        self._next_counter: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _load(self) -> None:
+        """扫描目录，登记已有文件名"""
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    name, ext = os.path.splitext(entry.name)
+                    if ext.lower() == self.suffix:
+                        self._stems.add(name)
+        except FileNotFoundError:
+            pass
+        self._loaded = True
+
+    def _taken(self, stem: str, ext: str) -> bool:
+        """文件名是否已被登记或已存在于磁盘"""
+        return stem in self._stems or (self.directory / f"{stem}{ext}").exists()
+
+    def reserve(self, filename: str) -> str:
+        """
+        分配一个不重名的文件名并登记（重名时追加 _1、_2 ...）
+
+        Args:
+            filename: 期望的文件名
+
+        Returns:
+            可用的文件名
+        """
+        name = Path(filename).stem
+        ext = Path(filename).suffix
+
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+            if not self._taken(name, ext):
+                self._stems.add(name)
+                return filename
+
+            counter = self._next_counter.get(name, 1)
+            while self._taken(f"{name}_{counter}", ext):
+                counter += 1
+                if counter > 10000:
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    return f"{name}_{timestamp}{ext}"
+
+            new_name = f"{name}_{counter}"
+            self._stems.add(new_name)
+            self._next_counter[name] = counter + 1
+            return f"{new_name}{ext}"
+
+
 def ensure_directory(directory: Path) -> bool:
     """确保目录存在，如果不存在则创建"""
     try:
@@ -48,10 +48,20 @@ def generate_download_report(summary) -> str:
         for result in summary.results:
             if not result.is_success():
                 paper_info = result.paper.title[:50] + "..." if len(result.paper.title) > 50 else result.paper.title
+                attempts = f"（尝试 {result.attempts} 次）" if result.attempts > 1 else ""
                 if result.error_message:
-                    report_lines.append(f"   ⚠️ {paper_info} - 原因: {result.error_message}")
+                    report_lines.append(f"   ⚠️ {paper_info} - 原因: {result.error_message}{attempts}")
                 else:
-                    report_lines.append(f"   ⚠️ {paper_info}")
+                    report_lines.append(f"   ⚠️ {paper_info}{attempts}")
+
+    if summary.concurrency_changes:
+        report_lines.append(
+            f"\n⚙️ 并发调整 {len(summary.concurrency_changes)} 次，最终并发数: {summary.final_concurrency}"
+        )
+        for change in summary.concurrency_changes:
+            report_lines.append(
+                f"   {change.timestamp.strftime('%H:%M:%S')} {change.old_limit} → {change.new_limit}: {change.reason}"
+            )
 
     elapsed = summary.get_elapsed_time()
     if elapsed:
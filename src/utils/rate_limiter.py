@@ -0,0 +1,102 @@
+"""
+限速工具函数
+异步令牌桶，限制对CNKI的请求频率（支持跨进程共享）
+"""
+
+import asyncio
+import multiprocessing
+import time
+
+
+class TokenBucket:
+    """
+    异步令牌桶限速器
+
+    以 rate 个/秒的速度补充令牌，最多累积 burst 个；每次请求前 acquire() 取走一个令牌，
+    令牌不足时等待。等待者按先后顺序获得令牌。
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数（<=0 表示不限速）
+            burst: 令牌桶容量（允许的突发请求数）
+        """
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """按经过的时间补充令牌"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """
+        获取令牌（不足时等待）
+
+        Args:
+            tokens: 需要的令牌数
+        """
+        if self.rate <= 0:
+            return
+
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class SharedTokenBucket:
+    """
+    跨进程共享的令牌桶限速器
+
+    令牌数和补充时间保存在共享内存中，由多个进程（如分片下载的各个浏览器进程）共同消耗，
+    保证所有进程合计的请求速率不超过 rate。接口与 TokenBucket 相同。
+    需在创建子进程前构造，并作为参数传给子进程。
+    """
+
+    def __init__(self, rate: float, burst: int = 1, context=None):
+        """
+        初始化共享令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数（<=0 表示不限速）
+            burst: 令牌桶容量（允许的突发请求数）
+            context: multiprocessing 上下文（默认使用当前默认上下文）
+        """
+        ctx = context or multiprocessing.get_context()
+        self.rate = rate
+        self.capacity = max(1, burst)
+        # [当前令牌数, 上次补充时间]，自带跨进程锁
+        self._state = ctx.Array("d", [float(self.capacity), time.monotonic()])
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """
+        获取令牌（不足时等待，等待期间不持有锁）
+
+        Args:
+            tokens: 需要的令牌数
+        """
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._state.get_lock():
+                now = time.monotonic()
+                available = min(self.capacity, self._state[0] + (now - self._state[1]) * self.rate)
+                self._state[1] = now
+                if available >= tokens:
+                    self._state[0] = available - tokens
+                    return
+                self._state[0] = available
+                delay = (tokens - available) / self.rate
+            await asyncio.sleep(delay)
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+测试全局熔断器（CircuitBreaker）
+"""
+import asyncio
+import time
+
+import pytest
+
+from src.downloader.circuit_breaker import CircuitBreaker, SharedBreakerState
+
+COOLDOWN = 0.05
+
+
+class Blocked(Exception):
+    """模拟被CNKI拦截"""
+
+
+def make_breaker(**kwargs):
+    kwargs.setdefault("cooldown", COOLDOWN)
+    kwargs.setdefault("max_cooldown", 1.0)
+    return CircuitBreaker(trip_on=(Blocked,), **kwargs)
+
+
+async def finishes(coro, timeout=0.2):
+    """协程能否在 timeout 秒内完成"""
+    try:
+        await asyncio.wait_for(asyncio.shield(coro), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def test_stale_epoch_trip_does_not_extend_cooldown():
+    async def run():
+        breaker = make_breaker()
+        epoch = await breaker.acquire()
+        assert await breaker.trip("限流", epoch)
+        assert breaker.trips == 1
+        cooldown = breaker._cooldown
+
+        # 熔断前启动的其他任务随后也被拦截：重新排队，但不再计入熔断
+        assert await breaker.trip("限流", epoch)
+        await asyncio.sleep(COOLDOWN)
+        probe_epoch = await breaker.acquire()
+        assert probe_epoch != epoch
+        assert await breaker.trip("限流", epoch)
+
+        assert breaker.trips == 1
+        assert breaker._cooldown == cooldown
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    asyncio.run(run())
+
+
+def test_only_one_probe_in_half_open():
+    async def run():
+        breaker = make_breaker()
+        await breaker.trip("限流", await breaker.acquire())
+        await asyncio.sleep(COOLDOWN)
+
+        await breaker.acquire()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        second = asyncio.ensure_future(breaker.acquire())
+        assert not await finishes(second)
+        second.cancel()
+
+    asyncio.run(run())
+
+
+def test_record_success_closes_and_resets_cooldown():
+    async def run():
+        breaker = make_breaker()
+        await breaker.trip("限流", await breaker.acquire())
+        assert breaker._cooldown == COOLDOWN * 2
+        await asyncio.sleep(COOLDOWN)
+
+        probe_epoch = await breaker.acquire()
+        waiter = asyncio.ensure_future(breaker.acquire())
+        assert not await finishes(waiter)
+
+        await breaker.record_success(probe_epoch)
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker._cooldown == COOLDOWN
+        assert await finishes(waiter)
+
+    asyncio.run(run())
+
+
+def test_failed_probe_reopens_with_longer_cooldown():
+    async def run():
+        breaker = make_breaker()
+        await breaker.trip("限流", await breaker.acquire())
+        await asyncio.sleep(COOLDOWN)
+
+        probe_epoch = await breaker.acquire()
+        assert await breaker.trip("限流", probe_epoch)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.trips == 2
+        assert breaker._cooldown == COOLDOWN * 4
+
+    asyncio.run(run())
+
+
+def test_exhausted_breaker_fails_and_releases_waiters():
+    async def run():
+        breaker = make_breaker(max_trips=1)
+        await breaker.trip("限流", await breaker.acquire())
+        await asyncio.sleep(COOLDOWN)
+
+        probe_epoch = await breaker.acquire()
+        waiter = asyncio.ensure_future(breaker.acquire())
+        assert not await finishes(waiter)
+
+        assert breaker.exhausted
+        assert await breaker.trip("限流", probe_epoch) is False
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert await finishes(waiter)
+
+    asyncio.run(run())
+
+
+def test_should_trip_only_on_configured_errors():
+    breaker = make_breaker()
+    assert breaker.should_trip(Blocked("验证码"))
+    assert not breaker.should_trip(TimeoutError("超时"))
+
+
+def test_shared_state_pauses_other_breakers():
+    async def run():
+        state = SharedBreakerState()
+        first = make_breaker(shared_state=state)
+        second = make_breaker(shared_state=state)
+
+        await first.trip("限流", await first.acquire())
+        assert state.remaining() > 0
+
+        # 其他进程（这里用另一个熔断器代替）的拦截落在共享冷却期内，不计熔断
+        assert await second.trip("限流", second._epoch)
+        assert second.state == CircuitBreaker.CLOSED
+        assert second.trips == 0
+
+        # 共享冷却期内 acquire 会等待
+        start = time.monotonic()
+        await second.acquire()
+        assert time.monotonic() - start >= COOLDOWN * 0.8
+
+    asyncio.run(run())
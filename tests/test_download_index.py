@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+测试下载索引（DownloadIndex）
+"""
+from src.core.models import Paper
+from src.downloader.download_index import DownloadIndex, paper_id_from_url, paper_id_of
+
+
+class FakeStore:
+    """只记录哈希的论文仓库"""
+
+    def __init__(self, hashes):
+        self.hashes = set(hashes)
+
+    def has(self, sha256):
+        return sha256 in self.hashes
+
+
+def make_index(tmp_path, store=None):
+    return DownloadIndex(tmp_path / "index.db", store=store)
+
+
+def make_file(tmp_path, name="paper.pdf"):
+    path = tmp_path / name
+    path.write_bytes(b"%PDF-1.4 test")
+    return path
+
+
+def test_paper_id_prefers_row_id_over_url():
+    paper = Paper(
+        title="论文",
+        paper_id="jsjx202301001",
+        url="https://kns.cnki.net/kcms2/article/abstract?v=session-token",
+    )
+    assert paper_id_of(paper) == "JSJX202301001"
+    assert paper_id_from_url("https://kns.cnki.net/kcms2/article/abstract?v=session-token") is None
+    assert paper_id_from_url("https://kns.cnki.net/kcms/detail/detail.aspx?dbname=CJFD&filename=abc01") == "ABC01"
+
+
+def test_lookup_by_paper_id(tmp_path):
+    index = make_index(tmp_path)
+    path = make_file(tmp_path)
+    index.record(Paper(title="深度学习综述", paper_id="ABC001"), path, sha256="h1")
+
+    # 编号相同即为同一篇，标题不同也命中
+    found = index.lookup(Paper(title="深度学习综述（修订）", paper_id="abc001"))
+    assert found is not None
+    assert found.path == path.resolve()
+    assert found.sha256 == "h1"
+
+    # 编号不同不命中
+    assert index.lookup(Paper(title="深度学习综述", paper_id="ABC002")) is None
+    index.close()
+
+
+def test_title_match_requires_authors(tmp_path):
+    index = make_index(tmp_path)
+    path = make_file(tmp_path)
+    index.record(Paper(title="Deep Learning: A Survey", authors="张三; 李四"), path)
+
+    # 规范化后标题、作者相同
+    assert index.lookup(Paper(title="deep learning a survey", authors="张三;李四")) is not None
+    # 作者不同
+    assert index.lookup(Paper(title="Deep Learning: A Survey", authors="王五")) is None
+    # 缺少作者时仅凭标题不认为是同一篇
+    assert index.lookup(Paper(title="Deep Learning: A Survey")) is None
+    index.close()
+
+
+def test_missing_file_record_is_pruned(tmp_path):
+    index = make_index(tmp_path)
+    path = make_file(tmp_path)
+    index.record(Paper(title="论文", paper_id="ABC001"), path, sha256="h1")
+
+    path.unlink()
+    assert index.lookup(Paper(title="论文", paper_id="ABC001")) is None
+    count = index._conn.execute("SELECT COUNT(*) FROM downloads").fetchone()[0]
+    assert count == 0
+    index.close()
+
+
+def test_missing_file_kept_when_store_has_content(tmp_path):
+    index = make_index(tmp_path, store=FakeStore({"h1"}))
+    path = make_file(tmp_path)
+    index.record(Paper(title="论文", paper_id="ABC001"), path, sha256="h1")
+
+    path.unlink()
+    assert index.lookup(Paper(title="论文", paper_id="ABC001")) is not None
+    index.close()
+
+
+def test_find_by_hash_in_directory(tmp_path):
+    index = make_index(tmp_path)
+    first = make_file(tmp_path, "a.pdf")
+    second = make_file(tmp_path, "b.pdf")
+    index.record(Paper(title="论文", paper_id="ABC001"), first, sha256="h1")
+
+    assert index.find_by_hash("h1", tmp_path, exclude=second) == first.resolve()
+    assert index.find_by_hash("h1", tmp_path, exclude=first) is None
+    assert index.find_by_hash("h1", tmp_path / "other") is None
+    index.close()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+测试目录文件名索引（FilenameIndex）
+"""
+import threading
+
+from src.utils import FilenameIndex
+
+
+def test_reserve_free_name(tmp_path):
+    index = FilenameIndex(tmp_path)
+    assert index.reserve("论文.pdf") == "论文.pdf"
+
+
+def test_reserve_skips_existing_files(tmp_path):
+    (tmp_path / "论文.pdf").write_bytes(b"")
+    (tmp_path / "论文_1.pdf").write_bytes(b"")
+    index = FilenameIndex(tmp_path)
+    assert index.reserve("论文.pdf") == "论文_2.pdf"
+
+
+def test_reserved_names_are_not_reused(tmp_path):
+    index = FilenameIndex(tmp_path)
+    names = [index.reserve("论文.pdf") for _ in range(3)]
+    assert names == ["论文.pdf", "论文_1.pdf", "论文_2.pdf"]
+
+
+def test_files_written_after_scan_are_not_overwritten(tmp_path):
+    index = FilenameIndex(tmp_path)
+    assert index.reserve("其他.pdf") == "其他.pdf"
+    # 扫描之后由其他进程写入的文件
+    (tmp_path / "论文.pdf").write_bytes(b"")
+    assert index.reserve("论文.pdf") == "论文_1.pdf"
+
+
+def test_other_suffixes_are_ignored(tmp_path):
+    (tmp_path / "论文.caj").write_bytes(b"")
+    index = FilenameIndex(tmp_path)
+    assert index.reserve("论文.pdf") == "论文.pdf"
+
+
+def test_concurrent_reserve_gives_distinct_names(tmp_path):
+    index = FilenameIndex(tmp_path)
+    names = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(20):
+            name = index.reserve("论文.pdf")
+            with lock:
+                names.append(name)
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(names) == 100
+    assert len(set(names)) == 100
+
+
+def test_shared_index_per_directory(tmp_path):
+    index = FilenameIndex.shared(tmp_path)
+    # 同一目录（不同写法）得到同一个索引，分配的文件名不会重复
+    same = FilenameIndex.shared(tmp_path / "sub" / "..")
+    assert same is index
+    assert index.reserve("论文.pdf") == "论文.pdf"
+    assert same.reserve("论文.pdf") == "论文_1.pdf"
+
+    other = tmp_path / "other"
+    other.mkdir()
+    assert FilenameIndex.shared(other) is not index
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+测试操作后切换到新页面（CNKIBrowser._check_and_switch_to_new_page）
+"""
+import asyncio
+import logging
+
+from src.platforms.cnki.browser import CNKIBrowser
+
+
+class FakeEvents:
+    """按事件名等待、触发事件"""
+
+    def __init__(self):
+        self._waiters = {}
+
+    async def wait_for_event(self, event, predicate=None, timeout=None):
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(event, []).append((future, predicate))
+        return await asyncio.wait_for(future, timeout / 1000 if timeout else None)
+
+    def emit(self, event, value):
+        for future, predicate in self._waiters.pop(event, []):
+            if future.done():
+                continue
+            if predicate is None or predicate(value):
+                future.set_result(value)
+            else:
+                self._waiters.setdefault(event, []).append((future, predicate))
+
+
+class FakePage(FakeEvents):
+    """只实现页面切换用到的接口"""
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+
+    async def wait_for_url(self, matcher, wait_until=None, timeout=None):
+        # 当前页面不跳转
+        await asyncio.sleep(timeout / 1000)
+        raise TimeoutError("no navigation")
+
+    async def wait_for_load_state(self, state=None, timeout=None):
+        return None
+
+
+class FakeContext(FakeEvents):
+    """浏览器上下文：记录所有页面，新建页面时触发 page 事件"""
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = list(pages)
+
+    def add_page(self, page):
+        self.pages.append(page)
+        self.emit("page", page)
+
+
+def make_browser(page, context):
+    browser = CNKIBrowser.__new__(CNKIBrowser)
+    browser.config = None
+    browser.logger = logging.getLogger("test")
+    browser.page = page
+    browser.context = context
+    browser._pool_pages = []
+    return browser
+
+
+def test_pool_tab_opened_during_action_is_ignored():
+    async def run():
+        home = FakePage("https://kns.cnki.net/kns8s/")
+        context = FakeContext([home])
+        browser = make_browser(home, context)
+        results = FakePage("https://kns.cnki.net/kns8s/search?kw=test")
+        pool_tab = FakePage("https://kns.cnki.net/kcms2/article/abstract?v=abc")
+
+        async def action():
+            # 让监听任务先开始等待
+            await asyncio.sleep(0)
+            # 下载任务在同一上下文中新建标签页，随后检索结果才在新标签页中打开
+            context.add_page(pool_tab)
+            browser._pool_pages.append(pool_tab)
+            await asyncio.sleep(0.01)
+            context.add_page(results)
+            home.emit("popup", results)
+
+        target = await browser._check_and_switch_to_new_page(action, url_keywords=["search"], wait_time=1)
+        assert target is results
+        assert browser.page is results
+
+    asyncio.run(run())
+
+
+def test_keyword_fallback_skips_pool_tabs():
+    async def run():
+        home = FakePage("https://kns.cnki.net/kns8s/")
+        pool_tab = FakePage("https://kns.cnki.net/kns8s/search?kw=other")
+        context = FakeContext([home, pool_tab])
+        browser = make_browser(home, context)
+        browser._pool_pages.append(pool_tab)
+
+        async def action():
+            return None
+
+        target = await browser._check_and_switch_to_new_page(action, url_keywords=["search"], wait_time=0.1)
+        assert target is None
+        assert browser.page is home
+
+    asyncio.run(run())
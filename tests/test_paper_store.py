@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+测试论文仓库（PaperStore）
+"""
+import os
+
+from src.downloader import paper_store
+from src.downloader.paper_store import PaperStore
+
+SHA = "ab" + "0" * 62
+
+
+def make_file(directory, name="论文.pdf"):
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_bytes(b"%PDF-1.4 test")
+    return path
+
+
+def test_adopt_links_into_store(tmp_path):
+    store = PaperStore(tmp_path / "store")
+    path = make_file(tmp_path / "papers")
+    store.adopt(path, SHA)
+
+    assert store.has(SHA)
+    assert os.path.samefile(store.blob_path(SHA), path)
+
+
+def test_adopt_replaces_duplicate_with_link(tmp_path):
+    store = PaperStore(tmp_path / "store")
+    first = make_file(tmp_path / "a")
+    second = make_file(tmp_path / "b")
+    store.adopt(first, SHA)
+    store.adopt(second, SHA)
+
+    assert os.path.samefile(first, second)
+
+
+def test_adopt_skips_store_when_link_fails(tmp_path, monkeypatch):
+    def fail(src, dst):
+        raise OSError("cross-device link")
+
+    monkeypatch.setattr(paper_store.os, "link", fail)
+    store = PaperStore(tmp_path / "store")
+    path = make_file(tmp_path / "papers")
+    store.adopt(path, SHA)
+
+    # 不复制到仓库，下载的文件保持原样
+    assert not store.has(SHA)
+    assert path.read_bytes() == b"%PDF-1.4 test"
+
+
+def test_materialize_links_to_new_directory(tmp_path):
+    store = PaperStore(tmp_path / "store")
+    path = make_file(tmp_path / "a")
+    store.adopt(path, SHA)
+
+    dest = store.materialize(SHA, tmp_path / "b" / "论文.pdf")
+    assert os.path.samefile(dest, path)
+
+
+def test_prune_removes_unreferenced_blobs(tmp_path):
+    store = PaperStore(tmp_path / "store")
+    path = make_file(tmp_path / "papers")
+    store.adopt(path, SHA)
+
+    assert store.prune() == 0
+    assert store.has(SHA)
+
+    path.unlink()
+    assert store.prune() == 1
+    assert not store.has(SHA)
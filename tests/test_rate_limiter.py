@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+测试请求限速器（TokenBucket、SharedTokenBucket）
+"""
+import asyncio
+import multiprocessing
+import time
+
+from src.utils import SharedTokenBucket, TokenBucket
+
+
+def _consume(bucket, tokens):
+    """子进程：从共享令牌桶取走令牌"""
+    asyncio.run(bucket.acquire(tokens))
+
+
+def elapsed(bucket, count):
+    async def run():
+        start = time.monotonic()
+        for _ in range(count):
+            await bucket.acquire()
+        return time.monotonic() - start
+    return asyncio.run(run())
+
+
+def test_burst_is_immediate():
+    assert elapsed(TokenBucket(rate=1, burst=3), 3) < 0.1
+    assert elapsed(SharedTokenBucket(rate=1, burst=3), 3) < 0.1
+
+
+def test_waits_for_refill():
+    # 取完3个令牌后，再取2个需要约 2/20 秒
+    assert elapsed(TokenBucket(rate=20, burst=3), 5) >= 0.09
+    assert elapsed(SharedTokenBucket(rate=20, burst=3), 5) >= 0.09
+
+
+def test_zero_rate_is_unlimited():
+    assert elapsed(SharedTokenBucket(rate=0, burst=1), 100) < 0.1
+
+
+def test_tokens_are_shared_across_processes():
+    context = multiprocessing.get_context("spawn")
+    bucket = SharedTokenBucket(rate=0.5, burst=3, context=context)
+
+    process = context.Process(target=_consume, args=(bucket, 3))
+    process.start()
+    process.join(timeout=60)
+    assert process.exitcode == 0
+
+    # 子进程已取走全部令牌，本进程需要等待补充（最多2秒，扣除子进程退出所用的时间）
+    assert elapsed(bucket, 1) >= 0.5
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+测试检索结果页缓存（ResultsCache）
+"""
+import os
+import time
+
+from src.core.models import DownloadRequest, Paper
+from src.platforms.cnki.results_cache import ResultsCache
+
+
+def make_request(keyword="人工智能"):
+    return DownloadRequest(keyword=keyword, count=10, doc_type="学术期刊", save_dir=".")
+
+
+def make_papers(count=3):
+    return [Paper(title=f"论文{i}", authors="张三", paper_id=f"ABC00{i}") for i in range(count)]
+
+
+def test_put_and_get(tmp_path):
+    cache = ResultsCache(tmp_path)
+    request = make_request()
+    cache.put(request, 1, make_papers())
+
+    page = cache.get(request, 1)
+    assert page is not None
+    assert [paper.title for paper in page.papers] == ["论文0", "论文1", "论文2"]
+    assert page.has_next is None
+    assert cache.get(request, 2) is None
+    assert cache.get(make_request("机器学习"), 1) is None
+
+
+def test_mark_last_page(tmp_path):
+    cache = ResultsCache(tmp_path)
+    request = make_request()
+    cache.put(request, 1, make_papers())
+    cache.mark_last_page(request, 1)
+    assert cache.get(request, 1).has_next is False
+
+
+def test_expired_entry_is_removed(tmp_path):
+    cache = ResultsCache(tmp_path, ttl=60)
+    request = make_request()
+    cache.put(request, 1, make_papers())
+    assert cache.get(request, 1) is not None
+
+    cache.ttl = -1
+    assert cache.get(request, 1) is None
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_size_cap_evicts_oldest(tmp_path):
+    cache = ResultsCache(tmp_path)
+    request = make_request()
+    cache.put(request, 1, make_papers())
+    entry_size = next(tmp_path.glob("*.json")).stat().st_size
+    cache.max_bytes = entry_size * 2 + entry_size // 2
+
+    # 让前两页的写入时间依次更早
+    now = time.time()
+    cache.put(request, 2, make_papers())
+    for page_num, age in ((1, 20), (2, 10)):
+        path = cache._path(cache._key(request, page_num))
+        os.utime(path, (now - age, now - age))
+
+    cache.put(request, 3, make_papers())
+    assert cache.get(request, 1) is None
+    assert cache.get(request, 2) is not None
+    assert cache.get(request, 3) is not None
+
+
+def test_invalidate_removes_page(tmp_path):
+    cache = ResultsCache(tmp_path)
+    request = make_request()
+    cache.put(request, 1, make_papers())
+    cache.put(request, 2, make_papers())
+
+    cache.invalidate(request, 1)
+    assert cache.get(request, 1) is None
+    assert cache.get(request, 2) is not None
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+测试失败重试策略（RetryPolicy）
+"""
+import pytest
+
+from src.core.models import DownloadResult, DownloadStatus, Paper
+from src.downloader.retry import RetryPolicy
+
+
+def make_result(status, message=None):
+    return DownloadResult(paper=Paper(title="测试论文"), status=status, error_message=message)
+
+
+@pytest.mark.parametrize("status, message, retryable", [
+    # 超时
+    (DownloadStatus.FAILED, "Timeout 30000ms exceeded.", True),
+    (DownloadStatus.FAILED, "下载超时", True),
+    # 导航/网络失败
+    (DownloadStatus.FAILED, "page.goto: net::ERR_CONNECTION_RESET", True),
+    (DownloadStatus.FAILED, "Navigation failed because page was closed", True),
+    (DownloadStatus.FAILED, "Target closed", True),
+    (DownloadStatus.FAILED, "Target page, context or browser has been closed", True),
+    (DownloadStatus.FAILED, "下载不完整: 1024/2048 字节", True),
+    (DownloadStatus.FAILED, "Connection reset by peer", True),
+    # 限流/验证码
+    (DownloadStatus.FAILED, "需要验证", True),
+    (DownloadStatus.FAILED, "访问被限流", True),
+    (DownloadStatus.FAILED, "操作过于频繁", True),
+    (DownloadStatus.FAILED, "HTTP Error 429: Too Many Requests", True),
+    # 非临时错误
+    (DownloadStatus.FAILED, "未找到下载按钮", False),
+    (DownloadStatus.FAILED, None, False),
+    # 付费论文跳过、已成功的结果都不重试（即便信息含关键词）
+    (DownloadStatus.SKIPPED, "需要付费权限", False),
+    (DownloadStatus.SKIPPED, "需要验证", False),
+    (DownloadStatus.SUCCESS, None, False),
+])
+def test_is_retryable(status, message, retryable):
+    assert RetryPolicy().is_retryable(make_result(status, message)) is retryable
+
+
+def test_should_retry_stops_after_retry_times():
+    policy = RetryPolicy(retry_times=2)
+    result = make_result(DownloadStatus.FAILED, "下载超时")
+    assert policy.should_retry(result, 1)
+    assert policy.should_retry(result, 2)
+    assert not policy.should_retry(result, 3)
+
+    assert not RetryPolicy(retry_times=0).should_retry(result, 1)
+    # 负数按0处理
+    assert RetryPolicy(retry_times=-1).retry_times == 0
+
+
+@pytest.mark.parametrize("attempt, low, high", [
+    (1, 1.0, 2.0),
+    (2, 2.0, 4.0),
+    (3, 4.0, 8.0),
+    (4, 5.0, 10.0),   # 达到 max_delay 上限
+    (10, 5.0, 10.0),
+])
+def test_next_delay_range(attempt, low, high):
+    policy = RetryPolicy(base_delay=2.0, max_delay=10.0)
+    delays = [policy.next_delay(attempt) for _ in range(200)]
+    assert all(low <= d <= high for d in delays)
+    # 加入了随机抖动，而不是固定值
+    assert len(set(delays)) > 1
+
+
+def test_next_delay_bounds(monkeypatch):
+    policy = RetryPolicy(base_delay=2.0, max_delay=10.0)
+    monkeypatch.setattr("src.downloader.retry.random.uniform", lambda a, b: a)
+    assert policy.next_delay(2) == 2.0
+    monkeypatch.setattr("src.downloader.retry.random.uniform", lambda a, b: b)
+    assert policy.next_delay(2) == 4.0
+    assert policy.next_delay(5) == 10.0
+
+    # max_delay 小于 base_delay 时以 base_delay 为上限
+    assert RetryPolicy(base_delay=3.0, max_delay=1.0).max_delay == 3.0
+    assert RetryPolicy(base_delay=0.0).next_delay(3) == 0.0
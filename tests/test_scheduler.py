@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+测试滑动窗口下载调度器（DownloadScheduler）
+"""
+import asyncio
+
+from src.core.models import DownloadResult, DownloadStatus, Paper
+from src.downloader.retry import RetryPolicy
+from src.downloader.scheduler import DownloadScheduler
+
+
+def make_papers(count):
+    return [Paper(title=f"论文{i}") for i in range(1, count + 1)]
+
+
+async def run_jobs(scheduler, papers):
+    """提交全部任务并运行调度器"""
+    async def produce():
+        for index, paper in enumerate(papers, start=1):
+            await scheduler.submit(paper, index)
+        scheduler.close()
+
+    producer = asyncio.create_task(produce())
+    results = await scheduler.run()
+    await producer
+    return results
+
+
+def success(job):
+    return DownloadResult(paper=job.paper, status=DownloadStatus.SUCCESS)
+
+
+def test_never_exceeds_concurrency():
+    async def run():
+        in_flight = 0
+        peak = 0
+
+        async def handler(job):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01 * (job.index % 4 + 1))
+            in_flight -= 1
+            return success(job)
+
+        scheduler = DownloadScheduler(handler, concurrency=3, queue_size=2)
+        results = await run_jobs(scheduler, make_papers(20))
+        assert peak == 3
+        assert [result.paper.title for result in results] == [f"论文{i}" for i in range(1, 21)]
+
+    asyncio.run(run())
+
+
+def test_next_job_starts_when_a_slot_frees():
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = {}
+
+        async def handler(job):
+            started[job.index] = loop.time()
+            # 第2篇很慢，第3篇不应等它完成
+            await asyncio.sleep(1.0 if job.index == 2 else 0.05)
+            return success(job)
+
+        scheduler = DownloadScheduler(handler, concurrency=2)
+        begin = loop.time()
+        await run_jobs(scheduler, make_papers(4))
+        assert started[3] - begin < 0.5
+        assert started[4] - begin < 0.5
+
+    asyncio.run(run())
+
+
+def test_start_gap_is_honoured():
+    async def run():
+        loop = asyncio.get_running_loop()
+        starts = []
+
+        async def handler(job):
+            starts.append(loop.time())
+            return success(job)
+
+        scheduler = DownloadScheduler(handler, concurrency=5, request_interval=0.05)
+        await run_jobs(scheduler, make_papers(5))
+        gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+        assert len(gaps) == 4
+        assert min(gaps) >= 0.045
+
+    asyncio.run(run())
+
+
+def test_retryable_failure_is_requeued():
+    async def run():
+        calls = {}
+
+        async def handler(job):
+            calls[job.index] = calls.get(job.index, 0) + 1
+            if job.index == 1 and calls[1] == 1:
+                return DownloadResult(paper=job.paper, status=DownloadStatus.FAILED, error_message="Timeout 30000ms")
+            return success(job)
+
+        scheduler = DownloadScheduler(
+            handler, concurrency=2, retry_policy=RetryPolicy(retry_times=2, base_delay=0.01, max_delay=0.01)
+        )
+        results = await run_jobs(scheduler, make_papers(3))
+        assert calls[1] == 2
+        assert all(result.is_success() for result in results)
+        assert results[0].attempts == 2
+        assert len(results[0].attempt_times) == 2
+
+    asyncio.run(run())
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+测试共享浏览器连接信息（server_info）
+"""
+import http.server
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+from src.platforms.cnki.server_info import find_free_port, read_server_endpoint, write_server_info
+
+BROWSER_URL = "ws://127.0.0.1/devtools/browser/test"
+
+
+@pytest.fixture
+def cdp_endpoint():
+    """模拟CDP端口的 /json/version"""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps({"webSocketDebuggerUrl": BROWSER_URL}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_running_browser_is_found(tmp_path, cdp_endpoint):
+    path = tmp_path / "browser_server.json"
+    write_server_info(cdp_endpoint, path, browser_url=BROWSER_URL)
+    assert read_server_endpoint(path) == cdp_endpoint
+
+
+def test_other_browser_on_port_is_rejected(tmp_path, cdp_endpoint):
+    path = tmp_path / "browser_server.json"
+    write_server_info(cdp_endpoint, path, browser_url="ws://127.0.0.1/devtools/browser/old")
+    assert read_server_endpoint(path) is None
+
+
+def test_stopped_browser_is_rejected(tmp_path):
+    path = tmp_path / "browser_server.json"
+    write_server_info(f"http://127.0.0.1:{find_free_port()}", path, browser_url=BROWSER_URL)
+    assert read_server_endpoint(path) is None
+
+
+def test_missing_file(tmp_path):
+    assert read_server_endpoint(tmp_path / "browser_server.json") is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="只在POSIX上检查文件权限")
+def test_file_readable_by_others_is_rejected(tmp_path, cdp_endpoint):
+    path = tmp_path / "browser_server.json"
+    write_server_info(cdp_endpoint, path, browser_url=BROWSER_URL)
+    assert (os.stat(path).st_mode & 0o777) == 0o600
+
+    os.chmod(path, 0o644)
+    assert read_server_endpoint(path) is None
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+测试流式下载与断点续传（stream_download），使用本地支持 Range 的HTTP服务器
+"""
+import hashlib
+import http.server
+import json
+import re
+import threading
+
+import pytest
+
+from src.utils.download_utils import NotAFileError, part_path_for_url, stream_download
+
+CONTENT = bytes(range(256)) * 64          # 16KB
+NEW_CONTENT = bytes(reversed(range(256))) * 80
+HALF = len(CONTENT) // 2
+
+
+class FileServer:
+    """可配置行为的文件服务器状态"""
+
+    def __init__(self):
+        self.content = CONTENT
+        self.etag = '"v1"'
+        self.content_type = "application/pdf"
+        self.honor_range = True       # False: 忽略 Range 始终返回200
+        self.honor_if_range = True    # False: 不检查 If-Range（文件变了也返回206）
+        self.truncate_times = 0       # 接下来几次响应只发送一半内容后断开
+        self.requests = []            # 每次请求的请求头
+
+    def sha256(self):
+        return hashlib.sha256(self.content).hexdigest()
+
+
+@pytest.fixture
+def server():
+    """本地文件服务器，yield (状态, URL)"""
+    state = FileServer()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            state.requests.append(dict(self.headers))
+            content = state.content
+            start = None
+            match = re.match(r"bytes=(\d+)-$", self.headers.get("Range", ""))
+            if match and state.honor_range:
+                if_range = self.headers.get("If-Range")
+                if not (state.honor_if_range and if_range and if_range != state.etag):
+                    start = int(match.group(1))
+
+            if start is not None and start >= len(content):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(content)}")
+                self.end_headers()
+                return
+
+            body = content[start:] if start is not None else content
+            if start is not None:
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Type", state.content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", state.etag)
+            self.end_headers()
+
+            if state.truncate_times:
+                # Content-Length 与实际发送的字节数不一致
+                state.truncate_times -= 1
+                body = body[:len(body) // 2]
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield state, f"http://127.0.0.1:{httpd.server_port}/paper.pdf"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_part(part_path, url, data, etag='"v1"', total=len(CONTENT)):
+    """模拟上次中断留下的 .part 及其校验信息"""
+    part_path.write_bytes(data)
+    meta_path = part_path.with_name(part_path.name + ".meta")
+    meta_path.write_text(json.dumps({"url": url, "etag": etag, "last_modified": None, "total": total}))
+    return meta_path
+
+
+def test_full_download(tmp_path, server):
+    state, url = server
+    part_path = part_path_for_url(tmp_path, url)
+
+    result = stream_download(url, part_path)
+
+    assert part_path.read_bytes() == CONTENT
+    assert result.size == len(CONTENT)
+    assert result.sha256 == state.sha256()
+    assert result.resumed == 0
+    assert not part_path.with_name(part_path.name + ".meta").exists()
+    assert "Range" not in state.requests[0]
+
+
+def test_resume_from_part(tmp_path, server):
+    state, url = server
+    part_path = part_path_for_url(tmp_path, url)
+    meta_path = make_part(part_path, url, CONTENT[:HALF])
+
+    result = stream_download(url, part_path)
+
+    assert state.requests[0]["Range"] == f"bytes={HALF}-"
+    assert state.requests[0]["If-Range"] == '"v1"'
+    assert part_path.read_bytes() == CONTENT
+    # 摘要包含续传前已下载的部分
+    assert result.sha256 == state.sha256()
+    assert not meta_path.exists()
+
+
+def test_changed_etag_restarts_from_zero(tmp_path, server):
+    state, url = server
+    state.content, state.etag = NEW_CONTENT, '"v2"'
+    part_path = part_path_for_url(tmp_path, url)
+    make_part(part_path, url, CONTENT[:HALF], etag='"v1"')
+
+    result = stream_download(url, part_path)
+
+    # If-Range 不匹配，服务器返回200，从第0个字节重新写
+    assert len(state.requests) == 1
+    assert part_path.read_bytes() == NEW_CONTENT
+    assert result.sha256 == state.sha256()
+
+
+def test_changed_etag_on_206_restarts_from_zero(tmp_path, server):
+    state, url = server
+    state.content, state.etag = CONTENT[::-1], '"v2"'
+    state.honor_if_range = False
+    part_path = part_path_for_url(tmp_path, url)
+    make_part(part_path, url, CONTENT[:HALF], etag='"v1"')
+
+    result = stream_download(url, part_path)
+
+    # 206 响应的ETag与已下载部分不一致：丢弃 .part，不带 Range 重新请求
+    assert len(state.requests) == 2
+    assert "Range" not in state.requests[1]
+    assert part_path.read_bytes() == CONTENT[::-1]
+    assert result.sha256 == state.sha256()
+
+
+def test_total_mismatch_on_206_restarts_from_zero(tmp_path, server):
+    state, url = server
+    part_path = part_path_for_url(tmp_path, url)
+    make_part(part_path, url, b"x" * HALF, total=len(CONTENT) + 1)
+
+    result = stream_download(url, part_path)
+
+    assert "Range" not in state.requests[-1]
+    assert part_path.read_bytes() == CONTENT
+    assert result.sha256 == state.sha256()
+
+
+def test_server_ignoring_range_rewrites_from_start(tmp_path, server):
+    state, url = server
+    state.honor_range = False
+    part_path = part_path_for_url(tmp_path, url)
+    make_part(part_path, url, CONTENT[:HALF])
+
+    result = stream_download(url, part_path)
+
+    assert "Range" in state.requests[0]
+    assert part_path.read_bytes() == CONTENT
+    assert result.sha256 == state.sha256()
+
+
+def test_part_without_meta_is_not_resumed(tmp_path, server):
+    state, url = server
+    part_path = part_path_for_url(tmp_path, url)
+    part_path.write_bytes(b"x" * HALF)
+
+    stream_download(url, part_path)
+
+    assert "Range" not in state.requests[0]
+    assert part_path.read_bytes() == CONTENT
+
+
+def test_part_of_other_url_is_not_resumed(tmp_path, server):
+    state, url = server
+    part_path = part_path_for_url(tmp_path, url)
+    make_part(part_path, url + "?other", b"x" * HALF)
+
+    stream_download(url, part_path)
+
+    assert "Range" not in state.requests[0]
+    assert part_path.read_bytes() == CONTENT
+
+
+def test_416_discards_part(tmp_path, server):
+    state, url = server
+    part_path = part_path_for_url(tmp_path, url)
+    # .part 比服务器上的文件还大
+    make_part(part_path, url, b"x" * (len(CONTENT) + 10))
+
+    result = stream_download(url, part_path)
+
+    assert result.resumed == 1
+    assert "Range" not in state.requests[1]
+    assert part_path.read_bytes() == CONTENT
+    assert result.sha256 == state.sha256()
+
+
+def test_incomplete_body_is_resumed(tmp_path, server):
+    state, url = server
+    state.truncate_times = 1
+    part_path = part_path_for_url(tmp_path, url)
+
+    result = stream_download(url, part_path)
+
+    assert result.resumed == 1
+    assert state.requests[1]["Range"] == f"bytes={HALF}-"
+    assert part_path.read_bytes() == CONTENT
+    assert result.sha256 == state.sha256()
+
+
+def test_incomplete_body_gives_up_after_max_resumes(tmp_path, server):
+    state, url = server
+    state.truncate_times = 10
+    part_path = part_path_for_url(tmp_path, url)
+
+    with pytest.raises(ConnectionError):
+        stream_download(url, part_path, max_resumes=2)
+
+    assert len(state.requests) == 3
+    # 保留 .part 和校验信息，下次运行可以继续续传
+    assert part_path.exists()
+    assert part_path.with_name(part_path.name + ".meta").exists()
+
+
+def test_html_response_is_not_a_file(tmp_path, server):
+    state, url = server
+    state.content_type = "text/html; charset=utf-8"
+    part_path = part_path_for_url(tmp_path, url)
+
+    with pytest.raises(NotAFileError):
+        stream_download(url, part_path)
+
+    assert not part_path.exists()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+测试不可下载论文缓存（UnavailableCache）
+"""
+import time
+
+from src.core.models import DownloadResult, DownloadStatus, Paper
+from src.downloader import unavailable_cache
+from src.downloader.unavailable_cache import UnavailableCache
+from src.platforms.cnki import PageState
+
+DAY = 86400
+
+
+def make_cache(tmp_path, paywall_ttl=7 * DAY, no_button_ttl=DAY):
+    return UnavailableCache(
+        {UnavailableCache.REASON_PAYWALL: paywall_ttl, UnavailableCache.REASON_NO_BUTTON: no_button_ttl},
+        path=tmp_path / "index.db"
+    )
+
+
+def paywall_result(paper):
+    return DownloadResult(
+        paper=paper, status=DownloadStatus.SKIPPED, error_message=PageState.PAYWALL.value, paywalled=True
+    )
+
+
+def no_button_result(paper):
+    return DownloadResult(paper=paper, status=DownloadStatus.FAILED, error_message=UnavailableCache.NO_BUTTON_MESSAGE)
+
+
+def set_now(monkeypatch, now):
+    monkeypatch.setattr(unavailable_cache.time, "time", lambda: now)
+
+
+def test_remember_and_expire(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path)
+    paper = Paper(title="论文", paper_id="ABC001")
+    start = time.time()
+
+    set_now(monkeypatch, start)
+    cache.remember(paywall_result(paper))
+    assert cache.check(paper) is not None
+
+    set_now(monkeypatch, start + 7 * DAY - 1)
+    assert cache.check(paper) is not None
+
+    set_now(monkeypatch, start + 7 * DAY + 1)
+    assert cache.check(paper) is None
+    cache.close()
+
+
+def test_reasons_use_their_own_ttl(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path)
+    paywalled = Paper(title="付费", paper_id="ABC001")
+    no_button = Paper(title="无按钮", paper_id="ABC002")
+    start = time.time()
+
+    set_now(monkeypatch, start)
+    cache.remember(paywall_result(paywalled))
+    cache.remember(no_button_result(no_button))
+
+    set_now(monkeypatch, start + 2 * DAY)
+    assert cache.check(paywalled) is not None
+    assert cache.check(no_button) is None
+    cache.close()
+
+
+def test_zero_ttl_disables_reason(tmp_path):
+    cache = make_cache(tmp_path, paywall_ttl=0)
+    paper = Paper(title="论文", paper_id="ABC001")
+    cache.remember(paywall_result(paper))
+    assert cache.check(paper) is None
+    cache.close()
+
+
+def test_success_forgets_paper(tmp_path):
+    cache = make_cache(tmp_path)
+    paper = Paper(title="论文", paper_id="ABC001")
+    cache.remember(no_button_result(paper))
+    cache.remember(DownloadResult(paper=paper, status=DownloadStatus.SUCCESS))
+    assert cache.check(paper) is None
+    cache.close()
+
+
+def test_other_failures_are_not_cached(tmp_path):
+    cache = make_cache(tmp_path)
+    paper = Paper(title="论文", paper_id="ABC001")
+    cache.remember(DownloadResult(paper=paper, status=DownloadStatus.SKIPPED, error_message=PageState.LOGIN_WALL.value))
+    cache.remember(DownloadResult(paper=paper, status=DownloadStatus.FAILED, error_message="下载超时"))
+    assert cache.check(paper) is None
+    cache.close()
+
+
+def test_inferred_paywall_is_not_cached(tmp_path):
+    # 按错误信息关键词推断的付费（可能只是未登录），没有 paywalled 标记
+    cache = make_cache(tmp_path)
+    paper = Paper(title="论文", paper_id="ABC001")
+    cache.remember(DownloadResult(paper=paper, status=DownloadStatus.SKIPPED, error_message=PageState.PAYWALL.value))
+    assert cache.check(paper) is None
+    cache.close()
+
+
+def test_paper_key_needs_id_or_title_and_authors():
+    assert UnavailableCache.paper_key(Paper(title="论文", paper_id="abc001")) == "id:ABC001"
+    assert UnavailableCache.paper_key(Paper(title="论文", authors="张三")) is not None
+    assert UnavailableCache.paper_key(Paper(title="论文")) is None